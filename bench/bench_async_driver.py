@@ -0,0 +1,104 @@
+"""
+Benchmark MessageStream, the async driver of the stream parser, under asyncio
+and trio. Each run parses 64KiB of pipelined requests received from a socket
+pair, so the numbers could be compared with each other.
+"""
+
+import asyncio
+import socket
+import threading
+
+import pytest
+
+from .context import python_http_parser
+from .data import PIPELINED, REQUEST
+
+NUM_MESSAGES = len(PIPELINED) // len(REQUEST['long'])
+
+
+class AsyncioSocket:
+    """A socket with an asyncio ``recv_into()`` coroutine method."""
+
+    def __init__(self, sock):
+        sock.setblocking(False)
+        self.sock = sock
+
+    async def recv_into(self, buf):
+        return await asyncio.get_running_loop().sock_recv_into(self.sock, buf)
+
+
+def send_pipelined(sock):
+    """Send the pipelined requests from another thread, then shut ``sock`` down."""
+    def send():
+        sock.sendall(PIPELINED)
+        sock.shutdown(socket.SHUT_WR)
+
+    thread = threading.Thread(target=send)
+    thread.start()
+    return thread
+
+
+async def count_messages(stream):
+    nmsgs = 0
+    async for msg in stream:
+        async for _ in msg.body:
+            pass
+        nmsgs += 1
+    return nmsgs
+
+
+def run_asyncio():
+    server_sock, client_sock = socket.socketpair()
+    with server_sock, client_sock:
+        thread = send_pipelined(client_sock)
+        ret = asyncio.run(count_messages(
+            python_http_parser.aio.MessageStream(AsyncioSocket(server_sock))))
+        thread.join()
+    return ret
+
+
+def run_trio(trio, wrap):
+    server_sock, client_sock = socket.socketpair()
+    with server_sock, client_sock:
+        thread = send_pipelined(client_sock)
+        ret = trio.run(count_messages, python_http_parser.aio.MessageStream(
+            wrap(trio.socket.from_stdlib_socket(server_sock))))
+        thread.join()
+    return ret
+
+
+def bench_driver_asyncio(benchmark):
+    ret = benchmark.pedantic(
+        run_asyncio,
+        iterations=10,
+        rounds=10,
+        warmup_rounds=1
+    )
+
+    assert ret == NUM_MESSAGES
+
+
+def bench_driver_trio_recv_into(benchmark):
+    trio = pytest.importorskip('trio')
+    ret = benchmark.pedantic(
+        run_trio,
+        args=(trio, lambda sock: sock),
+        iterations=10,
+        rounds=10,
+        warmup_rounds=1
+    )
+
+    assert ret == NUM_MESSAGES
+
+
+def bench_driver_trio_receive_some(benchmark):
+    trio = pytest.importorskip('trio')
+    ret = benchmark.pedantic(
+        run_trio,
+        args=(trio, trio.SocketStream),
+        iterations=10,
+        rounds=10,
+        warmup_rounds=1
+    )
+
+    assert ret == NUM_MESSAGES
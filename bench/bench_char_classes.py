@@ -0,0 +1,44 @@
+"""
+Micro-benchmarks for scanning and validating each character class the stream
+parser deals with.
+"""
+
+from .context import python_http_parser
+
+tokens = python_http_parser.helpers.tokens
+
+TOKEN = memoryview(b'Accept-Encoding: gzip\r\n')
+URI = memoryview(b'/some/long/path/to/a/resource.html?query=string&with=many&params=1 HTTP/1.1')
+FIELD_VALUE = memoryview(
+    b'Mozilla/5.0 (X11; Linux x86_64; rv:109.0) Gecko/20100101 Firefox/115.0\r\n')
+OBS_FIELD_VALUE = memoryview(b'attachment; filename="r\xe9sum\xe9.pdf"\r\n')
+DIGITS = b'1234567890'
+
+
+def run_scanner(scanner, *args, iterations: int = 1000):
+    result = None
+    for _ in range(iterations):
+        result = scanner(*args)
+    return result
+
+
+def bench_token(benchmark):
+    assert benchmark(run_scanner, tokens.recv_header_name, TOKEN, 0) is not None
+
+
+def bench_uri(benchmark):
+    assert benchmark(run_scanner, tokens.recv_uri, URI, 0) is not None
+
+
+def bench_field_value(benchmark):
+    assert benchmark(run_scanner, tokens.recv_header_value, FIELD_VALUE, 0, True) is not None
+
+
+def bench_field_value_obs_text(benchmark):
+    assert benchmark(
+        run_scanner, tokens.recv_header_value, OBS_FIELD_VALUE, 0, True
+    ).data == b''
+
+
+def bench_digits(benchmark):
+    assert benchmark(run_scanner, tokens.are_digits, DIGITS)
@@ -3,7 +3,7 @@ Benchmarks for the ChunkedProcessor, which processes chunked bodies.
 """
 
 from .context import python_http_parser
-from .data import CHUNKED
+from .data import CHUNKED, CHUNKED_TINY
 
 def run_processor(data: bytes):
     return python_http_parser \
@@ -46,3 +46,31 @@ def bench_chunked_long(benchmark):
     )
 
     assert ret == len(CHUNKED['long'])
+
+
+def bench_chunked_tiny(benchmark):
+    ret = benchmark.pedantic(
+        run_processor,
+        args=(CHUNKED_TINY,),
+        iterations=10,
+        rounds=10,
+        warmup_rounds=1
+    )
+
+    assert ret == len(CHUNKED_TINY)
+
+
+def count_chunks(data: bytes):
+    return sum(1 for _ in python_http_parser.body.iter_chunks(data))
+
+
+def bench_iter_chunks_tiny(benchmark):
+    ret = benchmark.pedantic(
+        count_chunks,
+        args=(CHUNKED_TINY,),
+        iterations=10,
+        rounds=10,
+        warmup_rounds=1
+    )
+
+    assert ret == 10000
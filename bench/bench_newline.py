@@ -0,0 +1,60 @@
+"""
+Benchmarks for finding newlines, and for the chunked bodies that depend on it.
+"""
+
+from .context import python_http_parser
+from .data import CHUNKED_LARGE
+
+find_newline = python_http_parser.helpers.newline.find_newline
+
+# A header-sized line, and a line that's as long as a header value could be.
+SHORT_LINE = b'Accept-Encoding: gzip, br\r\n' + b'x' * 4096
+LONG_LINE = b'x' * 16384 + b'\r\n'
+# Lines ending in LF, with no CR anywhere after them.
+LF_LINES = b'Accept-Encoding: gzip, br\n' * 512
+
+
+def run_find_newline(buf, limit, iterations: int = 1000):
+    ret = None
+    for _ in range(iterations):
+        ret = find_newline(buf, True, 0, limit)
+    return ret
+
+
+def bench_newline_short_memoryview(benchmark):
+    ret = benchmark(run_find_newline, memoryview(SHORT_LINE), 16384)
+    assert ret[0] == 25
+
+
+def bench_newline_long_memoryview(benchmark):
+    ret = benchmark(run_find_newline, memoryview(LONG_LINE), 16384)
+    assert ret[0] == 16384
+
+
+def bench_newline_long_bytes(benchmark):
+    ret = benchmark(run_find_newline, LONG_LINE, 16384)
+    assert ret[0] == 16384
+
+
+def bench_newline_lf_only(benchmark):
+    ret = benchmark(run_find_newline, memoryview(LF_LINES), 16384)
+    assert ret[0] == 25
+
+
+def run_processor(data: bytes):
+    return python_http_parser \
+        .body \
+        .ChunkedProcessor() \
+        .process(data, True)
+
+
+def bench_chunked_large_chunks(benchmark):
+    ret = benchmark.pedantic(
+        run_processor,
+        args=(CHUNKED_LARGE,),
+        iterations=100,
+        rounds=10,
+        warmup_rounds=1
+    )
+
+    assert ret == len(CHUNKED_LARGE)
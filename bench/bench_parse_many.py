@@ -0,0 +1,35 @@
+"""
+Benchmark how bulk.parse_many() scales with the number of worker threads.
+
+Every benchmark parses the same 10000 independent requests; only the number of
+workers changes. To chart throughput against the worker count, run:
+
+    python -m pytest bench/bench_parse_many.py --benchmark-histogram
+
+Threads only parse in parallel on free-threaded builds of CPython.
+"""
+
+import pytest
+
+from .context import python_http_parser
+from .data import REQUEST
+
+MESSAGES = [REQUEST['long']] * 10000
+
+
+@pytest.mark.parametrize('workers', [1, 2, 4, 8])
+def bench_parse_many(benchmark, workers):
+    benchmark.group = 'parse_many'
+    benchmark.extra_info['workers'] = workers
+    benchmark.extra_info['messages'] = len(MESSAGES)
+
+    ret = benchmark.pedantic(
+        python_http_parser.bulk.parse_many,
+        args=(MESSAGES,),
+        kwargs={'workers': workers},
+        iterations=1,
+        rounds=10,
+        warmup_rounds=1
+    )
+
+    assert len(ret) == len(MESSAGES)
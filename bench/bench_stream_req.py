@@ -44,3 +44,35 @@ def bench_req_long(benchmark):
     )
 
     assert ret == len(REQUEST['long'])
+
+def bench_req_long_callbacks(benchmark):
+    def on_bytes(_):
+        pass
+    callbacks = python_http_parser.stream.ParserCallbacks(
+        on_req_method=on_bytes,
+        on_req_uri=on_bytes,
+        on_header_name=on_bytes,
+        on_header_value=on_bytes
+    )
+    parser = python_http_parser.stream.HTTPParser(callbacks=callbacks)
+    ret = benchmark.pedantic(
+        run_parser_req,
+        args=(parser, REQUEST['long']),
+        iterations=10000,
+        rounds=10,
+        warmup_rounds=1
+    )
+
+    assert ret == len(REQUEST['long'])
+
+def bench_req_long_batch_headers(benchmark):
+    parser = python_http_parser.stream.HTTPParser(batch_headers=True)
+    ret = benchmark.pedantic(
+        run_parser_req,
+        args=(parser, REQUEST['long']),
+        iterations=10000,
+        rounds=10,
+        warmup_rounds=1
+    )
+
+    assert ret == len(REQUEST['long'])
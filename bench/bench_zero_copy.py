@@ -0,0 +1,97 @@
+"""
+Benchmark the stream parser when walking a single 64KiB buffer of pipelined
+requests through a memoryview.
+"""
+
+import tracemalloc
+
+from .context import python_http_parser
+from .data import PIPELINED, REQUEST
+
+NUM_MESSAGES = len(PIPELINED) // len(REQUEST['long'])
+
+
+def count_emitted_bytes(parser: python_http_parser.stream.HTTPParser):
+    """Count the bytes of the tokens and data the parser emits."""
+    emitted = [0]
+
+    def on_bytes(data):
+        emitted[0] += len(data)
+
+    for event in ('req_method', 'req_uri', 'header_name', 'header_value', 'data'):
+        parser.on(event, on_bytes)
+
+    return emitted
+
+
+def run_parser_pipelined(parser: python_http_parser.stream.HTTPParser, data):
+    view = memoryview(data)
+    pos = 0
+    nmsgs = 0
+    while pos < len(view):
+        parser.reset()
+        ret = parser.process(view[pos:])
+        if ret <= 0:
+            break
+        pos += ret
+        nmsgs += 1
+
+    return nmsgs
+
+
+def measure_peak_allocation(parser: python_http_parser.stream.HTTPParser, data) -> int:
+    """Return the most memory allocated at once while parsing ``data``.
+
+    Copying the buffer, or any large part of it, shows up here; the emitted
+    tokens are dropped as soon as they're counted.
+    """
+    tracemalloc.start()
+    try:
+        run_parser_pipelined(parser, data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def bench_pipelined_memoryview(benchmark):
+    parser = python_http_parser.stream.HTTPParser()
+    emitted = count_emitted_bytes(parser)
+    peak = measure_peak_allocation(parser, PIPELINED)
+    emitted[0] = 0
+    ret = benchmark.pedantic(
+        run_parser_pipelined,
+        args=(parser, PIPELINED),
+        iterations=10,
+        rounds=10,
+        warmup_rounds=1
+    )
+
+    # 10 rounds, 10 iterations, plus 1 warmup round of 10 iterations.
+    total_msgs = NUM_MESSAGES * 110
+    benchmark.extra_info['messages_per_buffer'] = NUM_MESSAGES
+    benchmark.extra_info['bytes_emitted_per_msg'] = emitted[0] / total_msgs
+    benchmark.extra_info['bytes_per_msg'] = len(REQUEST['long'])
+    benchmark.extra_info['peak_bytes_allocated_per_buffer'] = peak
+
+    assert ret == NUM_MESSAGES
+    # The buffer is never copied as a whole.
+    assert peak < len(PIPELINED)
+
+
+def run_parser_pipeline_mode(parser: python_http_parser.stream.HTTPParser, data):
+    parser.reset()
+    return parser.process(data)
+
+
+def bench_pipelined_pipeline_mode(benchmark):
+    parser = python_http_parser.stream.HTTPParser(pipeline=True)
+    ret = benchmark.pedantic(
+        run_parser_pipeline_mode,
+        args=(parser, PIPELINED),
+        iterations=10,
+        rounds=10,
+        warmup_rounds=1
+    )
+
+    assert ret == len(PIPELINED)
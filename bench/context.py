@@ -10,5 +10,9 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import python_http_parser
+import python_http_parser.aio
 import python_http_parser.body
+import python_http_parser.bulk
+import python_http_parser.helpers.newline
+import python_http_parser.helpers.tokens
 import python_http_parser.stream
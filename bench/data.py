@@ -106,3 +106,20 @@ RESPONSE = {
         b'Strict-Transport-Security: max-age=300000\r\n\r\n'
     ])
 }
+
+# As many pipelined requests as would fit in a single 64KiB socket read.
+PIPELINED = REQUEST['long'] * (65536 // len(REQUEST['long']))
+
+# A chunked body with 64KiB chunks, which contain no CRs or semicolons.
+CHUNKED_LARGE = b''.join([
+    *repeat(b'10000\r\n' + b'x' * 65536 + b'\r\n', 16),
+    b'0\r\n',
+    b'\r\n'
+])
+
+# A chunked body with 10000 one-byte chunks.
+CHUNKED_TINY = b''.join([
+    *repeat(b'1\r\nx\r\n', 10000),
+    b'0\r\n',
+    b'\r\n'
+])
@@ -9,6 +9,7 @@ from .context import python_http_parser
 from .data import CHUNKED, REQUEST, RESPONSE
 
 HTTPParser = python_http_parser.stream.HTTPParser
+ParserCallbacks = python_http_parser.stream.ParserCallbacks
 ChunkedProcessor = python_http_parser.body.ChunkedProcessor
 
 PARSER_PROCESS = """\
@@ -29,6 +30,7 @@ def main() -> int:
         action='store', default='stream_parser_req',
         choices=(
             'stream_parser_req',
+            'stream_parser_req_callbacks',
             'stream_parser_res',
             'chunkedbody'
         ),
@@ -56,6 +58,14 @@ def main() -> int:
         data = REQUEST['long']
         iters = args.iters
 
+        cProfile.runctx(PARSER_PROCESS, globals(), locals())
+    elif args.api == 'stream_parser_req_callbacks':
+        parser = HTTPParser(is_response=False, callbacks=ParserCallbacks())
+
+        i = 0
+        data = REQUEST['long']
+        iters = args.iters
+
         cProfile.runctx(PARSER_PROCESS, globals(), locals())
     elif args.api == 'stream_parser_res':
         parser = HTTPParser(is_response=True)
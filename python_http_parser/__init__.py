@@ -4,25 +4,33 @@
 
 # List the public API of this module.
 __all__ = [
+    'ParsedMessage',
     'decode',
     'parse',
+    'parse_message',
 ]
 
 # The version...
 __version__ = '0.4.3'
 
 # Imports.
-from . import constants, errors, utils
+from . import constants, errors, headers, utils
 
 
-def parse(msg, strictness_level=constants.PARSER_NORMAL, is_response=False):
+def parse(msg, strictness_level=constants.PARSER_NORMAL, is_response=False,
+          lazy_headers=False):
     """Parse the specified message.
 
     Arguments:\n
     ``msg`` -- The HTTP message to parse. Must be ``bytes``, a ``bytearray``, or
-    a ``str``.\n
+    a ``str``. Only the head of ``bytes`` and ``bytearray`` messages is decoded,
+    as latin-1. The body of ``bytes`` is returned as a ``memoryview`` of ``msg``,
+    and the body of a ``bytearray`` as ``bytes``.\n
     ``strictness_level`` -- How strict to be while parsing. Must be 1, 2, or 3
-    (``constants.PARSER_LENIENT``, ``constants.PARSER_NORMAL``, ``constants.PARSER_STRICT``).
+    (``constants.PARSER_LENIENT``, ``constants.PARSER_NORMAL``, ``constants.PARSER_STRICT``).\n
+    ``lazy_headers`` -- Whether to return the headers as a ``headers.Headers``
+    mapping, which only decodes names and values when they are looked up. If
+    this is set, ``raw_headers`` is ``None``; use ``headers.raw()`` instead.
 
     Returns:
     ```
@@ -36,18 +44,27 @@ def parse(msg, strictness_level=constants.PARSER_NORMAL, is_response=False):
       'http_ver': float, # The HTTP version (e.g. 1.1, 1.0...)
       # Dictionary of headers that were received.
       # Duplicates are concatenated into a list.
-      'headers': Dict[str, Union[str, list]],
-      'raw_headers': List[str], # The headers just as was received.
+      'headers': Union[Dict[str, Union[str, list]], headers.Headers],
+      'raw_headers': Optional[List[str]], # The headers just as was received.
       # If we encountered double newlines, the characters after those double
-      # newlines, if any.
-      'body': Optional[str]
+      # newlines, if any. A memoryview if ``msg`` was bytes, and bytes if it
+      # was a bytearray.
+      'body': Optional[Union[str, bytes, memoryview]]
     }
     ```
     """
-    msg = msg.decode('utf-8') if isinstance(
-        msg, (bytes, bytearray)
-    ) else msg  # type: str
-    newline_type = ''
+    if lazy_headers:
+        return parse_message(
+            msg, strictness_level, is_response
+        ).to_dict(lazy_headers=True)
+
+    body = None
+    if isinstance(msg, (bytes, bytearray)):
+        # Don't decode the body; nothing looks at it.
+        head_end = utils.get_head_end(msg)
+        body = _get_body(msg, head_end)
+        # Header fields are latin-1, as per RFC 9110.
+        msg = msg[:head_end].decode('latin-1')
     output = {
         'status_code': None,
         'status_msg': None,
@@ -59,16 +76,7 @@ def parse(msg, strictness_level=constants.PARSER_NORMAL, is_response=False):
         'body': None
     }
 
-    # Get the first line and the newline type.
-    newline_type = utils.get_newline_type(msg)
-
-    # PARSER_STRICT does not allow LF.
-    if newline_type != '\r\n' and strictness_level == constants.PARSER_STRICT:
-        raise errors.NewlineError(
-            'Invalid line breaks! Expected CRLF, received LF.')
-
-    start_line, msg = utils.get_start_line(msg, newline_type)
-
+    newline_type, start_line, msg = _get_start_line(msg, strictness_level)
     if is_response:
         output['http_ver'], output['status_code'], output['status_msg'] = \
             utils.parse_status_line(start_line)
@@ -78,6 +86,8 @@ def parse(msg, strictness_level=constants.PARSER_NORMAL, is_response=False):
 
     # Find the double newline and split the message.
     head, output['body'] = utils.split_msg(msg, newline_type)
+    if body is not None:
+        output['body'] = body
 
     # Get headers.
     output['raw_headers'], output['headers'] = utils.get_headers(
@@ -87,5 +97,125 @@ def parse(msg, strictness_level=constants.PARSER_NORMAL, is_response=False):
     return output
 
 
+def parse_message(msg, strictness_level=constants.PARSER_NORMAL, is_response=False):
+    """Parse the specified message into a ``ParsedMessage``.
+
+    Takes the same arguments as ``parse()``. The headers of the returned
+    message are a ``headers.Headers`` mapping, and its body is the same type as
+    the body ``parse()`` returns. Call ``.to_dict()`` on the result to get what
+    ``parse()`` returns.
+    """
+    # Only the start line is decoded.
+    newline_index = msg.find('\n' if isinstance(msg, str) else b'\n')
+    start_line = msg[:newline_index + 1]
+    if not isinstance(start_line, str):
+        # Header fields are latin-1, as per RFC 9110.
+        start_line = start_line.decode('latin-1')
+
+    message = ParsedMessage()
+    newline_type, start_line, _ = _get_start_line(start_line, strictness_level)
+    if is_response:
+        message.http_ver, message.status_code, message.status_msg = \
+            utils.parse_status_line(start_line)
+    else:
+        message.req_method, message.req_uri, message.http_ver = \
+            utils.parse_request_line(start_line)
+
+    if isinstance(msg, str):
+        newline = newline_type
+    else:
+        newline = newline_type.encode('latin-1')
+    double_newline = newline + newline
+
+    # The header block starts right after the start line.
+    head_start = len(start_line)
+    head_end = msg.find(double_newline, head_start)
+    if not bool(~head_end):
+        raise errors.NewlineError('Missing double newline!')
+
+    message.headers = headers.Headers(msg, headers.index_headers(
+        msg, head_start + len(newline), head_end, newline, strictness_level
+    ))
+    message.body = _get_body(msg, head_end + len(double_newline))
+
+    return message
+
+
+def _get_body(msg, body_start):
+    """Get the body of ``msg``, which starts at ``msg[body_start]``.
+
+    The body of ``bytes`` is a ``memoryview`` of it, so it isn't copied. A
+    ``bytearray`` could still be changed (and a view would keep it from being
+    resized), so its body is copied into ``bytes``.
+    """
+    if isinstance(msg, str):
+        return msg[body_start:]
+    if isinstance(msg, bytes):
+        return memoryview(msg)[body_start:]
+    return bytes(memoryview(msg)[body_start:])
+
+
+def _get_start_line(msg, strictness_level):
+    """Get the newline type, the start line, and the rest of ``msg``."""
+    newline_type = utils.get_newline_type(msg)
+
+    # PARSER_STRICT does not allow LF.
+    if newline_type != '\r\n' and strictness_level == constants.PARSER_STRICT:
+        raise errors.NewlineError(
+            'Invalid line breaks! Expected CRLF, received LF.')
+
+    start_line, msg = utils.get_start_line(msg, newline_type)
+    return newline_type, start_line, msg
+
+
+class ParsedMessage:
+    """A parsed HTTP message, as returned by ``parse_message()``.
+
+    Unlike the dicts returned by ``parse()``, ``ParsedMessage`` objects have no
+    per-instance dict, and their headers are a ``headers.Headers`` mapping,
+    which keeps one ``array('I')`` of offsets into the parsed message instead of
+    a string for every header name and value.
+    """
+    __slots__ = (
+        'status_code',
+        'status_msg',
+        'req_method',
+        'req_uri',
+        'http_ver',
+        'headers',
+        'body',
+    )
+
+    def __init__(self):
+        self.status_code = None
+        self.status_msg = None
+        self.req_method = None
+        self.req_uri = None
+        self.http_ver = None
+        self.headers = None
+        self.body = None
+
+    def to_dict(self, lazy_headers=False):
+        """Convert this message into a dict, like the ones ``parse()`` returns.
+
+        If ``lazy_headers`` is true, the ``headers`` are left as they are, and
+        ``raw_headers`` is ``None``.
+        """
+        return {
+            'status_code': self.status_code,
+            'status_msg': self.status_msg,
+            'req_method': self.req_method,
+            'req_uri': self.req_uri,
+            'http_ver': self.http_ver,
+            'headers': self.headers if lazy_headers else dict(self.headers),
+            'raw_headers': None if lazy_headers else self.headers.raw(),
+            'body': self.body,
+        }
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+
 # Aliases for the above functions.
 decode = parse
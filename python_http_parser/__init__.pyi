@@ -2,8 +2,10 @@
 ``python_http_parser`` module.
 """
 __all__ = [
+    'ParsedMessage',
     'decode',
-    'parse'
+    'parse',
+    'parse_message'
 ]
 
 from typing import Dict, List, Optional, Union
@@ -11,6 +13,7 @@ from typing import Dict, List, Optional, Union
 from typing_extensions import TypedDict
 
 import python_http_parser.constants as constants
+from python_http_parser.headers import Headers
 
 class ParsedHTTPMessage(TypedDict):
     status_code: Optional[int]
@@ -18,16 +21,37 @@ class ParsedHTTPMessage(TypedDict):
     req_method: Optional[str]
     req_uri: Optional[str]
     http_ver: float
-    headers: Dict[str, Union[str, list]]
-    raw_headers: List[str]
-    body: Optional[str]
+    headers: Union[Dict[str, Union[str, list]], Headers]
+    raw_headers: Optional[List[str]]
+    body: Optional[Union[str, bytes, memoryview]]
 
 
 def parse(
     msg: Union[bytes, bytearray, str],
     strictness_level: int = constants.PARSER_NORMAL,
-    is_response: bool = False
+    is_response: bool = False,
+    lazy_headers: bool = False
 ) -> ParsedHTTPMessage: ...
 
 
+class ParsedMessage:
+    status_code: Optional[int]
+    status_msg: Optional[str]
+    req_method: Optional[str]
+    req_uri: Optional[str]
+    http_ver: float
+    headers: Headers
+    body: Union[str, bytes, memoryview]
+
+    def __init__(self) -> None: ...
+    def to_dict(self, lazy_headers: bool = False) -> ParsedHTTPMessage: ...
+
+
+def parse_message(
+    msg: Union[bytes, bytearray, str],
+    strictness_level: int = constants.PARSER_NORMAL,
+    is_response: bool = False
+) -> ParsedMessage: ...
+
+
 decode = parse
@@ -0,0 +1,490 @@
+"""
+The ``python_http_parser.aio`` module drives the ``HTTPParser`` from asyncio
+(and other async frameworks), and hands out parsed messages through async
+iterators.
+"""
+
+__all__ = [
+    'Body',
+    'HTTPProtocol',
+    'Message',
+    'MessageReader',
+    'MessageStream',
+]
+
+import asyncio
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable, Coroutine, Deque, List, Optional, Union, cast
+
+from .constants import ParserStrictness
+from .helpers.collector import MessageCollector
+from .stream import HeaderList, HTTPParser, HTTPVersion
+
+# The receive buffer starts at 64KiB, and grows if an unfinished token doesn't fit.
+_DEFAULT_BUFFER_SIZE = 65536
+# Stop reading once 256KiB of body data is waiting to be consumed...
+_DEFAULT_HIGH_WATER = 262144
+# ...or once this many messages are waiting to be consumed.
+_DEFAULT_MAX_PENDING = 16
+# StreamReaders are read in blocks of 64KiB.
+_DEFAULT_BLOCK_SIZE = 65536
+
+
+class Message:  # pylint: disable=R0903
+    """A HTTP message whose head has been received.
+
+    ``method``, ``uri``, ``version``, ``status_code`` and ``reason`` are just as
+    the ``HTTPParser`` received them; the ones that don't apply are ``None``.
+    ``headers`` is a list of (name, value) pairs, and ``body`` is a ``Body``.
+    """
+    __slots__ = (
+        'method',
+        'uri',
+        'version',
+        'status_code',
+        'reason',
+        'headers',
+        'body',
+    )
+
+    def __init__(self, receiver: Any) -> None:
+        self.method: Optional[bytes] = None
+        self.uri: Optional[bytes] = None
+        self.version: Optional[HTTPVersion] = None
+        self.status_code: Optional[int] = None
+        self.reason: Optional[bytes] = None
+        self.headers: HeaderList = []
+        self.body = Body(receiver)
+
+    def __repr__(self) -> str:
+        if self.status_code is not None:
+            return f'<{type(self).__name__} {self.status_code} {self.reason!r}>'
+        return f'<{type(self).__name__} {self.method!r} {self.uri!r}>'
+
+
+class Body:
+    """The body of a ``Message``, as an async iterator of ``bytes`` chunks.
+
+    Chunks are handed out in the order they were received. Iteration stops once
+    the whole body has been received, and raises if the connection broke (or
+    the message turned out to be invalid) before that.
+    """
+    __slots__ = ('_receiver', '_chunks', '_done', '_exception')
+
+    def __init__(self, receiver: Any) -> None:
+        # The object that receives more data when this body runs dry. It must
+        # have a ``_receive()`` coroutine method and a ``_consumed(n)`` method.
+        self._receiver = receiver
+        self._chunks: Deque[bytes] = deque()
+        self._done = False
+        self._exception: Optional[BaseException] = None
+
+    def feed(self, data: bytes) -> None:
+        """Add a chunk of received body data."""
+        self._chunks.append(data)
+
+    def finish(self) -> None:
+        """Mark the whole body as received."""
+        self._done = True
+
+    def fail(self, exc: BaseException) -> None:
+        """Make iteration raise ``exc``, unless the whole body was received."""
+        if not self._done:
+            self._exception = exc
+
+    def done(self) -> bool:
+        """Return ``True`` if the whole body has been received."""
+        return self._done
+
+    def __aiter__(self) -> 'Body':
+        return self
+
+    async def __anext__(self) -> bytes:
+        chunks = self._chunks
+        while not chunks:
+            if self._exception is not None:
+                raise self._exception
+            if self._done:
+                raise StopAsyncIteration
+            await self._receiver._receive()
+
+        chunk = chunks.popleft()
+        self._receiver._consumed(len(chunk))
+        return chunk
+
+    async def read(self) -> bytes:
+        """Receive the rest of the body, and return it as one ``bytes`` object."""
+        return b''.join([chunk async for chunk in self])
+
+
+class _MessageReceiver(MessageCollector, ABC):
+    """Collects the messages a HTTPParser parses, and hands them out.
+
+    Subclasses get more data to the parser in ``._receive()``.
+    """
+
+    def __init__(self, is_response: bool, strictness: ParserStrictness) -> None:
+        super().__init__(is_response, strictness, pipeline=True)
+
+        # The message being parsed, and the ones waiting to be consumed.
+        self._message: Optional[Message] = None
+        self._messages: Deque[Message] = deque()
+        # Body data that's waiting to be consumed.
+        self._buffered = 0
+        self._closed = False
+        self._exception: Optional[BaseException] = None
+        # Unprocessed bytes of blocks passed to ._process_block(), waiting for
+        # the rest of their token.
+        self._tail = bytearray()
+
+    @abstractmethod
+    async def _receive(self) -> None:
+        """Wait until more data has been received, or the connection is gone."""
+        raise NotImplementedError()
+
+    def _process_block(self, data: Union[bytes, bytearray]) -> None:
+        """Parse a block of received data, and keep whatever couldn't be parsed yet."""
+        buf = self._tail
+        if buf:
+            buf += data
+            data = buf
+
+        ret = self._parser.process(data)
+        if ret < 0:
+            # The error has been recorded already.
+            self._closed = True
+        elif data is buf:
+            del buf[:ret]
+        elif ret < len(data):
+            buf += memoryview(data)[ret:]
+
+    def _close(self, exc: Optional[BaseException] = None) -> None:
+        """Called when there's no more data to receive."""
+        self._closed = True
+        if exc is None:
+            # A body which ends with the connection is complete now.
+            self._parser.finish()
+        if self._message is not None:
+            self._message.body.fail(exc or ConnectionResetError(
+                'Connection lost before the message was complete!'))
+            self._message = None
+
+    def _consumed(self, nbytes: int) -> None:
+        """Called when ``nbytes`` of body data have been consumed."""
+        self._buffered -= nbytes
+        self._maybe_resume()
+
+    def _maybe_pause(self) -> None:
+        """Called when more messages or body data are waiting to be consumed."""
+
+    def _maybe_resume(self) -> None:
+        """Called when messages or body data have been consumed."""
+
+    # Message iteration.
+
+    def __aiter__(self) -> '_MessageReceiver':
+        return self
+
+    async def __anext__(self) -> Message:
+        messages = self._messages
+        while not messages:
+            if self._exception is not None:
+                raise self._exception
+            if self._closed:
+                raise StopAsyncIteration
+            await self._receive()
+
+        message = messages.popleft()
+        self._maybe_resume()
+        return message
+
+    # HTTPParser callbacks.
+
+    def _on_error(self, err: Exception) -> None:
+        self._exception = err
+        if self._message is not None:
+            self._message.body.fail(err)
+            self._message = None
+
+    def _on_headers_complete(self, headers: HeaderList) -> None:
+        message = self._message = Message(self)
+        message.method = self._method
+        message.uri = self._uri
+        message.version = self._version
+        message.status_code = self._status_code
+        message.reason = self._reason
+        message.headers = headers
+        self._messages.append(message)
+        self._maybe_pause()
+
+    # The parser only calls these after the headers, so there's a message.
+
+    def _on_data(self, data: bytes) -> None:
+        if self._message is not None:
+            self._message.body.feed(data)
+            self._buffered += len(data)
+            self._maybe_pause()
+
+    def _on_message_complete(self) -> None:
+        if self._message is not None:
+            self._message.body.finish()
+            self._message = None
+
+
+class _ReceiveBuffer:
+    """A preallocated buffer which data is received into, and parsed in place.
+
+    Body data (even a big chunk) is handed out as soon as it's received, so
+    only an unfinished token of a message head, a chunk size line or a newline
+    is ever left unprocessed. The buffer only grows if such a token doesn't fit
+    in it, and the parser's limits on token lengths bound that.
+    """
+
+    def __init__(self, parser: HTTPParser, size: int) -> None:
+        self._parser = parser
+        self._buf = bytearray(size)
+        self._view = memoryview(self._buf)
+        # Unprocessed data is in self._buf[self._start:self._end].
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return len(self._buf)
+
+    def get(self, sizehint: int = -1) -> memoryview:
+        """Return the free part of the buffer, making room first if needed."""
+        buf_len = len(self._buf)
+        if self._end == buf_len or (sizehint > buf_len - self._end and self._start > 0):
+            # Move the unprocessed data to the front of the buffer.
+            # Only an unfinished token is left unprocessed, so this copy is small.
+            unprocessed = self._end - self._start
+            self._buf[:unprocessed] = bytes(self._view[self._start:self._end])
+            self._start = 0
+            self._end = unprocessed
+
+        if self._end == buf_len:
+            # The whole buffer is one unfinished token.
+            new_buf = bytearray(buf_len * 2)
+            new_buf[:buf_len] = self._buf
+            self._buf = new_buf
+            self._view = memoryview(new_buf)
+
+        return self._view[self._end:]
+
+    def updated(self, nbytes: int) -> int:
+        """Parse the ``nbytes`` which were written to the buffer.
+
+        Returns the return value of ``HTTPParser.process()``.
+        """
+        self._end += nbytes
+        ret = self._parser.process(self._view[self._start:self._end])
+        if ret < 0:
+            # The error has been recorded already.
+            return ret
+
+        self._start += ret
+        if self._start == self._end:
+            self._start = self._end = 0
+        return ret
+
+
+class HTTPProtocol(_MessageReceiver, asyncio.BufferedProtocol):
+    """An asyncio protocol which parses the HTTP messages it receives.
+
+    Data is received straight into a preallocated buffer, and parsed in place.
+    Messages are handed out by iterating over the protocol with ``async for``,
+    as soon as their head has been received; their bodies are streamed. Once
+    more than ``high_water`` bytes of body data, or more than ``max_pending``
+    messages, are waiting to be consumed, the transport stops reading until
+    the consumer catches up.
+
+    If ``handler`` is given, it's called with the protocol once the connection
+    is made, and the returned coroutine is run as a task.
+    """
+
+    # pylint: disable=R0902,R0913,R0917
+    def __init__(self, handler: Optional[
+                     Callable[['HTTPProtocol'], Coroutine[Any, Any, Any]]] = None,
+                 is_response: bool = False,
+                 strictness: ParserStrictness = ParserStrictness.NORMAL,
+                 buffer_size: int = _DEFAULT_BUFFER_SIZE,
+                 high_water: int = _DEFAULT_HIGH_WATER,
+                 max_pending: int = _DEFAULT_MAX_PENDING) -> None:
+        """Create a new HTTPProtocol."""
+        if buffer_size < 1:
+            raise ValueError('buffer_size must be positive!')
+        if high_water < 0:
+            raise ValueError('high_water must not be negative!')
+        if max_pending < 1:
+            raise ValueError('max_pending must be positive!')
+
+        self.handler = handler
+        self.high_water = high_water
+        # Reading resumes once consumers are down to a quarter of the limit.
+        self.low_water = high_water // 4
+        self.max_pending = max_pending
+
+        super().__init__(is_response, strictness)
+
+        self._buffer = _ReceiveBuffer(self._parser, buffer_size)
+        self._transport: Optional[asyncio.Transport] = None
+        self._task: Optional['asyncio.Task[Any]'] = None
+        self._paused = False
+        self._waiters: List['asyncio.Future[None]'] = []
+
+    @property
+    def transport(self) -> Optional[asyncio.Transport]:
+        """The transport of this protocol, or ``None`` if there's no connection yet."""
+        return self._transport
+
+    # asyncio.BufferedProtocol methods.
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        # Stream connections always get a full Transport.
+        self._transport = cast(asyncio.Transport, transport)
+        if self.handler is not None:
+            self._task = asyncio.get_running_loop().create_task(self.handler(self))
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        return self._buffer.get(sizehint)
+
+    def buffer_updated(self, nbytes: int) -> None:
+        if self._buffer.updated(nbytes) >= 0:
+            self._wake()
+
+    def eof_received(self) -> Optional[bool]:
+        # Let the transport close itself.
+        return None
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._close(exc)
+        self._wake()
+
+    async def _receive(self) -> None:
+        """Wait until more data has been received, or the connection is gone."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        await waiter
+
+    def _wake(self) -> None:
+        waiters = self._waiters
+        self._waiters = []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _maybe_pause(self) -> None:
+        if self._transport is not None and not self._paused and (
+                self._buffered > self.high_water or len(self._messages) > self.max_pending):
+            self._paused = True
+            self._transport.pause_reading()
+
+    def _maybe_resume(self) -> None:
+        if self._transport is not None and self._paused and not self._closed and (
+                self._buffered <= self.low_water and len(self._messages) <= self.max_pending):
+            self._paused = False
+            self._transport.resume_reading()
+
+    def _on_error(self, err: Exception) -> None:
+        super()._on_error(err)
+        if self._transport is not None:
+            self._transport.close()
+
+
+class MessageReader(_MessageReceiver):  # pylint: disable=R0903
+    """Parses the HTTP messages that are read from an ``asyncio.StreamReader``.
+
+    Messages are handed out by iterating over the reader with ``async for``,
+    and their bodies are streamed. Data is only read when a message or body
+    chunk is needed, in blocks of up to ``block_size`` bytes. Blocks are parsed
+    as they are; only the unfinished token at the end of a block is kept in a
+    buffer, which is reused for the whole connection.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader,
+                 is_response: bool = False,
+                 strictness: ParserStrictness = ParserStrictness.NORMAL,
+                 block_size: int = _DEFAULT_BLOCK_SIZE) -> None:
+        """Create a new MessageReader."""
+        if block_size < 1:
+            raise ValueError('block_size must be positive!')
+
+        super().__init__(is_response, strictness)
+        self.reader = reader
+        self.block_size = block_size
+        self._lock = asyncio.Lock()
+
+    async def _receive(self) -> None:
+        if self._lock.locked():
+            # Someone else is reading already; wait for them to finish.
+            async with self._lock:
+                return
+
+        async with self._lock:
+            data = await self.reader.read(self.block_size)
+            if not data:
+                self._close()
+                return
+
+            self._process_block(data)
+
+
+class MessageStream(_MessageReceiver):  # pylint: disable=R0903
+    """Parses the HTTP messages received from an async byte stream.
+
+    ``stream`` needs either a ``recv_into(buffer)`` coroutine method, like trio
+    sockets, or a ``receive_some(max_bytes)`` one, like trio streams. With
+    ``recv_into()``, data is received straight into one preallocated buffer
+    and parsed in place; ``receive_some()`` blocks are parsed as they are.
+
+    Messages are handed out just like with ``MessageReader``. Nothing here
+    depends on asyncio, so it runs under asyncio, trio, or anyio alike. Only
+    one task can receive at a time.
+    """
+
+    def __init__(self, stream: Any,
+                 is_response: bool = False,
+                 strictness: ParserStrictness = ParserStrictness.NORMAL,
+                 buffer_size: int = _DEFAULT_BUFFER_SIZE) -> None:
+        """Create a new MessageStream."""
+        recv_into: Any = getattr(stream, 'recv_into', None)
+        receive_some: Any = getattr(stream, 'receive_some', None)
+        if recv_into is None and receive_some is None:
+            raise TypeError('stream must have a recv_into() or receive_some() method!')
+        if buffer_size < 1:
+            raise ValueError('buffer_size must be positive!')
+
+        super().__init__(is_response, strictness)
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self._recv_into = recv_into
+        self._receive_some = receive_some
+        # receive_some() blocks are parsed where they are, so they don't need
+        # the buffer.
+        self._buffer: Optional[_ReceiveBuffer] = None
+        if recv_into is not None:
+            self._buffer = _ReceiveBuffer(self._parser, buffer_size)
+        self._receiving = False
+
+    async def _receive(self) -> None:
+        if self._receiving:
+            raise RuntimeError('Another task is already receiving from this stream!')
+
+        self._receiving = True
+        try:
+            buffer = self._buffer
+            if buffer is not None:
+                nbytes = await self._recv_into(buffer.get(len(buffer) // 2))
+                if nbytes and buffer.updated(nbytes) < 0:
+                    self._closed = True
+            else:
+                data = await self._receive_some(self.buffer_size)
+                nbytes = len(data)
+                if nbytes:
+                    self._process_block(data)
+        finally:
+            self._receiving = False
+
+        if not nbytes:
+            self._close()
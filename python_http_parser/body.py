@@ -10,15 +10,22 @@ __all__ = [
     'BodyProcessor',
     'FixedLenProcessor',
     'ChunkedProcessor',
+    'UntilCloseProcessor',
+    'BodySink',
+    'iter_chunks',
 ]
 
+import os
+import re
+import tempfile
 from abc import ABC, abstractmethod
-from typing import Callable, List, Optional, Tuple
+from typing import IO, Callable, Iterator, List, Optional, Tuple, Union
 # Compatibility requires us to use typing_extensions.
 from typing_extensions import TypedDict
 
 from . import constants, errors
-from .helpers.newline import NewlineType, find_newline, startswith_newline
+from .helpers.newline import LIMIT_EXCEEDED, NewlineType, find_newline, startswith_newline
+from .helpers.search import compile_byte, find
 
 
 class BodyProcessorCallbacks(TypedDict):
@@ -27,10 +34,32 @@ class BodyProcessorCallbacks(TypedDict):
     """
     error: Callable[[Exception], None]
     data: Callable[[bytes], None]
+    filled: Callable[[int], None]
     finished: Callable[[], None]
 
 
 _SEMI = 0x3b
+_SEMI_RE = compile_byte(_SEMI)
+_CR = 0x0d
+_LF = 0x0a
+
+# A chunk size, optional chunk extensions, and a CRLF. Both parts are bounded,
+# so a match never looks further than a few KiB ahead.
+_CHUNK_HEAD_RE = re.compile(
+    rb'([0-9A-Fa-f]{1,%d})(?:;([^\r\n]{0,%d}))?\r\n' % (
+        constants.MAX_CHUNK_SIZE_DIGITS, constants.MAX_CHUNK_EXTENSION_SIZE))
+
+# Keep bodies in memory up to 1MiB before spilling them to a temporary file.
+_DEFAULT_SPILL_THRESHOLD = 1048576
+# Write to the file descriptor once 64KiB of body data is pending.
+_DEFAULT_BATCH_SIZE = 65536
+# How many buffers os.writev() accepts at once.
+try:
+    _IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 16
+if _IOV_MAX < 1:
+    _IOV_MAX = 16
 
 
 class BodyProcessor(ABC):
@@ -44,23 +73,135 @@ class BodyProcessor(ABC):
         self.callbacks: BodyProcessorCallbacks = {
             'error': lambda _: None,
             'data': lambda _: None,
+            'filled': lambda _: None,
             'finished': lambda: None
         }
+        # Caller-provided buffer that body data is copied into, if any.
+        self._into: Optional[memoryview] = None
+        # How much of that buffer has been filled.
+        self._into_len = 0
+        # Called with (offset, length) spans instead of handing out data, if set.
+        self._span_cb: Optional[Callable[[int, int], None]] = None
+        # Sink that body data is written to instead of handing it out, if any.
+        self._sink: Optional['BodySink'] = None
 
     def on_error(self, callback: Callable[[Exception], None]) -> None:
         """Register the specified function to be called on an error."""
         self.callbacks['error'] = callback
 
     def on_data(self, callback: Callable[[bytes], None]) -> None:
-        """Register the specified function to be called when data is available."""
+        """Register the specified function to be called when data is available.
+
+        ``callback`` gets a copy of the data, which it may keep. Use
+        ``.on_span()`` or ``iter_chunks()`` to look at the data without copying.
+        """
         self.callbacks['data'] = callback
 
     def on_finished(self, callback: Callable[[], None]) -> None:
         """Register the specified function to be called when the body has finished."""
         self.callbacks['finished'] = callback
 
+    def on_data_into(
+        self,
+        buffer: Union[bytearray, memoryview, None],
+        callback: Callable[[int], None] = lambda _: None
+    ) -> None:
+        """Copy body data straight into ``buffer`` instead of calling the data callback.
+
+        ``callback`` is called with the number of bytes written to the start of
+        ``buffer`` whenever it is full, and at the end of each ``.process()``
+        call. Those bytes must be consumed before ``callback`` returns, since
+        they will be overwritten afterwards.
+
+        Pass ``None`` as ``buffer`` to go back to the data callback.
+        """
+        if buffer is None:
+            self._into = None
+            self._into_len = 0
+            return
+
+        view = memoryview(buffer)
+        if view.readonly:
+            raise TypeError('Buffer must be writable!')
+        if view.format != 'B':
+            view = view.cast('B')
+        if len(view) < 1:
+            raise ValueError('Buffer must not be empty!')
+
+        self._into = view
+        self._into_len = 0
+        self.callbacks['filled'] = callback
+
+    def on_span(self, callback: Optional[Callable[[int, int], None]]) -> None:
+        """Report body data as spans instead of handing it out.
+
+        ``callback`` is called with the offset and the length of each piece of
+        body data, relative to the start of the chunk passed to ``.process()``,
+        and nothing is copied. This takes precedence over the data callback and
+        ``.on_data_into()``. Pass ``None`` to go back to handing out data.
+        """
+        self._span_cb = callback
+
+    def on_sink(self, sink: Optional['BodySink']) -> None:
+        """Write body data to ``sink`` instead of handing it out.
+
+        ``sink`` is flushed whenever a body finishes, before the finished
+        callback is called. This takes precedence over the data callback and
+        ``.on_data_into()``, but not over ``.on_span()``. A HTTPParser which
+        binds its callbacks to this processor keeps the sink. Pass ``None`` to
+        go back to handing out data.
+        """
+        self._sink = sink
+
+    def _deliver(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        """Hand ``data`` over to the sink, the data callback or the caller-provided buffer."""
+        sink = self._sink
+        if sink is not None:
+            # The sink keeps ``data`` until its next flush, and ``data`` may
+            # be a view of a buffer the caller reuses.
+            sink.write(bytes(data))
+            return
+
+        into = self._into
+        if into is None:
+            # ``data`` may be a view of a buffer the caller reuses.
+            self.callbacks['data'](bytes(data))
+            return
+
+        filled_cb = self.callbacks['filled']
+        data = memoryview(data)
+        data_len = len(data)
+        into_size = len(into)
+        into_len = self._into_len
+        pos = 0
+        while pos < data_len:
+            ncopy = min(into_size - into_len, data_len - pos)
+            into[into_len:into_len + ncopy] = data[pos:pos + ncopy]
+            into_len += ncopy
+            pos += ncopy
+
+            if into_len == into_size:
+                filled_cb(into_len)
+                into_len = 0
+
+        self._into_len = into_len
+
+    def _flush(self) -> None:
+        """Report any bytes in the caller-provided buffer that weren't reported yet."""
+        into_len = self._into_len
+        if into_len > 0:
+            self._into_len = 0
+            self.callbacks['filled'](into_len)
+
+    def _finish_body(self) -> None:
+        """Report the data that wasn't reported yet, and call the finished callback."""
+        self._flush()
+        if self._sink is not None:
+            self._sink.flush()
+        self.callbacks['finished']()
+
     @abstractmethod
-    def process(self, chunk: bytes, allow_lf: bool) -> int:
+    def process(self, chunk: Union[bytes, bytearray, memoryview], allow_lf: bool) -> int:
         """Process the next few bytes as part of the HTTP body.
 
         Returns the number of bytes processed. If an error occurred
@@ -88,7 +229,18 @@ class FixedLenProcessor(BodyProcessor):
         self.received_len = 0
         self.finished = False
 
-    def process(self, chunk: bytes, _: bool = True) -> int:
+    def reset(self, body_len: int) -> None:
+        """Reset this processor, so it could process another body.
+
+        The callbacks that were registered are kept, so a processor could be
+        reused for many bodies without setting it up again.
+        """
+        self.expected_len = body_len
+        self.received_len = 0
+        self.finished = False
+        self._into_len = 0
+
+    def process(self, chunk: Union[bytes, bytearray, memoryview], _: bool = True) -> int:
         """Process the next few bytes as part of the HTTP body.
 
         Returns the number of bytes processed. If an error occurred
@@ -96,11 +248,7 @@ class FixedLenProcessor(BodyProcessor):
         """
         nprocessed = 0
         chunk_len = len(chunk)
-        data_cb, error_cb, finished_cb = (
-            self.callbacks['data'],
-            self.callbacks['error'],
-            self.callbacks['finished']
-        )
+        error_cb = self.callbacks['error']
 
         if self.finished:
             # Uh oh--processing already finished.
@@ -111,7 +259,11 @@ class FixedLenProcessor(BodyProcessor):
             # Still within the body length limit.
             self.received_len += chunk_len
             nprocessed += chunk_len
-            data_cb(chunk)
+            # Empty chunks have nothing to hand out.
+            if chunk_len and self._span_cb is not None:
+                self._span_cb(0, chunk_len)
+            elif chunk_len:
+                self._deliver(chunk)
         else:
             # Whoa! We got extra bytes.
             expected_size = self.expected_len - self.received_len
@@ -120,15 +272,19 @@ class FixedLenProcessor(BodyProcessor):
                 error_cb(ValueError('Body length is negative!'))
                 return -1
 
-            expected_chunk = chunk[:expected_size]
+            # Only copy the part of the chunk that belongs to the body.
             self.received_len += expected_size
             nprocessed += expected_size
-            data_cb(expected_chunk)
+            if expected_size and self._span_cb is not None:
+                self._span_cb(0, expected_size)
+            elif expected_size:
+                self._deliver(memoryview(chunk)[:expected_size])
 
+        self._flush()
         if self.received_len == self.expected_len:
             # We are finished!
             self.finished = True
-            finished_cb()
+            self._finish_body()
 
         return nprocessed
 
@@ -152,22 +308,39 @@ class ChunkedProcessor(BodyProcessor):
 
         self.finished = False
         self.had_error = False
-        # None means no chunk is expected.
+        # The number of bytes left in the current chunk. None means no chunk is expected.
         self.next_chunk_size: Optional[int] = None
         self.expecting_extensions = False
+        # Whether all data of a (non-last) chunk was handed out, and its newline is next.
+        self.expecting_chunk_end = False
         self.extensions: List[str] = []
 
-    def _parse_chunk_size(self, buf: bytes, allow_lf: bool) -> Tuple[int, bytes]:
+    def reset(self) -> None:
+        """Reset this processor, so it could process another body.
+
+        The callbacks that were registered are kept, so a processor could be
+        reused for many bodies without setting it up again.
+        """
+        self.finished = False
+        self.had_error = False
+        self.next_chunk_size = None
+        self.expecting_extensions = False
+        self.expecting_chunk_end = False
+        # Don't clear the old list; someone could still be using it.
+        self.extensions = []
+        self._into_len = 0
+
+    def _parse_chunk_size(self, buf: memoryview, pos: int, allow_lf: bool) -> int:
         """
-        Parse a chunk's size.
+        Parse a chunk's size, which starts at ``buf[pos]``.
 
-        Return the number of bytes parsed and the remaining bytes.
+        Return the number of bytes parsed.
         """
         nprocessed = 0
-        result = _parse_chunk_size(buf, allow_lf)
+        result = _parse_chunk_size(buf, pos, allow_lf)
         if result is None:
             # Incomplete.
-            return (nprocessed, buf)
+            return nprocessed
 
         chunk_size, parsed, expecting_extensions = result
 
@@ -175,21 +348,21 @@ class ChunkedProcessor(BodyProcessor):
         self.expecting_extensions = expecting_extensions
         nprocessed += parsed
 
-        return (nprocessed, buf[nprocessed:])
+        return nprocessed
 
-    def _parse_chunk_extensions(self, buf: bytes, allow_lf: bool) -> Tuple[int, bytes]:
+    def _parse_chunk_extensions(self, buf: memoryview, pos: int, allow_lf: bool) -> int:
         """
-        Parse a chunk's extensions, if any.
+        Parse a chunk's extensions, if any. The extensions start at ``buf[pos]``.
 
-        Return the number of bytes parsed and the remaining bytes.
+        Return the number of bytes parsed.
         """
         nprocessed = 0
 
         # Receive chunk extensions, but do not parse them.
-        result = _recv_chunk_extensions(buf, allow_lf)
+        result = _recv_chunk_extensions(buf, pos, allow_lf)
         if result is None:
             self.expecting_extensions = True
-            return (nprocessed, buf)
+            return nprocessed
         self.expecting_extensions = False
 
         extensions, parsed = result
@@ -198,35 +371,44 @@ class ChunkedProcessor(BodyProcessor):
             # We have extensions!
             self.extensions.append(extensions)
 
-        return (nprocessed, buf[parsed:])
+        return nprocessed
 
-    def _process_chunk(self, buf: bytes, allow_lf: bool) -> Optional[Tuple[int, bytes]]:
+    def _process_chunk(self, buf: memoryview, pos: int, allow_lf: bool) -> Optional[int]:
         """
-        Process a chunk which has size ``self.next_chunk_size``.
+        Process the rest of a chunk, which has ``self.next_chunk_size`` bytes
+        left and continues at ``buf[pos]``.
 
-        None is returned if there is not enough data. Returns the number of
-        bytes processed and the remaining bytes.
+        The chunk's data is handed out as soon as it arrives, so a big chunk
+        never has to be kept around whole. None is returned if there is not
+        enough data to process anything. Returns the number of bytes processed.
         """
         nprocessed = 0
-        if self.next_chunk_size is None:
+        remaining = self.next_chunk_size
+        if remaining is None:
             # What.
             raise TypeError('Trying to parse chunk when size is None')
 
-        if len(buf) < self.next_chunk_size:
-            # Not enough data.
-            return None
-        # buf.advance(self.next_chunk_size)
-        nprocessed += self.next_chunk_size
-
-        # Get the chunk's contents and drop them
-        chunk_contents = buf[:self.next_chunk_size]
-        buf = buf[self.next_chunk_size:]
+        if remaining > 0:
+            ndata = min(remaining, len(buf) - pos)
+            if ndata <= 0:
+                # Not enough data.
+                return None
+            if self._span_cb is not None:
+                self._span_cb(pos, ndata)
+            else:
+                self._deliver(buf[pos:pos + ndata])
+            nprocessed += ndata
+            remaining -= ndata
+            self.next_chunk_size = remaining
+            if remaining > 0:
+                return nprocessed
+            self.expecting_chunk_end = True
 
         # There should be a newline after the chunk contents
-        n_result = startswith_newline(buf, allow_lf)
+        n_result = startswith_newline(buf, allow_lf, pos + nprocessed)
         if n_result is None:
             # Incomplete.
-            return None
+            return nprocessed or None
 
         is_newline, newline_type = n_result
         if not is_newline:
@@ -235,22 +417,47 @@ class ChunkedProcessor(BodyProcessor):
                 'Expected newline to signify end-of-chunk!')
 
         # Process the newline
-        newline_len = 2 if newline_type is NewlineType.CRLF else 1
-        nprocessed += newline_len
-        buf = buf[newline_len:]
+        nprocessed += 2 if newline_type is NewlineType.CRLF else 1
+        self.next_chunk_size = None
 
-        if self.next_chunk_size == 0:
-            # That was the last chunk.
-            self.finished = True
-            self.next_chunk_size = None
-            self.callbacks['finished']()
-            return (nprocessed, buf)
+        if self.expecting_chunk_end:
+            self.expecting_chunk_end = False
+            return nprocessed
 
-        self.callbacks['data'](chunk_contents)
-        self.next_chunk_size = None
-        return (nprocessed, buf)
+        # That was the last chunk.
+        self.finished = True
+        self._finish_body()
+        return nprocessed
 
-    def _process(self, buf: bytes, allow_lf: bool) -> int:
+    def _process_fast(self, buf: memoryview, pos: int) -> int:
+        """Process the complete, CRLF-delimited chunks which start at ``buf[pos]``.
+
+        Returns where the first chunk that isn't complete (or isn't usual)
+        starts, so the state machine could take over from there.
+        """
+        span_cb = self._span_cb
+        while True:
+            chunk = _next_chunk(buf, pos)
+            if chunk is None:
+                return pos
+
+            start, end, extensions = chunk
+            if extensions:
+                self.extensions.append(extensions.decode('utf-8'))
+            pos = end + 2
+
+            if start == end:
+                # That was the last chunk.
+                self.finished = True
+                self._finish_body()
+                return pos
+
+            if span_cb is not None:
+                span_cb(start, end - start)
+            else:
+                self._deliver(buf[start:end])
+
+    def _process(self, buf: memoryview, allow_lf: bool) -> int:
         """Internal ``._process()`` method.
 
         Contains the processor directing logic. All errors will be propagated
@@ -259,38 +466,34 @@ class ChunkedProcessor(BodyProcessor):
         nprocessed = 0
 
         while not self.finished:
+            if self.next_chunk_size is None and not self.expecting_extensions:
+                # Take as many chunks as possible in one go.
+                nprocessed = self._process_fast(buf, nprocessed)
+                if self.finished:
+                    break
             if self.next_chunk_size is None:
                 # Parse chunk size.
-                parsed, rest = self._parse_chunk_size(buf, allow_lf)
-
-                nprocessed += parsed
-                buf = rest
+                nprocessed += self._parse_chunk_size(buf, nprocessed, allow_lf)
             if self.next_chunk_size is None:
                 # If there was not enough data to parse a full chunk size, don't go on.
                 break
             if self.expecting_extensions:
                 # We are expecting chunk extensions.
-                parsed, rest = self._parse_chunk_extensions(buf, allow_lf)
-
-                nprocessed += parsed
-                buf = rest
+                nprocessed += self._parse_chunk_extensions(buf, nprocessed, allow_lf)
             if self.expecting_extensions:
                 # There wasn't enough data.
                 break
 
-            ret = self._process_chunk(buf, allow_lf)
+            ret = self._process_chunk(buf, nprocessed, allow_lf)
             if ret is None:
                 # Not enough data.
                 break
 
-            parsed, rest = ret
-
-            nprocessed += parsed
-            buf = rest
+            nprocessed += ret
 
         return nprocessed
 
-    def process(self, chunk: bytes, allow_lf: bool) -> int:
+    def process(self, chunk: Union[bytes, bytearray, memoryview], allow_lf: bool) -> int:
         """Process ``chunk`` as a part of the HTTP body."""
         if self.finished:
             self.callbacks['error'](errors.DoneError(
@@ -302,7 +505,9 @@ class ChunkedProcessor(BodyProcessor):
             return -1
 
         try:
-            return self._process(chunk, allow_lf)
+            nprocessed = self._process(memoryview(chunk), allow_lf)
+            self._flush()
+            return nprocessed
         except (errors.NewlineError, errors.InvalidChunkSize,
                 errors.InvalidChunk, errors.InvalidChunkExtensions,
                 UnicodeDecodeError) as ex:
@@ -311,8 +516,110 @@ class ChunkedProcessor(BodyProcessor):
             return -1
 
 
-def _parse_chunk_size(buf: bytes, allow_lf: bool) -> Optional[Tuple[int, int, bool]]:
-    """Parse and return the chunk size contained in ``buf``.
+class UntilCloseProcessor(BodyProcessor):
+    """An UntilCloseProcessor processes HTTP bodies that end when the connection closes."""
+
+    def __init__(self) -> None:
+        """Create a new UntilCloseProcessor.
+
+        An UntilCloseProcessor processes the body of a response which has
+        neither a ``Content-Length`` header nor a chunked ``Transfer-Encoding``.
+        Such a body is everything up to the end of the connection, so all data
+        passed to this processor is body data, until ``.finish()`` is called.
+        """
+        super().__init__()
+
+        self.received_len = 0
+        self.finished = False
+
+    def reset(self) -> None:
+        """Reset this processor, so it could process another body.
+
+        The callbacks that were registered are kept, so a processor could be
+        reused for many bodies without setting it up again.
+        """
+        self.received_len = 0
+        self.finished = False
+        self._into_len = 0
+
+    def process(self, chunk: Union[bytes, bytearray, memoryview], _: bool = True) -> int:
+        """Process the next few bytes as part of the HTTP body.
+
+        Returns the number of bytes processed, which is always all of them. If
+        the body has finished already, -1 is returned.
+        """
+        if self.finished:
+            self.callbacks['error'](errors.DoneError())
+            return -1
+
+        chunk_len = len(chunk)
+        if not chunk_len:
+            return 0
+
+        self.received_len += chunk_len
+        if self._span_cb is not None:
+            self._span_cb(0, chunk_len)
+        else:
+            self._deliver(chunk)
+        self._flush()
+        return chunk_len
+
+    def finish(self) -> None:
+        """Tell this processor that the connection was closed, ending the body."""
+        if not self.finished:
+            self.finished = True
+            self._finish_body()
+
+
+def _next_chunk(
+    buf: memoryview, pos: int
+) -> Optional[Tuple[int, int, Optional[bytes]]]:
+    """Find the chunk which starts at ``buf[pos]``.
+
+    Return the start and end offsets of its data, and its raw chunk extensions.
+    None is returned if the chunk isn't complete, or isn't delimited by CRLFs.
+    Every search is bounded, so this never looks past the end of the chunk.
+    """
+    match = _CHUNK_HEAD_RE.match(buf, pos)
+    if match is None:
+        return None
+
+    chunk_size = int(match.group(1), 16)
+    if chunk_size > constants.MAX_CHUNK_SIZE:
+        raise errors.InvalidChunkSize('Chunk size too large!')
+
+    start = match.end()
+    end = start + chunk_size
+    if len(buf) < end + 2 or buf[end] != _CR or buf[end + 1] != _LF:
+        return None
+    return (start, end, match.group(2))
+
+
+def iter_chunks(body: Union[bytes, bytearray, memoryview]) -> Iterator[memoryview]:
+    """Decode the complete, chunked ``body``, and yield the data of each chunk.
+
+    Chunks are yielded as ``memoryview`` slices of ``body``, so nothing is
+    copied. Unlike ``ChunkedProcessor``, only CRLF newlines are accepted, and
+    chunk extensions are skipped.
+    """
+    buf = memoryview(body)
+    pos = 0
+    while True:
+        chunk = _next_chunk(buf, pos)
+        if chunk is None:
+            raise errors.InvalidChunk(f'Invalid or incomplete chunk at offset {pos}!')
+
+        start, end, _ = chunk
+        if start == end:
+            return
+        yield buf[start:end]
+        pos = end + 2
+
+
+def _parse_chunk_size(
+    buf: memoryview, pos: int, allow_lf: bool
+) -> Optional[Tuple[int, int, bool]]:
+    """Parse and return the chunk size which starts at ``buf[pos]``.
 
     Return a tuple containing the parsed chunk size, the number of bytes parsed,
     and if chunk extensions are expected.
@@ -320,14 +627,18 @@ def _parse_chunk_size(buf: bytes, allow_lf: bool) -> Optional[Tuple[int, int, bo
     """
     nparsed = 0
 
-    semi_index = buf.find(_SEMI)
-    newline_idx, newline_type = find_newline(buf, allow_lf)
-
-    has_newline = bool(~newline_idx)
+    # The chunk size ends at a semicolon (if there are chunk extensions) or
+    # a newline, so neither has to be looked for past the longest chunk size.
+    semi_index = find(_SEMI_RE, buf, pos, pos + constants.MAX_CHUNK_SIZE_DIGITS + 1)
     has_semi = bool(~semi_index)
+    newline_idx, newline_type = find_newline(
+        buf, allow_lf, pos,
+        semi_index - pos if has_semi else constants.MAX_CHUNK_SIZE_DIGITS
+    )
+    has_newline = newline_idx >= 0
 
     if not has_semi and not has_newline:
-        if len(buf) > constants.MAX_CHUNK_SIZE_DIGITS:
+        if newline_idx == LIMIT_EXCEEDED:
             # There should be enough bytes for a valid chunk size.
             raise errors.InvalidChunkSize('Chunk size too large!')
         # Incomplete.
@@ -335,24 +646,24 @@ def _parse_chunk_size(buf: bytes, allow_lf: bool) -> Optional[Tuple[int, int, bo
 
     # Only assume there are chunk extensions if the semicolon appears
     # in front of the LF and CRLF (if any).
-    if has_semi and ((semi_index < newline_idx) or not has_newline):
+    if not has_newline:
         # There are chunk extensions.
-        nparsed += semi_index
-        raw_chunk_size = buf[:semi_index]
+        nparsed += semi_index - pos
+        raw_chunk_size = bytes(buf[pos:semi_index])
         has_chunk_extensions = True
 
         # Process the semicolon
         nparsed += 1
     else:
         # No chunk extensions
-        nparsed += newline_idx
-        raw_chunk_size = buf[:newline_idx]
+        nparsed += newline_idx - pos
+        raw_chunk_size = bytes(buf[pos:newline_idx])
         has_chunk_extensions = False
 
         # Process the newline
         nparsed += 2 if newline_type is NewlineType.CRLF else 1
 
-    if not _are_hex_digits(raw_chunk_size):
+    if not raw_chunk_size or not _are_hex_digits(raw_chunk_size):
         # Chunk size must only contain hexadecimal digits.
         raise errors.InvalidChunkSize(
             'Chunk size must only contain hexadecimal digits!')
@@ -363,19 +674,21 @@ def _parse_chunk_size(buf: bytes, allow_lf: bool) -> Optional[Tuple[int, int, bo
     return (chunk_size, nparsed, has_chunk_extensions)
 
 
-def _recv_chunk_extensions(buf: bytes, allow_lf: bool) -> Optional[Tuple[str, int]]:
-    """Receive all chunk extensions up to a newline. Return the extensions
-    and number of bytes parsed.
+def _recv_chunk_extensions(
+    buf: memoryview, pos: int, allow_lf: bool
+) -> Optional[Tuple[str, int]]:
+    """Receive all chunk extensions from ``buf[pos]`` up to a newline. Return
+    the extensions and number of bytes parsed.
 
     This method does not validate or parse chunk extensions. The size of
     chunk extensions is limited to 4KiB.
     """
     nrecved = 0
 
-    newline_idx, newline_type = find_newline(buf, allow_lf)
-    has_newline = bool(~newline_idx)
-    if not has_newline:
-        if len(buf) > constants.MAX_CHUNK_EXTENSION_SIZE:
+    newline_idx, newline_type = find_newline(
+        buf, allow_lf, pos, constants.MAX_CHUNK_EXTENSION_SIZE)
+    if newline_idx < 0:
+        if newline_idx == LIMIT_EXCEEDED:
             # Chunk extensions are too large.
             raise errors.InvalidChunkExtensions(
                 'Chunk extensions too large! Max 4KiB per chunk.')
@@ -383,10 +696,10 @@ def _recv_chunk_extensions(buf: bytes, allow_lf: bool) -> Optional[Tuple[str, in
         # Otherwise, incomplete.
         return None
 
-    nrecved += newline_idx
+    nrecved += newline_idx - pos
 
     # Receive extensions
-    raw_extensions = buf[nrecved:]
+    raw_extensions = bytes(buf[pos:newline_idx])
 
     # Account for the newline
     nrecved += 2 if newline_type is NewlineType.CRLF else 1
@@ -397,3 +710,169 @@ def _recv_chunk_extensions(buf: bytes, allow_lf: bool) -> Optional[Tuple[str, in
 def _are_hex_digits(_bytes: bytes) -> bool:
     """Are the bytes in ``_bytes`` all valid hex digits?"""
     return len(_bytes.translate(None, constants.HEX_DIGITS)) == 0
+
+
+class BodySink:
+    """A BodySink streams HTTP bodies into a file descriptor."""
+
+    # Memory, spilling and batching each need their own state.
+    # pylint: disable=R0902
+    def __init__(
+        self,
+        fd: Optional[int] = None,
+        spill_threshold: int = _DEFAULT_SPILL_THRESHOLD,
+        batch_size: int = _DEFAULT_BATCH_SIZE
+    ) -> None:
+        """Create a new BodySink.
+
+        If ``fd`` is given, body data is written to it. Otherwise, body data
+        is kept in memory until more than ``spill_threshold`` bytes have
+        been received, after which it is moved to a temporary file.
+
+        Writes to the file descriptor are batched with ``os.writev()``, and
+        happen once ``batch_size`` bytes are pending.
+        """
+        if spill_threshold < 0:
+            raise ValueError('Spill threshold must not be negative!')
+        if batch_size < 1:
+            raise ValueError('Batch size must be positive!')
+
+        self.spill_threshold = spill_threshold
+        self.batch_size = batch_size
+        # Number of bytes written to this sink so far.
+        self.size = 0
+
+        self._fd = fd
+        self._file: Optional[IO[bytes]] = None
+        self._memory: Optional[bytearray] = bytearray() if fd is None else None
+        self._pending: List[Union[bytes, bytearray, memoryview]] = []
+        self._pending_len = 0
+
+    @property
+    def fd(self) -> Optional[int]:
+        """The file descriptor body data is written to, or ``None``."""
+        return self._fd
+
+    @property
+    def file(self) -> Optional[IO[bytes]]:
+        """The temporary file body data was spilled to, or ``None``."""
+        return self._file
+
+    @property
+    def spilled(self) -> bool:
+        """Whether body data has been spilled to a temporary file."""
+        return self._file is not None
+
+    def attach(self, processor: BodyProcessor) -> None:
+        """Make ``processor`` write the bodies it processes to this sink.
+
+        Pending body data is flushed once each body has finished, before the
+        finished callback of ``processor`` is called. This replaces any sink
+        ``processor`` had, and keeps working when ``processor`` belongs to a
+        HTTPParser.
+        """
+        processor.on_sink(self)
+
+    def detach(self, processor: BodyProcessor) -> None:
+        """Make ``processor`` hand out the bodies it processes again.
+
+        Pending body data is flushed. Nothing happens if ``processor`` writes
+        to another sink.
+        """
+        if processor._sink is self:  # pylint: disable=W0212
+            processor.on_sink(None)
+            self.flush()
+
+    def write(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        """Write ``data`` to this sink.
+
+        ``data`` is not copied if it is going to a file descriptor; it must
+        not be modified until the next ``.flush()``. Pass ``bytes`` to be safe.
+        """
+        data_len = len(data)
+        if data_len == 0:
+            return
+        self.size += data_len
+
+        memory = self._memory
+        if memory is not None:
+            memory += data
+            if len(memory) > self.spill_threshold:
+                self._spill()
+            return
+
+        self._pending.append(data)
+        self._pending_len += data_len
+        if self._pending_len >= self.batch_size or len(self._pending) >= _IOV_MAX:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all pending body data to the file descriptor."""
+        pending = self._pending
+        if not pending:
+            return
+        fd = self._fd
+        assert fd is not None
+
+        self._pending = []
+        self._pending_len = 0
+        if not hasattr(os, 'writev'):
+            for data in pending:
+                _write_all(fd, data)
+            return
+
+        while pending:
+            nwritten = os.writev(fd, pending)
+            # Drop the buffers that were written completely.
+            i = 0
+            while i < len(pending) and nwritten >= len(pending[i]):
+                nwritten -= len(pending[i])
+                i += 1
+            del pending[:i]
+            if nwritten > 0:
+                # Partial write; retry with the rest of the first buffer.
+                pending[0] = memoryview(pending[0])[nwritten:]
+
+    def getbuffer(self) -> memoryview:
+        """Return a view of the body data kept in memory.
+
+        Raises ``ValueError`` if the body data isn't kept in memory.
+        """
+        if self._memory is None:
+            raise ValueError('Body data is not kept in memory!')
+        return memoryview(self._memory)
+
+    def close(self) -> None:
+        """Flush pending body data, and close the temporary file (if any).
+
+        File descriptors passed to the constructor are not closed.
+        """
+        if self._fd is not None:
+            self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._fd = None
+
+    def __enter__(self) -> 'BodySink':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _spill(self) -> None:
+        """Move the body data kept in memory to a temporary file."""
+        memory = self._memory
+        assert memory is not None
+
+        self._file = tempfile.TemporaryFile()
+        self._fd = self._file.fileno()
+        self._memory = None
+        _write_all(self._fd, memory)
+
+
+def _write_all(fd: int, data: Union[bytes, bytearray, memoryview]) -> None:
+    """Write all of ``data`` to ``fd``."""
+    view = memoryview(data)
+    while len(view) > 0:
+        view = view[os.write(fd, view):]
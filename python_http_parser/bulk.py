@@ -0,0 +1,379 @@
+"""
+The ``python_http_parser.bulk`` module parses capture files full of HTTP
+messages, spreading the work over a pool of worker processes.
+"""
+
+__all__ = [
+    'Record',
+    'parse_file',
+    'parse_many',
+]
+
+import mmap
+import os
+import re
+import struct
+import threading
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain
+from typing import Any, Deque, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from . import errors
+from .constants import ParserStrictness
+from .helpers.collector import MessageCollector
+from .stream import HeaderList, HTTPVersion
+
+# Shards are about 4MiB of messages each.
+_DEFAULT_SHARD_SIZE = 4 * 1024 * 1024
+# parse_many() hands each worker thread about this many batches of messages,
+# so threads which finish early can pick up the slack.
+_BATCHES_PER_WORKER = 4
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+# Only the headers which frame the body are looked at when splitting a file.
+_FRAMING_RE = re.compile(
+    rb'^(content-length|transfer-encoding)[ \t]*:[ \t]*([^\r\n]*)',
+    re.IGNORECASE | re.MULTILINE)
+
+
+class Record(NamedTuple):
+    """A message which was parsed out of a capture file.
+
+    ``offset`` and ``length`` locate the message in the file. The body isn't
+    copied out of the file; only its length is recorded. If the message could
+    not be parsed, ``error`` is the exception that was raised, and the other
+    fields are only as complete as the parser got.
+    """
+    offset: int
+    length: int
+    method: Optional[bytes]
+    uri: Optional[bytes]
+    status_code: Optional[int]
+    reason: Optional[bytes]
+    version: Optional[HTTPVersion]
+    headers: HeaderList
+    body_length: int
+    error: Optional[Exception]
+
+
+# Workers send back the fields of each Record as a plain tuple, which is
+# quicker to pickle and unpickle than a Record.
+_RawRecord = Tuple[Any, ...]
+
+
+def _head_end(buf: Union[bytes, mmap.mmap], pos: int) -> int:
+    """Find where the head of the message at ``buf[pos]`` ends, or -1."""
+    newline_index = buf.find(b'\n', pos)
+    if not bool(~newline_index):
+        return -1
+
+    if newline_index > pos and buf[newline_index - 1] == 0x0d:
+        double_newline = b'\r\n\r\n'
+    else:
+        double_newline = b'\n\n'
+
+    head_end = buf.find(double_newline, pos)
+    if not bool(~head_end):
+        return -1
+    return head_end + len(double_newline)
+
+
+def _chunked_body_end(buf: Union[bytes, mmap.mmap], pos: int, end: int) -> int:
+    """Find where the chunked body at ``buf[pos]`` ends, or -1."""
+    while pos < end:
+        line_end = buf.find(b'\n', pos, end)
+        if not bool(~line_end):
+            return -1
+
+        size = buf[pos:line_end].split(b';', 1)[0].strip()
+        try:
+            chunk_size = int(size, 16)
+        except ValueError:
+            raise errors.InvalidChunk(f'Invalid chunk size at offset {pos}!') from None
+
+        pos = line_end + 1
+        if chunk_size:
+            # Skip the data, and the newline after it.
+            pos += chunk_size
+            pos += 2 if buf[pos:pos + 1] == b'\r' else 1
+            continue
+
+        # Skip the trailers, up to and including the empty line.
+        while pos < end:
+            line_end = buf.find(b'\n', pos, end)
+            if not bool(~line_end):
+                return -1
+            line_len = line_end - pos
+            pos = line_end + 1
+            if line_len == 0 or (line_len == 1 and buf[line_end - 1] == 0x0d):
+                return pos
+        return -1
+
+    return -1
+
+
+def _body_end(buf: Union[bytes, mmap.mmap], pos: int, head_end: int,
+              is_response: bool) -> int:
+    """Find where the body of the message at ``buf[pos]`` ends.
+
+    The head of the message ends at ``head_end``. Bodies which aren't framed
+    end with the connection, which is the end of ``buf``.
+    """
+    end = len(buf)
+    content_length = None
+    transfer_encoding = False
+    chunked = False
+    for match in _FRAMING_RE.finditer(buf, pos, head_end):
+        name, value = match.group(1, 2)
+        value = value.strip()
+        if len(name) == 14:
+            if not value.isdigit():
+                raise errors.InvalidHeaderVal(
+                    f'Invalid Content-Length in message at offset {pos}!')
+            content_length = int(value)
+        else:
+            transfer_encoding = True
+            last_coding = value.rsplit(b',', 1)[-1].strip().lower()
+            if last_coding:
+                chunked = last_coding == b'chunked'
+
+    if is_response:
+        status_code = buf[pos + 9:pos + 12]
+        if status_code.isdigit() and (
+                status_code[0] == 0x31 or status_code in (b'204', b'304')):
+            # These never have a body.
+            return head_end
+
+    if chunked:
+        body_end = _chunked_body_end(buf, head_end, end)
+        return end if not bool(~body_end) else body_end
+    if transfer_encoding or (is_response and content_length is None):
+        return end
+    if content_length:
+        return min(head_end + content_length, end)
+    return head_end
+
+
+def _message_spans(buf: Union[bytes, mmap.mmap],
+                   is_response: bool) -> Iterator[Tuple[int, int]]:
+    """Find the raw messages which are concatenated in ``buf``.
+
+    Yields the start and end offsets of each message. Only the start line and
+    the framing headers are looked at, so this is much cheaper than parsing.
+    """
+    end = len(buf)
+    pos = 0
+    while pos < end:
+        if not is_response:
+            # Skip empty lines between requests, just like the parser does.
+            while pos < end and buf[pos] in (0x0d, 0x0a):
+                pos += 1
+            if pos == end:
+                return
+
+        head_end = _head_end(buf, pos)
+        if not bool(~head_end):
+            # Incomplete; let the parser report it.
+            yield pos, end
+            return
+
+        body_end = _body_end(buf, pos, head_end, is_response)
+        yield pos, body_end
+        pos = body_end
+
+
+def _record_spans(buf: Union[bytes, mmap.mmap],
+                  record_prefix: str) -> Iterator[Tuple[int, int]]:
+    """Find the length-prefixed records in ``buf``.
+
+    Yields the start and end offsets of each record, without its prefix.
+    """
+    prefix = struct.Struct(record_prefix)
+    end = len(buf)
+    pos = 0
+    while pos + prefix.size <= end:
+        (length,) = prefix.unpack_from(buf, pos)
+        pos += prefix.size
+        yield pos, min(pos + length, end)
+        pos += length
+
+
+def _shards(spans: Iterator[Tuple[int, int]], shard_size: int) -> Iterator['array[int]']:
+    """Group message spans into shards of about ``shard_size`` bytes.
+
+    Each shard is a flat array of start and end offsets, which is cheap to
+    send to a worker process.
+    """
+    shard = array('Q')
+    shard_start = None
+    for start, end in spans:
+        if shard_start is None:
+            shard_start = start
+        shard.append(start)
+        shard.append(end)
+        if end - shard_start >= shard_size:
+            yield shard
+            shard = array('Q')
+            shard_start = None
+
+    if shard:
+        yield shard
+
+
+class _RecordCollector(MessageCollector):  # pylint: disable=R0903
+    """Turns the events of a HTTPParser into ``Record``s."""
+
+    def __init__(self, is_response: bool, strictness: ParserStrictness) -> None:
+        super().__init__(is_response, strictness, body_spans=True)
+        self._clear()
+
+    def _clear(self) -> None:
+        self._clear_start_line()
+        self._headers: HeaderList = []
+        self._body_length = 0
+        self._error: Optional[Exception] = None
+
+    def parse(self, buf: memoryview, start: int, end: int) -> _RawRecord:
+        """Parse the message in ``buf[start:end]``."""
+        parser = self._parser
+        parser.reset()
+        try:
+            if parser.process(buf[start:end]) >= 0:
+                # The message ends here, just like a connection would.
+                parser.finish()
+                if not parser.finished():
+                    self._error = errors.ParsingError('Incomplete message!')
+        except Exception as ex:  # pylint: disable=W0703
+            self._on_error(ex)
+
+        record = (
+            start, end - start, self._method, self._uri, self._status_code,
+            self._reason, self._version, self._headers, self._body_length,
+            self._error)
+        self._clear()
+        return record
+
+    def _on_error(self, err: Exception) -> None:
+        # The traceback would keep views of the mapped file alive.
+        self._error = err.with_traceback(None)
+
+    def _on_headers_complete(self, headers: HeaderList) -> None:
+        self._headers = headers
+
+    def _on_body_span(self, offset: int, length: int) -> None:
+        self._body_length += length
+
+
+def _parse_shard(path: str, spans: 'array[int]', is_response: bool,
+                 strictness: ParserStrictness) -> List[_RawRecord]:
+    """Parse one shard of a capture file. This runs in a worker process."""
+    collector = _RecordCollector(is_response, strictness)
+    with open(path, 'rb') as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        with memoryview(buf) as view:
+            return [
+                collector.parse(view, spans[i], spans[i + 1])
+                for i in range(0, len(spans), 2)
+            ]
+
+
+# Each thread of a parse_many() pool keeps its own _RecordCollector here.
+_thread_local = threading.local()
+
+
+def _init_thread(is_response: bool, strictness: ParserStrictness) -> None:
+    _thread_local.collector = _RecordCollector(is_response, strictness)
+
+
+def _parse_messages(collector: _RecordCollector,
+                    messages: Sequence[Buffer]) -> List[Record]:
+    records = []
+    for msg in messages:
+        with memoryview(msg) as view:
+            records.append(Record._make(collector.parse(view, 0, len(view))))
+    return records
+
+
+def _parse_batch(messages: Sequence[Buffer]) -> List[Record]:
+    """Parse a batch of messages with the collector of the current thread."""
+    return _parse_messages(_thread_local.collector, messages)
+
+
+def parse_many(messages: Sequence[Buffer],
+               is_response: bool = False,
+               workers: Optional[int] = None,
+               strictness: ParserStrictness = ParserStrictness.NORMAL) -> List[Record]:
+    """Parse many independent messages with a pool of ``workers`` threads.
+
+    Each message must be complete. Every thread parses its share of the
+    messages with one ``HTTPParser``, which is reset between messages. Returns
+    a ``Record`` (with an ``offset`` of 0) for each message, in input order.
+
+    Threads only parse in parallel on free-threaded builds of CPython;
+    elsewhere, a single thread is just as fast.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('workers must be positive!')
+
+    if workers == 1 or len(messages) < 2:
+        return _parse_messages(_RecordCollector(is_response, strictness), messages)
+
+    batch_size = -(-len(messages) // (workers * _BATCHES_PER_WORKER))
+    batches = [
+        messages[i:i + batch_size] for i in range(0, len(messages), batch_size)
+    ]
+    with ThreadPoolExecutor(workers, initializer=_init_thread,
+                            initargs=(is_response, strictness)) as pool:
+        return list(chain.from_iterable(pool.map(_parse_batch, batches)))
+
+
+# pylint: disable=R0913,R0917
+def parse_file(path: Union[str, os.PathLike],
+               is_response: bool = False,
+               record_prefix: Optional[str] = None,
+               workers: Optional[int] = None,
+               shard_size: int = _DEFAULT_SHARD_SIZE,
+               strictness: ParserStrictness = ParserStrictness.NORMAL) -> Iterator[Record]:
+    """Parse all the HTTP messages in a capture file, in parallel.
+
+    The file holds either raw messages, back to back, or length-prefixed
+    records of one message each, if ``record_prefix`` is the ``struct`` format
+    of the prefix (``'>I'`` for a 4-byte, big-endian length, for example).
+
+    The file is memory-mapped and split into shards of about ``shard_size``
+    bytes at message boundaries, which are handed to a pool of ``workers``
+    processes (by default, one per CPU). Workers map the file themselves, so
+    only offsets are sent to them. Returns an iterator of ``Record``s, in the
+    order the messages appear in the file; only a few shards are in flight at
+    a time, so results are streamed.
+    """
+    if shard_size < 1:
+        raise ValueError('shard_size must be positive!')
+
+    path = os.fspath(path)
+    if os.path.getsize(path) == 0:
+        # Empty files can't be mapped.
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with open(path, 'rb') as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buf, \
+            ProcessPoolExecutor(workers) as pool:
+        if record_prefix is None:
+            spans = _message_spans(buf, is_response)
+        else:
+            spans = _record_spans(buf, record_prefix)
+
+        pending: Deque['Future[List[_RawRecord]]'] = deque()
+        for shard in _shards(spans, shard_size):
+            pending.append(
+                pool.submit(_parse_shard, path, shard, is_response, strictness))
+            if len(pending) > workers * 2:
+                yield from map(Record._make, pending.popleft().result())
+
+        while pending:
+            yield from map(Record._make, pending.popleft().result())
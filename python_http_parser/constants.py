@@ -1,5 +1,6 @@
 """``python_http_parser`` constants."""
 
+import sys
 from enum import Enum, IntEnum
 from string import ascii_letters, digits, hexdigits
 
@@ -40,6 +41,115 @@ class ParserState(Enum):
     PROCESSING_BODY = 12
 
 
+class Method(IntEnum):
+    """An enum of the standard HTTP request methods. Look them up with ``METHODS``."""
+    GET = 1
+    HEAD = 2
+    POST = 3
+    PUT = 4
+    DELETE = 5
+    CONNECT = 6
+    OPTIONS = 7
+    TRACE = 8
+    PATCH = 9
+
+
+# The standard request methods, mapped to their Method.
+METHODS = {
+    method.name.encode('ascii'): method for method in Method
+}
+
+
+class HeaderField(IntEnum):
+    """An enum of well-known header fields. Look them up with ``HEADER_FIELDS``."""
+    HOST = 1
+    CONNECTION = 2
+    KEEP_ALIVE = 3
+    CONTENT_LENGTH = 4
+    CONTENT_TYPE = 5
+    CONTENT_ENCODING = 6
+    CONTENT_LANGUAGE = 7
+    CONTENT_LOCATION = 8
+    CONTENT_RANGE = 9
+    CONTENT_DISPOSITION = 10
+    TRANSFER_ENCODING = 11
+    TE = 12
+    TRAILER = 13
+    UPGRADE = 14
+    USER_AGENT = 15
+    ACCEPT = 16
+    ACCEPT_CHARSET = 17
+    ACCEPT_ENCODING = 18
+    ACCEPT_LANGUAGE = 19
+    ACCEPT_RANGES = 20
+    AUTHORIZATION = 21
+    CACHE_CONTROL = 22
+    COOKIE = 23
+    SET_COOKIE = 24
+    DATE = 25
+    ETAG = 26
+    EXPECT = 27
+    EXPIRES = 28
+    FORWARDED = 29
+    FROM = 30
+    IF_MATCH = 31
+    IF_MODIFIED_SINCE = 32
+    IF_NONE_MATCH = 33
+    IF_RANGE = 34
+    IF_UNMODIFIED_SINCE = 35
+    LAST_MODIFIED = 36
+    LOCATION = 37
+    MAX_FORWARDS = 38
+    ORIGIN = 39
+    PRAGMA = 40
+    PROXY_AUTHENTICATE = 41
+    PROXY_AUTHORIZATION = 42
+    RANGE = 43
+    REFERER = 44
+    RETRY_AFTER = 45
+    SERVER = 46
+    VARY = 47
+    VIA = 48
+    WWW_AUTHENTICATE = 49
+    X_FORWARDED_FOR = 50
+    X_FORWARDED_HOST = 51
+    X_FORWARDED_PROTO = 52
+    X_REQUESTED_WITH = 53
+    DNT = 54
+    UPGRADE_INSECURE_REQUESTS = 55
+
+
+# Header names which aren't spelled like str.title() would spell them.
+_HEADER_FIELD_SPELLINGS = {
+    HeaderField.TE: b'TE',
+    HeaderField.ETAG: b'ETag',
+    HeaderField.WWW_AUTHENTICATE: b'WWW-Authenticate',
+    HeaderField.DNT: b'DNT',
+}
+
+
+def _lowercase_field_name(field: HeaderField) -> bytes:
+    """Return the lowercase header name of a well-known header field."""
+    return field.name.lower().replace('_', '-').encode('ascii')
+
+
+# The lowercase and usual spellings of each well-known header name, mapped to
+# its HeaderField.
+HEADER_FIELDS = {
+    spelling: field
+    for field in HeaderField
+    for spelling in (
+        _lowercase_field_name(field),
+        _HEADER_FIELD_SPELLINGS.get(field, _lowercase_field_name(field).title()),
+    )
+}
+# Shared, lowercase str names for the usual spellings of well-known header names.
+LOWERCASE_HEADER_NAMES = {
+    name.decode('ascii'): sys.intern(name.lower().decode('ascii'))
+    for name in HEADER_FIELDS
+}
+
+
 # All the characters in a HTTP token.
 TOKENS = ''.join([
     # IMO it doesn't really make sense to allow a bunch of random
@@ -73,6 +183,23 @@ DIGITS = digits.encode('utf-8')
 # All hexidecimal digits.
 HEX_DIGITS = hexdigits.encode('utf-8')
 
+
+def _char_table(*char_sets: bytes) -> bytes:
+    """Build a 256-entry lookup table, where allowed bytes map to 1 and others to 0."""
+    table = bytearray(256)
+    for chars in char_sets:
+        for char in chars:
+            table[char] = 1
+    return bytes(table)
+
+
+# 256-entry lookup tables for each character class above.
+TOKEN_TABLE = _char_table(TOKENS)
+URI_TABLE = _char_table(URI_CHARS)
+DIGIT_TABLE = _char_table(DIGITS)
+# Field values may contain obsolete text.
+FIELD_VALUE_TABLE = _char_table(VCHAR_OR_WSP, OBS_TXT)
+
 # Hard limit of 65535 characters in a HTTP URI.
 MAX_URI_LEN = 65535
 # Hard limit of 64 characters in a HTTP request method.
@@ -1,6 +1,7 @@
 """``python_http_parser`` constants."""
 
 from enum import Enum, IntEnum
+from typing import Dict
 # Literal was added in Python 3.8. We need to support Python 3.7.
 from typing_extensions import Literal
 
@@ -42,12 +43,95 @@ class ParserState(Enum):
     PROCESSING_BODY = 12
 
 
+class Method(IntEnum):
+    """An enum of the standard HTTP request methods. Look them up with ``METHODS``."""
+    GET = 1
+    HEAD = 2
+    POST = 3
+    PUT = 4
+    DELETE = 5
+    CONNECT = 6
+    OPTIONS = 7
+    TRACE = 8
+    PATCH = 9
+
+
+METHODS: Dict[bytes, Method]
+
+
+class HeaderField(IntEnum):
+    """An enum of well-known header fields. Look them up with ``HEADER_FIELDS``."""
+    HOST = 1
+    CONNECTION = 2
+    KEEP_ALIVE = 3
+    CONTENT_LENGTH = 4
+    CONTENT_TYPE = 5
+    CONTENT_ENCODING = 6
+    CONTENT_LANGUAGE = 7
+    CONTENT_LOCATION = 8
+    CONTENT_RANGE = 9
+    CONTENT_DISPOSITION = 10
+    TRANSFER_ENCODING = 11
+    TE = 12
+    TRAILER = 13
+    UPGRADE = 14
+    USER_AGENT = 15
+    ACCEPT = 16
+    ACCEPT_CHARSET = 17
+    ACCEPT_ENCODING = 18
+    ACCEPT_LANGUAGE = 19
+    ACCEPT_RANGES = 20
+    AUTHORIZATION = 21
+    CACHE_CONTROL = 22
+    COOKIE = 23
+    SET_COOKIE = 24
+    DATE = 25
+    ETAG = 26
+    EXPECT = 27
+    EXPIRES = 28
+    FORWARDED = 29
+    FROM = 30
+    IF_MATCH = 31
+    IF_MODIFIED_SINCE = 32
+    IF_NONE_MATCH = 33
+    IF_RANGE = 34
+    IF_UNMODIFIED_SINCE = 35
+    LAST_MODIFIED = 36
+    LOCATION = 37
+    MAX_FORWARDS = 38
+    ORIGIN = 39
+    PRAGMA = 40
+    PROXY_AUTHENTICATE = 41
+    PROXY_AUTHORIZATION = 42
+    RANGE = 43
+    REFERER = 44
+    RETRY_AFTER = 45
+    SERVER = 46
+    VARY = 47
+    VIA = 48
+    WWW_AUTHENTICATE = 49
+    X_FORWARDED_FOR = 50
+    X_FORWARDED_HOST = 51
+    X_FORWARDED_PROTO = 52
+    X_REQUESTED_WITH = 53
+    DNT = 54
+    UPGRADE_INSECURE_REQUESTS = 55
+
+
+HEADER_FIELDS: Dict[bytes, HeaderField]
+LOWERCASE_HEADER_NAMES: Dict[str, str]
+
+
 TOKENS: bytes
 URI_CHARS: bytes
 VCHAR_OR_WSP: bytes
 OBS_TXT: bytes
 DIGITS: bytes
 HEX_DIGITS: bytes
+TOKEN_TABLE: bytes
+URI_TABLE: bytes
+DIGIT_TABLE: bytes
+FIELD_VALUE_TABLE: bytes
 MAX_URI_LEN: Literal[65535]
 MAX_REQ_METHOD_LEN: Literal[64]
 MAX_REASON_LEN: Literal[1024]
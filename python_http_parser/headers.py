@@ -0,0 +1,174 @@
+"""
+The ``python_http_parser.headers`` module provides a lazy, read-only mapping
+of the headers in a HTTP message head.
+"""
+
+__all__ = [
+    'Headers',
+    'index_headers',
+]
+
+from array import array
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+from . import constants, errors
+
+# Header names and values are decoded from bytes as latin-1.
+_ENCODING = 'latin-1'
+
+# Everything str.isspace() is true for, in latin-1.
+_SPACE_CHARS = frozenset(chr(i) for i in range(256) if chr(i).isspace())
+_SPACE_BYTES = frozenset(map(ord, _SPACE_CHARS))
+
+HeadBuffer = Union[str, bytes, bytearray]
+HeaderValue = Union[str, List[str]]
+
+
+def _header_line_error(buf: HeadBuffer, start: int, colon_pos: int, end: int,
+                       spaces: frozenset) -> Optional[errors.ParsingError]:
+    """Get the error ``utils.parse_header_line()`` would raise for a line."""
+    if buf[start] in spaces:
+        return errors.ParsingError(
+            'Whitespace detected at beginning of header line!')
+    if not bool(~colon_pos):
+        return errors.ParsingError(
+            'Invalid header line! Missing colon between header name and value.')
+    if buf[colon_pos - 1 if colon_pos > start else end - 1] in spaces:
+        return errors.ParsingError(
+            'Whitespace detected between header name and colon!')
+    return None
+
+
+def index_headers(
+    buf: HeadBuffer, start: int, end: int, newline_type: Union[str, bytes],
+    strictness: int = constants.PARSER_NORMAL
+) -> 'array[int]':
+    """Index the header lines in ``buf[start:end]``.
+
+    ``buf`` must be a ``str``, ``bytes``, or a ``bytearray``, and ``newline_type``
+    the same kind of object. Lines are checked just like ``utils.get_headers()``
+    checks them, but nothing is copied. Return an ``array('I')`` with the start
+    and end offsets of the name and the value of each accepted header line.
+    """
+    index = array('I')
+    colon: Union[str, bytes]
+    spaces: frozenset
+    if isinstance(buf, str):
+        colon, spaces = ':', _SPACE_CHARS
+    else:
+        colon, spaces = b':', _SPACE_BYTES
+    # buf, colon and newline_type are either all str or all bytes-like.
+    find: Callable[..., int] = buf.find
+    newline_len = len(newline_type)
+
+    pos = start
+    while pos < end:
+        line_end = find(newline_type, pos, end)
+        if not bool(~line_end):
+            line_end = end
+        colon_pos = find(colon, pos, line_end)
+
+        if colon_pos > pos and line_end - pos >= 3 and \
+                buf[pos] not in spaces and buf[colon_pos - 1] not in spaces:
+            index.extend((pos, colon_pos, colon_pos + 1, line_end))
+        elif line_end - pos < 3:
+            if strictness == constants.PARSER_STRICT:
+                raise errors.LengthError('Header line is too short!')
+        else:
+            error = _header_line_error(buf, pos, colon_pos, line_end, spaces)
+            if error is None:
+                index.extend((pos, colon_pos, colon_pos + 1, line_end))
+            elif strictness != constants.PARSER_LENIENT:
+                raise error
+
+        pos = line_end + newline_len
+
+    return index
+
+
+class Headers(Mapping):
+    """A read-only mapping of the headers in a HTTP message head.
+
+    ``Headers`` objects keep the buffer they were created from, and an index of
+    offsets into it (as returned by ``index_headers()``). Names are lowercased,
+    and values decoded, only when they are looked up. Lookups are
+    case-insensitive. Like the dict returned by ``utils.get_headers()``, values of
+    duplicate headers are merged into a list.
+    """
+    __slots__ = ('_buf', '_index', '_names')
+
+    def __init__(self, buf: HeadBuffer, index: 'array[int]') -> None:
+        self._buf = buf
+        self._index = index
+        # Lowercased name -> positions in the index. Built on first use.
+        self._names: Optional[Dict[str, List[int]]] = None
+
+    def _str(self, start: int, end: int) -> str:
+        if isinstance(self._buf, str):
+            return self._buf[start:end]
+        return self._buf[start:end].decode(_ENCODING)
+
+    def _get_names(self) -> Dict[str, List[int]]:
+        if self._names is None:
+            index = self._index
+            names: Dict[str, List[int]] = {}
+            for i in range(0, len(index), 4):
+                name = self._str(index[i], index[i + 1])
+                name = constants.LOWERCASE_HEADER_NAMES.get(name) or name.lower()
+                names.setdefault(name, []).append(i)
+            self._names = names
+        return self._names
+
+    def _find(self, name: str) -> List[int]:
+        if self._names is not None:
+            return self._names.get(name.lower(), [])
+
+        # Only names of the right length are decoded and lowercased.
+        name = name.lower()
+        index = self._index
+        name_len = len(name)
+        found = []
+        for i in range(0, len(index), 4):
+            if index[i + 1] - index[i] == name_len and \
+                    self._str(index[i], index[i + 1]).lower() == name:
+                found.append(i)
+        return found
+
+    def get_all(self, name: str) -> List[str]:
+        """Get the values of all the headers named ``name``, in order."""
+        index = self._index
+        return [self._str(index[i + 2], index[i + 3]) for i in self._find(name)]
+
+    def raw(self) -> List[str]:
+        """Get the header names and values just as they were received.
+
+        Returns a flat list of names and values, like ``raw_headers`` in the
+        results of ``parse()``.
+        """
+        index = self._index
+        return [
+            self._str(index[i], index[i + 1]) for i in range(0, len(index), 2)
+        ]
+
+    def __getitem__(self, name: str) -> HeaderValue:
+        if not isinstance(name, str):
+            raise KeyError(name)
+        values = self.get_all(name)
+        if not values:
+            raise KeyError(name)
+        if len(values) == 1:
+            return values[0]
+        return values
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and bool(self._find(name))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._get_names())
+
+    def __len__(self) -> int:
+        return len(self._get_names())
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({dict(self.items())!r})'
@@ -0,0 +1,92 @@
+"""Base class for the front ends which collect the events of a HTTPParser."""
+from typing import Optional
+
+from ..constants import ParserStrictness
+from ..stream import HeaderList, HTTPParser, HTTPVersion, ParserCallbacks
+
+
+class MessageCollector:  # pylint: disable=R0903
+    """
+    Owns a HTTPParser, and keeps the start line of the message it's parsing.
+
+    Every callback is a ``._on_*()`` method, created once for the whole parser.
+    The start line callbacks store their values, and the rest do nothing;
+    subclasses override the ones they need. ``._on_body_span()`` is only set
+    as a callback with ``body_spans=True``, and then bodies are only measured,
+    never copied.
+    """
+
+    def __init__(self, is_response: bool, strictness: ParserStrictness,
+                 pipeline: bool = False, body_spans: bool = False) -> None:
+        """Create a new MessageCollector."""
+        self._parser = HTTPParser(
+            strictness, is_response,
+            callbacks=ParserCallbacks(
+                on_error=self._on_error,
+                on_message_begin=self._on_message_begin,
+                on_req_method=self._on_req_method,
+                on_req_uri=self._on_req_uri,
+                on_version=self._on_version,
+                on_status_code=self._on_status_code,
+                on_reason=self._on_reason,
+                on_headers_complete=self._on_headers_complete,
+                on_data=self._on_data,
+                on_message_complete=self._on_message_complete,
+                on_body_span=self._on_body_span if body_spans else None,
+            ),
+            batch_headers=True,
+            pipeline=pipeline,
+            detect_body=True,
+        )
+        self._clear_start_line()
+
+    def expect_no_body(self) -> None:
+        """Tell the parser that the next message has no body, whatever its headers say.
+
+        Call this before a response to a HEAD request (or a 2xx response to a
+        CONNECT request) arrives, e.g. when sending the request.
+        """
+        self._parser.expect_no_body()
+
+    def _clear_start_line(self) -> None:
+        """Forget the start line of the last message."""
+        self._method: Optional[bytes] = None
+        self._uri: Optional[bytes] = None
+        self._version: Optional[HTTPVersion] = None
+        self._status_code: Optional[int] = None
+        self._reason: Optional[bytes] = None
+
+    # HTTPParser callbacks.
+
+    def _on_error(self, err: Exception) -> None:
+        pass
+
+    def _on_message_begin(self) -> None:
+        self._clear_start_line()
+
+    def _on_req_method(self, method: bytes) -> None:
+        self._method = method
+
+    def _on_req_uri(self, uri: bytes) -> None:
+        self._uri = uri
+
+    def _on_version(self, version: HTTPVersion) -> None:
+        self._version = version
+
+    def _on_status_code(self, status_code: int) -> None:
+        self._status_code = status_code
+
+    def _on_reason(self, reason: bytes) -> None:
+        self._reason = reason
+
+    def _on_headers_complete(self, headers: HeaderList) -> None:
+        pass
+
+    def _on_data(self, data: bytes) -> None:
+        pass
+
+    def _on_message_complete(self) -> None:
+        pass
+
+    def _on_body_span(self, offset: int, length: int) -> None:
+        pass
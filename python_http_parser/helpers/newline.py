@@ -1,12 +1,19 @@
 """Newline-related helper functions."""
+import sys
 from enum import Enum
 
-from typing import Optional, Tuple, Union
+from typing import Optional, Tuple
 
 from .. import errors
+from .search import Buffer, compile_byte, find
 
 _LF = 0x0a
 _CR = 0x0d
+_LF_RE = compile_byte(_LF)
+_CR_RE = compile_byte(_CR)
+
+# Returned by ``find_newline()`` when the newline is too far away.
+LIMIT_EXCEEDED = -2
 
 
 class NewlineType(Enum):
@@ -21,18 +28,23 @@ class NewlineType(Enum):
 
 
 def startswith_newline(
-    buf: Union[bytes, bytearray],
-    allow_lf: bool
+    buf: Buffer,
+    allow_lf: bool,
+    pos: int = 0
 ) -> Optional[Tuple[bool, NewlineType]]:
-    """Does the buffer start with a newline?"""
+    """Does the buffer start with a newline at ``pos``?"""
     buf_len = len(buf)
 
-    is_cr = buf.startswith(b'\r')
-    if is_cr:
-        if buf_len < 2:
+    if buf_len <= pos:
+        # Incomplete.
+        return None
+
+    first = buf[pos]
+    if first == _CR:
+        if buf_len - pos < 2:
             # Incomplete.
             return None
-        if not buf.startswith(b'\r\n'):
+        if buf[pos + 1] != _LF:
             # Bare CR.
             raise errors.NewlineError(
                 'Expected CRLF, received bare CR.')
@@ -40,55 +52,69 @@ def startswith_newline(
         # It's a CRLF.
         return (True, NewlineType.CRLF)
 
-    is_lf = buf.startswith(b'\n')
-    if is_lf:
+    if first == _LF:
         if not allow_lf:
             raise errors.NewlineError('CRLF is required!')
 
         # It's LF.
         return (True, NewlineType.LF)
 
-    if buf_len < 1:
-        # Incomplete.
-        return None
-
     # No newline :(
     return (False, NewlineType.NONE)
 
 
-def find_newline(buf: Union[bytes, bytearray], allow_lf: bool) -> Tuple[int, NewlineType]:
+def find_newline(
+    buf: Buffer,
+    allow_lf: bool,
+    start: int = 0,
+    limit: int = sys.maxsize
+) -> Tuple[int, NewlineType]:
     """
-    Look for the a newline in ``buf``.
+    Look for the a newline in ``buf``, starting at ``start``.
 
-    Return the index and type of newline that is found, or -1 if a newline could
-    not be found. Will throw an error if a bare CR is encountered.
+    Return the absolute index and type of newline that is found, or -1 if a
+    newline could not be found. If there would be more than ``limit`` bytes
+    between ``start`` and the newline, ``LIMIT_EXCEEDED`` is returned instead,
+    without scanning any further. Will throw an error if a bare CR is encountered.
     """
     buf_len = len(buf)
-
-    lf_index = buf.find(_LF)
-    cr_index = buf.find(_CR)
-    has_lf = bool(~lf_index)
-    has_cr = bool(~cr_index)
-
-    if not has_cr and not has_lf:
-        return (-1, NewlineType.NONE)
-
-    if has_cr:
-        if cr_index == buf_len - 1:
+    # Room for the bytes before the newline, and a CRLF.
+    end = min(start + limit + 2, buf_len)
+
+    # Look for an LF first, then for a CR in front of it. The LF search stops
+    # at the first LF, and the CR search never goes further than that.
+    lf_index = _find_byte(buf, _LF, start, end)
+    cr_index = _find_byte(buf, _CR, start, end if lf_index < 0 else lf_index)
+
+    if cr_index >= 0:
+        index, newline_type = cr_index, NewlineType.CRLF
+    elif lf_index >= 0:
+        index, newline_type = lf_index, NewlineType.LF
+    else:
+        # Any newline would come after the end of the buffer.
+        index, newline_type = buf_len, NewlineType.NONE
+
+    if index - start > limit:
+        return (LIMIT_EXCEEDED, NewlineType.NONE)
+
+    if newline_type is NewlineType.CRLF:
+        if index == buf_len - 1:
             # There could be an LF after the CR we found.
-            return (-1, NewlineType.NONE)
-
-        if buf[cr_index + 1] != _LF:
+            index, newline_type = -1, NewlineType.NONE
+        elif buf[index + 1] != _LF:
             raise errors.NewlineError('Expected CRLF, received bare CR!')
-
-        # It's CRLF
-        return (cr_index, NewlineType.CRLF)
-    if has_lf:
+    elif newline_type is NewlineType.LF:
         if not allow_lf:
             raise errors.NewlineError('CRLF is required.')
+    else:
+        index = -1
+
+    return (index, newline_type)
 
-        # It's LF
-        return (lf_index, NewlineType.LF)
 
-    # Should be unreachable
-    return (-1, NewlineType.NONE)
+def _find_byte(buf: Buffer, byte: int, start: int, end: int) -> int:
+    """Find the first ``byte`` in ``buf[start:end]``, and return its absolute index or -1."""
+    if isinstance(buf, (bytes, bytearray)):
+        # memchr() is much faster than the regular expression engine.
+        return buf.find(byte, start, end)
+    return find(_LF_RE if byte == _LF else _CR_RE, buf, start, end)
@@ -0,0 +1,54 @@
+"""Byte-searching helper functions."""
+import re
+import sys
+
+from typing import Pattern, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def compile_byte(byte: int) -> Pattern[bytes]:
+    """Compile a pattern which matches the single byte ``byte``."""
+    return re.compile(re.escape(bytes([byte])))
+
+
+def byte_class(table: bytes) -> bytes:
+    """
+    Return a regular expression character class, which matches the bytes that
+    ``table`` allows.
+
+    ``table`` is a 256-entry lookup table, where allowed bytes map to a non-zero
+    value.
+    """
+    allowed = bytes(byte for byte in range(256) if table[byte])
+    return b'[' + b''.join(re.escape(bytes([byte])) for byte in allowed) + b']'
+
+
+def compile_span(table: bytes) -> Pattern[bytes]:
+    """Compile a pattern which matches a run of bytes that ``table`` allows."""
+    return re.compile(byte_class(table) + b'*')
+
+
+def find(pattern: Pattern[bytes], buf: Buffer, start: int = 0, end: int = sys.maxsize) -> int:
+    """
+    Look for ``pattern`` in ``buf[start:end]``.
+
+    Return the absolute index of the first match, or -1 if there is none.
+    Unlike ``bytes.find()``, this works on any object that supports the buffer
+    protocol (e.g. ``memoryview``) without copying it.
+    """
+    match = pattern.search(buf, start, end)
+    if match is None:
+        return -1
+    return match.start()
+
+
+def span(pattern: Pattern[bytes], buf: Buffer, start: int = 0, end: int = sys.maxsize) -> int:
+    """
+    Match ``pattern`` (compiled with ``compile_span()``) at ``buf[start]``, without
+    going past ``end``.
+
+    Return the absolute index of the first byte that isn't allowed, or the end
+    of the searched range if all bytes are allowed.
+    """
+    return pattern.match(buf, start, end).end()  # type: ignore[union-attr]
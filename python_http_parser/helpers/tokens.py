@@ -0,0 +1,256 @@
+"""
+Scanners for the tokens of a HTTP message head, which the stream parser
+uses. Each one receives the token that starts at ``buf[pos]``, validates it,
+and returns ``None`` if ``buf`` ends before the token does.
+"""
+import re
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .. import errors
+from ..constants import (
+    DIGIT_TABLE, FIELD_VALUE_TABLE, HEADER_FIELDS, MAX_HEADER_NAME_LEN, MAX_HEADER_VAL_SIZE,
+    MAX_REASON_LEN, MAX_REQ_METHOD_LEN, MAX_URI_LEN, METHODS, TOKEN_TABLE, URI_TABLE)
+from .newline import startswith_newline, NewlineType
+from .search import byte_class, compile_span, span
+
+_SPACE = 0x20
+_COLON = 0x3a
+# Tokens and URIs are scanned up to their delimiter and validated in one go.
+_TOKEN_SPAN_RE = compile_span(TOKEN_TABLE)
+_URI_SPAN_RE = compile_span(URI_TABLE)
+# So are field values and reason phrases, up to their newline.
+_FIELD_VALUE_SPAN_RE = compile_span(FIELD_VALUE_TABLE)
+# Status codes and Content-Length values are matched whole, without copying them.
+_DIGIT_SPAN_RE = compile_span(DIGIT_TABLE)
+
+_TOKEN_CLASS = byte_class(TOKEN_TABLE)
+_URI_CLASS = byte_class(URI_TABLE)
+_FIELD_VALUE_CLASS = byte_class(FIELD_VALUE_TABLE)
+# A complete request head with CRLF newlines, within all the parsing limits.
+# Anything else is left to the state machine.
+REQUEST_HEAD_RE = re.compile(b''.join([
+    b'(', _TOKEN_CLASS, b'{1,%d}) ' % MAX_REQ_METHOD_LEN,
+    b'(', _URI_CLASS, b'{1,%d}) ' % MAX_URI_LEN,
+    b'HTTP/1\\.([01])\r\n',
+    b'((?:', _TOKEN_CLASS, b'{1,%d}:' % MAX_HEADER_NAME_LEN,
+    _FIELD_VALUE_CLASS, b'{0,%d}\r\n)*)' % MAX_HEADER_VAL_SIZE,
+    b'\r\n',
+]))
+# Splits the header block matched by REQUEST_HEAD_RE into names and values.
+HEADER_LINE_RE = re.compile(
+    b'(' + _TOKEN_CLASS + b'+):(' + _FIELD_VALUE_CLASS + b'*)\r\n')
+
+# Standard request methods are swapped for the shared objects in this table.
+SHARED_METHODS = {method: method for method in METHODS}
+# They're also matched by their first byte, before scanning for a token.
+_METHODS_BY_FIRST_BYTE: Dict[int, List[Tuple[bytes, bytes]]] = {
+    first_byte: [
+        (method + b' ', method) for method in METHODS if method[0] == first_byte
+    ]
+    for first_byte in {method[0] for method in METHODS}
+}
+
+# Well-known header names are swapped for the shared objects in this table,
+# so each header line doesn't keep its own copy of its name.
+SHARED_HEADER_NAMES = {name: name for name in HEADER_FIELDS}
+
+
+class ParseResult(NamedTuple):
+    """A token that was received, and the number of bytes it took up."""
+    data: bytes
+    nprocessed: int
+
+
+def recv_method(buf: memoryview, pos: int, scanned: int = 0) -> Optional[ParseResult]:
+    """Receive the HTTP request method which starts at ``buf[pos]``.
+
+    The first ``scanned`` bytes of the method are known to be valid token characters.
+    Returns a tuple containing the request method and the number of bytes parsed.
+    """
+    if not scanned and pos < len(buf):
+        # Standard methods are matched as they are, and shared.
+        for (prefix, method) in _METHODS_BY_FIRST_BYTE.get(buf[pos], ()):
+            if buf[pos:pos + len(prefix)] == prefix:
+                return ParseResult(method, len(prefix))
+
+    # Find the end of the token and validate it at the same time.
+    token_end = span(
+        _TOKEN_SPAN_RE, buf, pos + scanned, pos + MAX_REQ_METHOD_LEN + 1)
+    method_len = token_end - pos
+    if method_len > MAX_REQ_METHOD_LEN:
+        # There are way too many bytes.
+        raise errors.InvalidToken('Request method too large!')
+    if token_end == len(buf):
+        # Incomplete.
+        return None
+
+    if buf[token_end] != _SPACE:
+        raise errors.InvalidToken('Expected token in HTTP method')
+    # The token needs to actually exist.
+    if method_len == 0:
+        raise errors.InvalidToken(
+            'Expected token in HTTP method, received space.')
+
+    # +1 because of the space
+    method = bytes(buf[pos:token_end])
+    return ParseResult(SHARED_METHODS.get(method, method), method_len + 1)
+
+
+def recv_uri(buf: memoryview, pos: int, scanned: int = 0) -> Optional[ParseResult]:
+    """Receive the HTTP request URI which starts at ``buf[pos]``.
+
+    The first ``scanned`` bytes of the URI are known to be valid URI characters.
+    Returns a tuple containing the request URI and number of bytes
+    consumed. No parsing of the URI is done.
+    """
+    # Find the end of the URI and validate it at the same time.
+    uri_end = span(_URI_SPAN_RE, buf, pos + scanned, pos + MAX_URI_LEN + 1)
+    uri_len = uri_end - pos
+    if uri_len > MAX_URI_LEN:
+        # There are way too many bytes.
+        raise errors.InvalidURI('Request URI too large!')
+    if uri_end == len(buf):
+        # Incomplete URI.
+        return None
+
+    if buf[uri_end] != _SPACE:
+        raise errors.InvalidURI(
+            'Expected URI characters in HTTP URI.')
+    # Please actually include an URI.
+    if uri_len == 0:
+        raise errors.InvalidURI('Expected URI character, received space.')
+
+    # +1 because of the space.
+    return ParseResult(bytes(buf[pos:uri_end]), uri_len + 1)
+
+
+def recv_code(buf: memoryview, pos: int) -> Optional[int]:
+    """Receive the HTTP status code which starts at ``buf[pos]``."""
+    if len(buf) - pos < 3:
+        # Not enough bytes.
+        return None
+
+    raw_code = bytes(buf[pos:pos + 3])
+    if not are_digits(raw_code):
+        raise errors.InvalidStatus('Expected only digits in status code!')
+
+    return int(raw_code)
+
+
+def recv_reason(
+    buf: memoryview, pos: int, allow_lf: bool, scanned: int = 0
+) -> Optional[ParseResult]:
+    """Receive the HTTP reason phrase which starts at ``buf[pos]``.
+
+    This function assumes that the reason phrase exists, so if you wish
+    to make the reason phrase optional, you must check for its existence
+    yourself.
+
+    This function will "eat" (i.e. ignore and drop) any whitespace that appears
+    at the start and end of the reason phrase. The first ``scanned`` bytes of the
+    reason phrase are known to be valid reason phrase characters.
+
+    Returns the reason phrase and an integer representing the number of
+    bytes parsed.
+    """
+    # Find the end of the reason phrase and validate it at the same time.
+    reason_end = span(
+        _FIELD_VALUE_SPAN_RE, buf, pos + scanned, pos + MAX_REASON_LEN + 1)
+    if reason_end - pos > MAX_REASON_LEN:
+        # There should be a newline, since there are many more
+        # characters than the maximum allowed in a reason phrase.
+        raise errors.InvalidStatus('Reason phrase too large!')
+
+    newline = startswith_newline(buf, allow_lf, reason_end)
+    if newline is None:
+        # Incomplete.
+        return None
+    is_newline, newline_type = newline
+    if not is_newline:
+        raise errors.InvalidStatus(
+            'Invalid characters in response reason phrase!')
+
+    nrecved = reason_end - pos
+    nrecved += 2 if newline_type is NewlineType.CRLF else 1
+    reason = bytes(buf[pos:reason_end]).strip()
+
+    if not reason.isascii():
+        # We has obsolete text.
+        return ParseResult(b'', nrecved)
+
+    return ParseResult(reason, nrecved)
+
+
+def recv_header_name(buf: memoryview, pos: int, scanned: int = 0) -> Optional[ParseResult]:
+    """Receive a HTTP header field name which starts at ``buf[pos]``.
+
+    This method does NOT treat newlines (``\\n`` or ``\\r\\n``) as the end
+    of HTTP headers. That means, any newlines will be handled as if they were
+    invalid header characters. You must check for newlines yourself.
+
+    The first ``scanned`` bytes of the name are known to be valid token characters.
+    """
+    # Find the end of the token and validate it at the same time.
+    token_end = span(
+        _TOKEN_SPAN_RE, buf, pos + scanned, pos + MAX_HEADER_NAME_LEN + 1)
+    name_len = token_end - pos
+    if name_len > MAX_HEADER_NAME_LEN:
+        raise errors.InvalidToken('Header name too long!')
+    if token_end == len(buf):
+        # Incomplete.
+        return None
+
+    if buf[token_end] != _COLON:
+        raise errors.InvalidToken(
+            'Invalid characters in header name!')
+    if name_len == 0:
+        # Tokens must be at least 1 char long. Header names are tokens.
+        raise errors.InvalidToken('Tokens must be at least one char long.')
+
+    name = bytes(buf[pos:token_end])
+    # +1 because of the colon.
+    return ParseResult(SHARED_HEADER_NAMES.get(name, name), name_len + 1)
+
+
+def recv_header_value(
+    buf: memoryview, pos: int, allow_lf: bool, scanned: int = 0
+) -> Optional[ParseResult]:
+    """Receive a HTTP header field value which starts at ``buf[pos]``.
+
+    This function will "eat" (i.e. ignore and drop) any whitespace that appears
+    before any other characters in the field value. The first ``scanned`` bytes
+    of the value are known to be valid field value characters.
+    """
+    # Find the end of the value and validate it at the same time.
+    value_end = span(
+        _FIELD_VALUE_SPAN_RE, buf, pos + scanned, pos + MAX_HEADER_VAL_SIZE + 1)
+    if value_end - pos > MAX_HEADER_VAL_SIZE:
+        # There should be a newline, since there are many more
+        # characters than the maximum allowed in a header value.
+        raise errors.InvalidHeaderVal('Header field value too large!')
+
+    newline = startswith_newline(buf, allow_lf, value_end)
+    if newline is None:
+        # Incomplete.
+        return None
+    is_newline, newline_type = newline
+    if not is_newline:
+        raise errors.InvalidHeaderVal(
+            'Invalid characters in header value!')
+
+    nrecved = value_end - pos
+    nrecved += 2 if newline_type is NewlineType.CRLF else 1
+    header_val = bytes(buf[pos:value_end]).strip()
+
+    # Only obsolete text could be outside of ASCII.
+    if not header_val.isascii():
+        # We has obsolete text.
+        return ParseResult(b'', nrecved)
+
+    return ParseResult(header_val, nrecved)
+
+
+def are_digits(_bytes: bytes) -> bool:
+    """Do the bytes only contain numerical characters?"""
+    return _DIGIT_SPAN_RE.fullmatch(_bytes) is not None
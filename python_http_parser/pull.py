@@ -0,0 +1,189 @@
+"""
+The ``python_http_parser.pull`` module provides a pull-based (sans-IO) API on top
+of the ``HTTPParser``: data is handed to the parser, and events are taken out
+of it one at a time.
+"""
+
+__all__ = [
+    'ConnectionClosed',
+    'Data',
+    'EndOfMessage',
+    'NEED_DATA',
+    'NeedData',
+    'PullParser',
+    'Request',
+    'Response',
+]
+
+from collections import deque
+from typing import Deque, NamedTuple, Optional, Union
+
+from . import errors
+from .constants import ParserStrictness
+from .helpers.collector import MessageCollector
+from .stream import HeaderList, HTTPVersion
+
+
+class Request(NamedTuple):
+    """The head of a request has been received."""
+    method: bytes
+    uri: bytes
+    version: HTTPVersion
+    headers: HeaderList
+
+
+class Response(NamedTuple):
+    """The head of a response has been received."""
+    version: HTTPVersion
+    status_code: int
+    reason: bytes
+    headers: HeaderList
+
+
+class Data(NamedTuple):
+    """A chunk of the body of the current message has been received."""
+    data: bytes
+
+
+class EndOfMessage:  # pylint: disable=R0903
+    """The current message is complete."""
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}()'
+
+
+class ConnectionClosed:  # pylint: disable=R0903
+    """There is no more data, and no message was left incomplete."""
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}()'
+
+
+class NeedData:  # pylint: disable=R0903
+    """All the data received so far has been parsed; more is needed."""
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return 'NEED_DATA'
+
+
+# Events without any fields are shared.
+NEED_DATA = NeedData()
+_END_OF_MESSAGE = EndOfMessage()
+_CONNECTION_CLOSED = ConnectionClosed()
+
+Event = Union[Request, Response, Data, EndOfMessage, ConnectionClosed, NeedData]
+
+
+class PullParser(MessageCollector):
+    """A pull parser for HTTP messages.
+
+    Data is passed in with ``.receive_data()``, and parsed events are taken out
+    with ``.next_event()``. Nothing is parsed until an event is asked for, and
+    then only one piece of received data at a time. Messages are expected back
+    to back on the same connection, and their bodies are detected from the
+    ``Content-Length`` and ``Transfer-Encoding`` headers.
+    """
+
+    def __init__(self, is_response: bool = False,
+                 strictness: ParserStrictness = ParserStrictness.NORMAL) -> None:
+        """Create a new PullParser."""
+        super().__init__(is_response, strictness, pipeline=True)
+        self.is_response = is_response
+
+        # Received data which hasn't been handed to the parser yet.
+        self._pending: Deque[Union[bytes, bytearray, memoryview]] = deque()
+        # Events which haven't been taken out yet.
+        self._events: Deque[Event] = deque()
+        self._eof = False
+        self._in_message = False
+        self._exception: Optional[BaseException] = None
+
+    def receive_data(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        """Pass more data to the parser.
+
+        Passing empty data means that the connection was closed, and no more
+        data is coming. ``data`` is not copied until it's parsed, so it must not
+        be modified until ``.next_event()`` has returned ``NEED_DATA``.
+        """
+        if self._eof:
+            raise RuntimeError('Received data after the connection was closed!')
+        if data:
+            self._pending.append(data)
+        else:
+            self._eof = True
+
+    def next_event(self) -> Event:
+        """Parse and return the next event.
+
+        Returns ``NEED_DATA`` if all the received data has been parsed, and
+        ``ConnectionClosed()`` once the connection was closed between messages.
+        Parsing errors are raised, and so is every later call.
+        """
+        events = self._events
+        while not events:
+            if self._exception is not None:
+                raise self._exception
+            if not self._pending:
+                if not self._eof:
+                    return NEED_DATA
+                if self._in_message:
+                    # A body which ends with the connection is complete now.
+                    self._parser.finish()
+                    if self._in_message:
+                        self._exception = errors.ParsingError(
+                            'Connection closed before the message was complete!')
+                    continue
+                return _CONNECTION_CLOSED
+
+            try:
+                self._parse(self._pending.popleft())
+            except Exception as ex:
+                self._exception = ex
+                raise
+
+        return events.popleft()
+
+    def _parse(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        """Parse one piece of received data."""
+        parser = self._parser
+        if parser.buffered():
+            parser.feed(data)
+            return
+
+        # Parse the data where it is, and only buffer an unfinished token.
+        ret = parser.process(data)
+        if 0 <= ret < len(data):
+            parser.feed(memoryview(data)[ret:])
+
+    # HTTPParser callbacks.
+
+    def _on_error(self, err: Exception) -> None:
+        self._exception = err
+
+    def _on_message_begin(self) -> None:
+        super()._on_message_begin()
+        self._in_message = True
+
+    def _on_headers_complete(self, headers: HeaderList) -> None:
+        # The parser always receives the whole start line before the headers.
+        version = self._version
+        if version is None:
+            return
+        if self.is_response:
+            status_code, reason = self._status_code, self._reason
+            if status_code is not None and reason is not None:
+                self._events.append(Response(version, status_code, reason, headers))
+        else:
+            method, uri = self._method, self._uri
+            if method is not None and uri is not None:
+                self._events.append(Request(method, uri, version, headers))
+
+    def _on_data(self, data: bytes) -> None:
+        self._events.append(Data(data))
+
+    def _on_message_complete(self) -> None:
+        self._in_message = False
+        self._events.append(_END_OF_MESSAGE)
@@ -4,21 +4,40 @@ plays nicer with streams of data, which do not arrive all at once.
 """
 
 __all__ = [
-    'HTTPParser'
+    'HTTP_1_0',
+    'HTTP_1_1',
+    'HTTPParser',
+    'HTTPVersion',
+    'ParserCallbacks',
 ]
 
 import string
-from typing import Union, Optional, NamedTuple
+from functools import partial
+from typing import Any, Callable, List, Union, Optional, NamedTuple, Tuple
 
 from . import body, constants, errors
-from .constants import ParserState, ParserStrictness
+from .constants import HeaderField, ParserState, ParserStrictness
 from .helpers.events import EventEmitter
-from .helpers.newline import find_newline, startswith_newline, NewlineType
+from .helpers.newline import startswith_newline, NewlineType
+from .helpers.tokens import (
+    HEADER_LINE_RE, REQUEST_HEAD_RE, SHARED_HEADER_NAMES, SHARED_METHODS, are_digits,
+    recv_code, recv_header_name, recv_header_value, recv_method, recv_reason, recv_uri)
 
 _DIGITS = tuple(string.digits.encode('utf-8'))
 _HTTP_VER_START = b'HTTP/1.'
 _SPACE = 0x20
-_COLON = 0x3a
+_CR = 0x0d
+_LF = 0x0a
+
+# Headers which determine how the body is framed.
+_CONTENT_LENGTH = HeaderField.CONTENT_LENGTH
+_TRANSFER_ENCODING = HeaderField.TRANSFER_ENCODING
+# Lookups for the usual spellings don't need to lowercase the name first.
+_FRAMING_HEADERS = {
+    name: field for (name, field) in constants.HEADER_FIELDS.items()
+    if field in (_CONTENT_LENGTH, _TRANSFER_ENCODING)
+}
+_FRAMING_HEADER_LENS = frozenset(map(len, _FRAMING_HEADERS))
 
 
 class HTTPVersion(NamedTuple):
@@ -27,64 +46,272 @@ class HTTPVersion(NamedTuple):
     minor: int
 
 
-class _ParseResult(NamedTuple):
-    data: bytes
-    nprocessed: int
-
-
-class _ProcessResult(NamedTuple):
-    nprocessed: int
-    remaining: bytes
+# The only HTTP versions the parser accepts. These are passed to the
+# ``version`` event, instead of new HTTPVersion objects.
+HTTP_1_0 = HTTPVersion(1, 0)
+HTTP_1_1 = HTTPVersion(1, 1)
+_HTTP_VERSIONS = {_DIGITS[0]: HTTP_1_0, _DIGITS[1]: HTTP_1_1}
+_HTTP_VERSIONS_BY_MINOR = {b'0': HTTP_1_0, b'1': HTTP_1_1}
+
+
+# A list of (name, value) pairs, just as they were received.
+HeaderList = List[Tuple[bytes, bytes]]
+
+
+def _noop(*_: Any) -> None:
+    """Callback used for empty slots."""
+
+
+class ParserCallbacks:  # pylint: disable=R0902,R0903
+    """Fixed callback slots that a HTTPParser calls directly."""
+
+    __slots__ = [
+        'on_error',
+        'on_message_begin',
+        'on_req_method',
+        'on_req_uri',
+        'on_version',
+        'on_status_code',
+        'on_reason',
+        'on_startline_complete',
+        'on_header_name',
+        'on_header_value',
+        'on_headers_complete',
+        'on_data',
+        'on_message_complete',
+        'on_body_span',
+    ]
+
+    # Every slot is a keyword argument; there really are that many.
+    # pylint: disable=R0913
+    def __init__(
+        self, *,
+        on_error: Optional[Callable[[Exception], Any]] = None,
+        on_message_begin: Callable[[], Any] = _noop,
+        on_req_method: Callable[[bytes], Any] = _noop,
+        on_req_uri: Callable[[bytes], Any] = _noop,
+        on_version: Callable[[HTTPVersion], Any] = _noop,
+        on_status_code: Callable[[int], Any] = _noop,
+        on_reason: Callable[[bytes], Any] = _noop,
+        on_startline_complete: Callable[[], Any] = _noop,
+        on_header_name: Callable[[bytes], Any] = _noop,
+        on_header_value: Callable[[bytes], Any] = _noop,
+        on_headers_complete: Callable[..., Any] = _noop,
+        on_data: Callable[[bytes], Any] = _noop,
+        on_message_complete: Callable[[], Any] = _noop,
+        on_body_span: Optional[Callable[[int, int], Any]] = None
+    ) -> None:
+        """Create a new ParserCallbacks object.
+
+        Each slot is called with the same arguments as the HTTPParser event of
+        the same name (without the ``on_`` prefix). Slots that aren't set do
+        nothing, except for ``on_error``: if it isn't set, errors are raised.
+
+        If ``on_body_span`` is set, body data isn't passed to ``on_data``.
+        Instead, ``on_body_span`` is called with the offset and the length of
+        each piece of body data, relative to the start of the data passed to
+        ``HTTPParser.process()``, and the body is never copied.
+        """
+        self.on_error = on_error
+        self.on_message_begin = on_message_begin
+        self.on_req_method = on_req_method
+        self.on_req_uri = on_req_uri
+        self.on_version = on_version
+        self.on_status_code = on_status_code
+        self.on_reason = on_reason
+        self.on_startline_complete = on_startline_complete
+        self.on_header_name = on_header_name
+        self.on_header_value = on_header_value
+        self.on_headers_complete = on_headers_complete
+        self.on_data = on_data
+        self.on_message_complete = on_message_complete
+        self.on_body_span = on_body_span
 
 
 class HTTPParser(EventEmitter):
     """An event-based push parser for HTTP messages."""
 
+    # pylint: disable=R0902,R0913,R0917
     def __init__(self, strictness: ParserStrictness = ParserStrictness.NORMAL,
-                 is_response: bool = False) -> None:
+                 is_response: bool = False,
+                 callbacks: Optional[ParserCallbacks] = None,
+                 batch_headers: bool = False,
+                 pipeline: bool = False,
+                 detect_body: bool = False) -> None:
         """Create a new HTTPParser.
 
         A HTTPParser object provides an incremental, event-based API for parsing
         HTTP messages. The parsed message is pushed to the caller via synchronous
         events.
+
+        If ``callbacks`` is given, the parser calls its slots directly instead
+        of emitting events, and listeners registered with ``.on()`` are ignored.
+
+        If ``batch_headers`` is ``True``, no ``header_name`` or ``header_value``
+        events are emitted. Instead, the whole header block is passed to the
+        ``headers_complete`` event as a list of (name, value) pairs.
+
+        If ``pipeline`` is ``True``, the parser moves on to the next message
+        by itself once a message is complete, so many messages could be parsed
+        out of the same data without calling ``.reset()``.
+
+        If ``detect_body`` is ``True``, the parser looks for ``Content-Length``
+        and ``Transfer-Encoding`` while receiving the headers, and sets up the
+        right body processor itself. Response bodies without either header (or
+        without a chunked one) end with the connection, so call ``.finish()``
+        once it's closed. This happens before the ``headers_complete`` event, so
+        listeners could still override it.
         """
         super().__init__()
         self.strictness = strictness
         self.is_response = is_response
+        self.pipeline = pipeline
+        self.detect_body = detect_body
+
+        if callbacks is None:
+            callbacks = self._emitter_callbacks()
+        self._callbacks = callbacks
 
         self._has_body = False
         self._body_processor: Optional[body.BodyProcessor] = None
         self._state = ParserState.EMPTY
+        # Collected (name, value) pairs, or None if headers aren't batched.
+        self._headers: Optional[HeaderList] = [] if batch_headers else None
+        # Header name which is waiting for its value, when batching headers.
+        self._header_name = b''
+        # Body framing information, when detecting bodies.
+        self._framing_header: Optional[int] = None
+        self._content_length: Optional[int] = None
+        self._transfer_encoding = False
+        self._chunked = False
+        self._status_code = 0
+        # Whether the next message has no body, whatever its headers say.
+        self._no_body = False
+        # Body processors that are recycled between messages.
+        self._fixed_len_processor: Optional[body.FixedLenProcessor] = None
+        self._chunked_processor: Optional[body.ChunkedProcessor] = None
+        self._until_close_processor: Optional[body.UntilCloseProcessor] = None
+        # Bytes passed to .feed() which haven't been processed yet.
+        self._buffer = bytearray()
+        # How many bytes of the token that is currently being received have
+        # already been searched for its delimiter.
+        self._scanned = 0
+        # Where the data passed to the body processor starts, in the data
+        # passed to .process().
+        self._body_start = 0
+
+    def _emitter_callbacks(self) -> ParserCallbacks:
+        """Create callbacks which forward everything to this parser's listeners."""
+        emit = self.emit
+        return ParserCallbacks(
+            on_error=self._emit_error,
+            **{
+                slot: partial(emit, slot[3:])
+                for slot in ParserCallbacks.__slots__
+                if slot not in ('on_error', 'on_body_span')
+            }
+        )
+
+    def _emit_error(self, err: Exception) -> None:
+        """Emit an Exception, or raise it if nobody is listening."""
+        if not self._listeners.get('error'):
+            # Unhandled exception.
+            raise err
+
+        self.emit('error', err)
 
     def _error(self, err: Exception) -> None:
         """Raise or emit an Exception."""
         self._state = ParserState.HAD_ERROR
 
-        if len(self.listeners('error')) < 1:
+        on_error = self._callbacks.on_error
+        if on_error is None:
             # Unhandled exception.
             raise err
 
-        self.emit('error', err)
+        on_error(err)
 
-    def _setup_body_processor(self):
-        """Set up this HTTPParser's body processor."""
-        def on_data(chunk):
-            self.emit('data', chunk)
+    def _body_finished(self) -> None:
+        """Called when the body processor has finished."""
+        self._state = ParserState.DONE
 
-        def on_error(err):
-            self._error(err)
+    def _bind_body_processor(self, processor: body.BodyProcessor) -> None:
+        """Point the callbacks of ``processor`` at this parser."""
+        processor.on_data(self._callbacks.on_data)
+        if self._callbacks.on_body_span is not None:
+            processor.on_span(self._body_span)
+        processor.on_error(self._error)
+        processor.on_finished(self._body_finished)
 
-        def on_finished():
-            self._state = ParserState.DONE
+    def _body_span(self, offset: int, length: int) -> None:
+        """Called with the spans of body data the body processor finds."""
+        on_body_span = self._callbacks.on_body_span
+        if on_body_span is not None:
+            on_body_span(self._body_start + offset, length)
+
+    def _setup_body_processor(self):
+        """Set up this HTTPParser's body processor."""
+        processor = self._body_processor
+        if processor in (self._fixed_len_processor, self._chunked_processor,
+                         self._until_close_processor):
+            # Recycled processors are already bound.
+            return
 
-        self._body_processor.on_data(on_data)
-        self._body_processor.on_error(on_error)
-        self._body_processor.on_finished(on_finished)
+        self._bind_body_processor(processor)
 
-    def _process_request_line(self, buf: bytes) -> _ProcessResult:
-        """Process the HTTP request line, which is in ``buf``.
+    def fixed_len_processor(self, body_len: int) -> body.FixedLenProcessor:
+        """Return a FixedLenProcessor for a body of ``body_len`` bytes.
 
-        Internal method. All errors will be propagated back to the caller.
+        The processor is recycled: this parser only ever creates one, and
+        resets it each time this method is called. Its callbacks are already
+        bound to this parser, so don't register your own.
+        """
+        processor = self._fixed_len_processor
+        if processor is None:
+            processor = body.FixedLenProcessor(body_len)
+            self._bind_body_processor(processor)
+            self._fixed_len_processor = processor
+        else:
+            processor.reset(body_len)
+        return processor
+
+    def chunked_processor(self) -> body.ChunkedProcessor:
+        """Return a ChunkedProcessor.
+
+        The processor is recycled: this parser only ever creates one, and
+        resets it each time this method is called. Its callbacks are already
+        bound to this parser, so don't register your own.
+        """
+        processor = self._chunked_processor
+        if processor is None:
+            processor = body.ChunkedProcessor()
+            self._bind_body_processor(processor)
+            self._chunked_processor = processor
+        else:
+            processor.reset()
+        return processor
+
+    def until_close_processor(self) -> body.UntilCloseProcessor:
+        """Return an UntilCloseProcessor.
+
+        The processor is recycled: this parser only ever creates one, and
+        resets it each time this method is called. Its callbacks are already
+        bound to this parser, so don't register your own.
+        """
+        processor = self._until_close_processor
+        if processor is None:
+            processor = body.UntilCloseProcessor()
+            self._bind_body_processor(processor)
+            self._until_close_processor = processor
+        else:
+            processor.reset()
+        return processor
+
+    def _process_request_line(self, buf: memoryview, pos: int) -> int:
+        """Process the HTTP request line, which starts at ``buf[pos]``.
+
+        Returns the number of bytes processed. Internal method. All errors will
+        be propagated back to the caller.
         """
         # We don't really care about too many local variables.
         # pylint: disable=R0914
@@ -92,45 +319,47 @@ class HTTPParser(EventEmitter):
         allow_lf = self.strictness != ParserStrictness.STRICT
 
         if self._state is ParserState.RECEIVING_METHOD:
-            m_result = _recv_method(buf)
+            m_result = recv_method(buf, pos, self._scanned)
             if m_result is None:
                 # Incomplete.
-                return _ProcessResult(nprocessed, buf)
+                self._scanned = len(buf) - pos
+                return nprocessed
 
             method, nrecved = m_result
             nprocessed += nrecved
-            buf = buf[nrecved:]
+            pos += nrecved
+            self._scanned = 0
 
-            self.emit('req_method', method)
+            self._callbacks.on_req_method(method)
             self._state = ParserState.RECEIVING_URI
 
         if self._state is ParserState.RECEIVING_URI:
-            u_result = _recv_uri(buf)
+            u_result = recv_uri(buf, pos, self._scanned)
             if u_result is None:
                 # Incomplete.
-                return _ProcessResult(nprocessed, buf)
+                self._scanned = len(buf) - pos
+                return nprocessed
 
             uri, nrecved = u_result
             nprocessed += nrecved
-            buf = buf[nrecved:]
+            pos += nrecved
+            self._scanned = 0
 
-            self.emit('req_uri', uri)
+            self._callbacks.on_req_uri(uri)
             self._state = ParserState.PARSING_VERSION
 
         if self._state is ParserState.PARSING_VERSION:
-            version = _parse_version(buf)
+            version = _parse_version(buf, pos)
             if version is None:
                 # Incomplete.
-                return _ProcessResult(nprocessed, buf)
-
-            # It's always eight bytes
-            buf = buf[8:]
+                return nprocessed
 
             # There must be a newline after this.
-            n_result = startswith_newline(buf, allow_lf)
+            # The version is always eight bytes.
+            n_result = startswith_newline(buf, allow_lf, pos + 8)
             if n_result is None:
                 # Incomplete.
-                return _ProcessResult(nprocessed, buf)
+                return nprocessed
 
             is_newline, newline_type = n_result
             if not is_newline:
@@ -138,75 +367,72 @@ class HTTPParser(EventEmitter):
                     'Expected newline after version!')
 
             newline_len = 2 if newline_type is NewlineType.CRLF else 1
-            buf = buf[newline_len:]
             nprocessed += newline_len
 
             # We parsed 8 bytes from the HTTP version.
             nprocessed += 8
 
-            self.emit('version', version)
+            self._callbacks.on_version(version)
             self._state = ParserState.DONE_STARTLINE
 
-        return _ProcessResult(nprocessed, buf)
+        return nprocessed
 
-    def _process_status_line(self, buf: bytes) -> _ProcessResult:
-        """Process the HTTP status line which is in ``buf``.
+    def _process_status_line(self, buf: memoryview, pos: int) -> int:
+        """Process the HTTP status line which starts at ``buf[pos]``.
 
-        Internal method. All errors will be propagated back to the caller.
+        Returns the number of bytes processed. Internal method. All errors will
+        be propagated back to the caller.
         """
         # We don't care about that here either.
         # pylint: disable=R0914,R0911
         nprocessed = 0
         allow_lf = self.strictness != ParserStrictness.STRICT
+        buf_len = len(buf)
 
         if self._state is ParserState.PARSING_VERSION:
-            version = _parse_version(buf)
+            version = _parse_version(buf, pos)
             if version is None:
                 # Incomplete.
-                return _ProcessResult(nprocessed, buf)
-
-            buf = buf[8:]
+                return nprocessed
 
             # Check that there is a space.
-            is_space = buf.startswith(b' ')
-            if not is_space:
-                if len(buf) > 0:
-                    # You should have a space.
-                    raise errors.UnexpectedChar(
-                        f'Expected space after version, received {chr(buf[0])}.')
-                # Otherwise, it's incomplete.
-                return _ProcessResult(nprocessed, buf)
-
-            # Process the space.
-            nprocessed += 1
-            buf = buf[1:]
-
-            # We parsed 8 bytes.
-            nprocessed += 8
+            space_pos = pos + 8
+            if space_pos >= buf_len:
+                # Incomplete.
+                return nprocessed
+            if buf[space_pos] != _SPACE:
+                # You should have a space.
+                raise errors.UnexpectedChar(
+                    f'Expected space after version, received {chr(buf[space_pos])}.')
 
-            self.emit('version', version)
+            # We parsed 8 bytes, plus the space.
+            nprocessed += 9
+            pos += 9
+
+            self._callbacks.on_version(version)
             self._state = ParserState.RECEIVING_STATUS_CODE
 
         if self._state is ParserState.RECEIVING_STATUS_CODE:
-            status_code = _recv_code(buf)
+            status_code = recv_code(buf, pos)
             if status_code is None:
                 # Incomplete.
-                return _ProcessResult(nprocessed, buf)
+                return nprocessed
 
             # +3 because of 3-digit status code.
             nprocessed += 3
-            buf = buf[3:]
+            pos += 3
 
-            self.emit('status_code', status_code)
+            self._status_code = status_code
+            self._callbacks.on_status_code(status_code)
             self._state = ParserState.RECEIVING_REASON
 
         if self._state is ParserState.RECEIVING_REASON:
             # If a newline is received directly after the status code and the
             # parser strictness isn't ParserStrictness.STRICT, treat the reason
             # phrase as non-existent.
-            n_result = startswith_newline(buf, allow_lf)
+            n_result = startswith_newline(buf, allow_lf, pos)
             if n_result is None:
-                return _ProcessResult(nprocessed, buf)
+                return nprocessed
 
             is_newline, newline_type = n_result
             if is_newline:
@@ -214,56 +440,51 @@ class HTTPParser(EventEmitter):
                 # Oh well
                 newline_len = 2 if newline_type is NewlineType.CRLF else 1
                 nprocessed += newline_len
-                buf = buf[newline_len:]
 
-                self.emit('reason', b'')
+                self._callbacks.on_reason(b'')
                 self._state = ParserState.DONE_STARTLINE
-                return _ProcessResult(nprocessed, buf)
+                return nprocessed
 
             # We have a reason phrase.
             # Check that there is a space.
-            is_space = buf.startswith(b' ')
-            if not is_space:
-                if len(buf) > 0:
-                    # You should have a space.
-                    raise errors.UnexpectedChar(
-                        f'Expected space before reason phrase, got {chr(buf[0])}.')
-                # Otherwise, it's incomplete.
-                return _ProcessResult(nprocessed, buf)
-
-            # Process the space.
-            # Don't increment nparsed because we'll need the space again
-            # if the reason phrase is incomplete.
-            buf = buf[1:]
-
-            r_result = _recv_reason(buf, allow_lf)
+            if buf[pos] != _SPACE:
+                # You should have a space.
+                raise errors.UnexpectedChar(
+                    f'Expected space before reason phrase, got {chr(buf[pos])}.')
+
+            # Don't count the space as processed yet, because we'll need it
+            # again if the reason phrase is incomplete.
+            r_result = recv_reason(buf, pos + 1, allow_lf, self._scanned)
             if r_result is None:
                 # Incomplete.
-                return _ProcessResult(nprocessed, buf)
+                self._scanned = _newline_scanned(buf, pos + 1)
+                return nprocessed
 
             reason, reason_len = r_result
+            self._scanned = 0
             # +1 because we need to account for the space.
             nprocessed += reason_len + 1
-            buf = buf[reason_len:]
 
-            self.emit('reason', reason)
+            self._callbacks.on_reason(reason)
             self._state = ParserState.DONE_STARTLINE
 
-        return _ProcessResult(nprocessed, buf)
+        return nprocessed
 
-    def _process_headers(self, buf: bytes) -> _ProcessResult:
-        """Process the HTTP headers.
+    def _process_headers(self, buf: memoryview, pos: int) -> int:
+        """Process the HTTP headers, which start at ``buf[pos]``.
 
-        Internal method. All errors will be propagated back to the caller.
-        This method assumes that a newline has alread been received before
-        the headers start.
+        Returns the number of bytes processed. Internal method. All errors will
+        be propagated back to the caller. This method assumes that a newline has
+        already been received before the headers start.
         """
+        # pylint: disable=R0912,R0914
         nprocessed = 0
         allow_lf = self.strictness != ParserStrictness.STRICT
         headers_over = False
+        headers = self._headers
         while not headers_over:
             if self._state is ParserState.PARSING_HEADER_NAME:
-                n_result = startswith_newline(buf, allow_lf)
+                n_result = startswith_newline(buf, allow_lf, pos)
                 if n_result is None:
                     break
 
@@ -272,45 +493,166 @@ class HTTPParser(EventEmitter):
                     # Headers are over!
                     newline_len = 2 if newline_type is NewlineType.CRLF else 1
                     nprocessed += newline_len
-                    buf = buf[newline_len:]
+                    pos += newline_len
                     headers_over = True
                     break
 
                 # Here comes another header name!
-                hn_result = _recv_header_name(buf)
+                hn_result = recv_header_name(buf, pos, self._scanned)
                 if hn_result is None:
                     # Incomplete.
+                    self._scanned = len(buf) - pos
                     break
                 header_name, nrecved = hn_result
                 nprocessed += nrecved
-                buf = buf[nrecved:]
+                pos += nrecved
+                self._scanned = 0
 
-                self.emit('header_name', header_name)
+                if self.detect_body:
+                    self._framing_header = _framing_header(header_name)
+                if headers is None:
+                    self._callbacks.on_header_name(header_name)
+                else:
+                    self._header_name = header_name
                 self._state = ParserState.PARSING_HEADER_VAL
 
             if self._state is ParserState.PARSING_HEADER_VAL:
-                hv_result = _recv_header_value(buf, allow_lf)
+                hv_result = recv_header_value(buf, pos, allow_lf, self._scanned)
                 if hv_result is None:
                     # Incomplete.
+                    self._scanned = _newline_scanned(buf, pos)
                     break
                 header_val, nrecved = hv_result
                 nprocessed += nrecved
-                buf = buf[nrecved:]
+                pos += nrecved
+                self._scanned = 0
 
-                self.emit('header_value', header_val)
+                if self._framing_header is not None:
+                    self._recv_framing(header_val)
+                if headers is None:
+                    self._callbacks.on_header_value(header_val)
+                else:
+                    headers.append((self._header_name, header_val))
                 self._state = ParserState.PARSING_HEADER_NAME
 
         if headers_over:
-            self.emit('headers_complete')
-            self._state = ParserState.DONE_HEADERS
+            self._headers_complete()
+
+        return nprocessed
 
-        return _ProcessResult(nprocessed, buf)
+    def _process_request_head(self, buf: memoryview, pos: int) -> int:
+        """Process a whole request head at once, if it starts at ``buf[pos]``.
 
-    def _process(self, buf: bytes) -> int:
+        Most requests arrive with their whole head in one piece, so one regular
+        expression validates the request line and all the headers, and splits
+        them up. Returns the number of bytes processed, which is 0 if the head
+        is incomplete or unusual in any way. The state machine takes over then,
+        and it reports any errors.
+        """
+        match = REQUEST_HEAD_RE.match(buf, pos)
+        if match is None:
+            return 0
+
+        callbacks = self._callbacks
+        method, uri, minor = match.group(1, 2, 3)
+        callbacks.on_req_method(SHARED_METHODS.get(method, method))
+        callbacks.on_req_uri(uri)
+        callbacks.on_version(_HTTP_VERSIONS_BY_MINOR[minor])
+        callbacks.on_startline_complete()
+        self._state = ParserState.PARSING_HEADER_NAME
+
+        headers = self._headers
+        detect_body = self.detect_body
+        header_names = SHARED_HEADER_NAMES
+        for (header_name, header_val) in HEADER_LINE_RE.findall(buf, *match.span(4)):
+            header_name = header_names.get(header_name, header_name)
+            if detect_body:
+                self._framing_header = _framing_header(header_name)
+            if headers is None:
+                callbacks.on_header_name(header_name)
+
+            header_val = header_val.strip()
+            if not header_val.isascii():
+                # We has obsolete text.
+                header_val = b''
+            if self._framing_header is not None:
+                self._recv_framing(header_val)
+            if headers is None:
+                callbacks.on_header_value(header_val)
+            else:
+                headers.append((header_name, header_val))
+
+        self._headers_complete()
+        return match.end() - pos
+
+    def _headers_complete(self) -> None:
+        """Called when all headers have been received."""
+        if self.detect_body:
+            self._setup_framing()
+        headers = self._headers
+        if headers is None:
+            self._callbacks.on_headers_complete()
+        else:
+            # The list is handed over to the callback, so start a new one.
+            self._headers = []
+            self._callbacks.on_headers_complete(headers)
+        self._state = ParserState.DONE_HEADERS
+
+    def _recv_framing(self, value: bytes) -> None:
+        """Record the value of a header which determines the body framing."""
+        kind = self._framing_header
+        self._framing_header = None
+
+        if kind == _CONTENT_LENGTH:
+            if not value or not are_digits(value):
+                raise errors.InvalidHeaderVal('Invalid Content-Length!')
+            content_length = int(value)
+            if self._content_length not in (None, content_length):
+                raise errors.InvalidHeaderVal('Conflicting Content-Length headers!')
+            self._content_length = content_length
+        else:
+            # Transfer codings could be split over many header lines; only
+            # the last one counts.
+            self._transfer_encoding = True
+            last_coding = value.rsplit(b',', 1)[-1].strip().lower()
+            if last_coding:
+                self._chunked = last_coding == b'chunked'
+
+    def _setup_framing(self) -> None:
+        """Set up the body processor according to the framing headers."""
+        if self.is_response and (
+                self._status_code < 200 or self._status_code in (204, 304)):
+            # These never have a body.
+            return
+        if self._no_body:
+            # The caller knows better, e.g. for a response to a HEAD request.
+            self._no_body = False
+            return
+
+        if self._transfer_encoding:
+            # Transfer-Encoding overrides Content-Length.
+            self._has_body = True
+            if self._chunked:
+                self._body_processor = self.chunked_processor()
+            elif self.is_response:
+                # The body ends when the connection is closed.
+                self._body_processor = self.until_close_processor()
+            else:
+                raise errors.InvalidHeaderVal(
+                    'Transfer-Encoding of a request must end with chunked!')
+        elif self._content_length:
+            self._has_body = True
+            self._body_processor = self.fixed_len_processor(self._content_length)
+        elif self._content_length is None and self.is_response:
+            # Responses without any framing headers end with the connection.
+            self._has_body = True
+            self._body_processor = self.until_close_processor()
+
+    def _process(self, buf: memoryview, pos: int) -> int:
         """Internal ``._process()`` method.
 
-        Contains the parser directing logic. All errors will be propagated
-        back to the caller.
+        Contains the parser directing logic. Parsing starts at ``buf[pos]``.
+        All errors will be propagated back to the caller.
         """
         # pylint: disable=R0912
 
@@ -319,26 +661,26 @@ class HTTPParser(EventEmitter):
                 ParserState.PARSING_VERSION,
                 ParserState.RECEIVING_STATUS_CODE,
                 ParserState.RECEIVING_REASON):
-            (nprocessed, buf) = self._process_status_line(buf)
-            nparsed += nprocessed
+            nparsed += self._process_status_line(buf, pos)
         elif self._state in (
             ParserState.RECEIVING_METHOD,
             ParserState.RECEIVING_URI,
             ParserState.PARSING_VERSION
         ):
-            (nprocessed, buf) = self._process_request_line(buf)
-            nparsed += nprocessed
+            if self._state is ParserState.RECEIVING_METHOD and not self._scanned:
+                nparsed += self._process_request_head(buf, pos)
+            if not nparsed:
+                nparsed += self._process_request_line(buf, pos)
 
         if self._state is ParserState.DONE_STARTLINE:
-            self.emit('startline_complete')
+            self._callbacks.on_startline_complete()
             self._state = ParserState.PARSING_HEADER_NAME
 
         if self._state in (
             ParserState.PARSING_HEADER_NAME,
             ParserState.PARSING_HEADER_VAL
         ):
-            (nprocessed, buf) = self._process_headers(buf)
-            nparsed += nprocessed
+            nparsed += self._process_headers(buf, pos + nparsed)
 
         if self._state is ParserState.DONE_HEADERS:
             if self._has_body:
@@ -354,8 +696,10 @@ class HTTPParser(EventEmitter):
             if self._body_processor is None:
                 raise errors.BodyProcessorRequired()
 
+            # Slicing a memoryview doesn't copy anything.
+            self._body_start = pos + nparsed
             ret = self._body_processor.process(
-                buf, self.strictness != ParserStrictness.STRICT
+                buf[pos + nparsed:], self.strictness != ParserStrictness.STRICT
             )
             if ret < 0:
                 # Error!
@@ -364,7 +708,7 @@ class HTTPParser(EventEmitter):
                 nparsed += ret
 
         if self._state is ParserState.DONE:
-            self.emit('message_complete')
+            self._callbacks.on_message_complete()
 
         return nparsed
 
@@ -384,15 +728,56 @@ class HTTPParser(EventEmitter):
             self._body_processor = body_processor
         return self._body_processor
 
+    def expect_no_body(self) -> None:
+        """Tell the parser that the next message has no body, whatever its headers say.
+
+        This is the case for responses to HEAD requests, and for 2xx responses
+        to CONNECT requests, which only the caller can tell apart. Interim
+        (1xx) responses are skipped over, and ``.reset()`` doesn't undo this.
+        It only matters with ``detect_body``.
+        """
+        self._no_body = True
+
     def finished(self) -> bool:
         """Return ``True`` if this parser is finished."""
         return self._state is ParserState.DONE
 
+    def finish(self) -> None:
+        """Tell the parser that the connection was closed, and no more data is coming.
+
+        This completes a body which ends with the connection, which is the case
+        for responses without a ``Content-Length`` or a chunked
+        ``Transfer-Encoding``. Any other incomplete message stays incomplete,
+        which ``.finished()`` tells.
+        """
+        processor = self._body_processor
+        if self._state is ParserState.PROCESSING_BODY and isinstance(
+                processor, body.UntilCloseProcessor):
+            processor.finish()
+            if self._state is ParserState.DONE:
+                self._callbacks.on_message_complete()
+
+    def buffered(self) -> int:
+        """Return the number of bytes passed to ``.feed()`` that are not processed yet."""
+        return len(self._buffer)
+
     def reset(self) -> None:
-        """Reset the parser state."""
+        """Reset the parser state.
+
+        Bytes that were passed to ``.feed()`` but not processed yet are kept,
+        since they belong to the next message.
+        """
         self._has_body = False
         self._body_processor = None
         self._state = ParserState.EMPTY
+        self._scanned = 0
+        if self._headers is not None:
+            self._headers = []
+        self._framing_header = None
+        self._content_length = None
+        self._transfer_encoding = False
+        self._chunked = False
+        self._status_code = 0
 
     def process(self, data: Union[bytes, bytearray, memoryview]) -> int:
         """Process the contents of ``data`` as part of the HTTP message.
@@ -400,40 +785,109 @@ class HTTPParser(EventEmitter):
         Returns the number of bytes processed. Any unprocessed bytes must
         be buffered for the next call to ``parser.process()``.
 
+        ``data`` is never copied: the parser walks a ``memoryview`` of it with
+        a cursor, and only the parts of the message that are emitted (method,
+        URI, header names and values, body chunks...) are turned into ``bytes``.
+        This means passing ``memoryview(buf)[n:]`` is the cheapest way to skip
+        over bytes which have already been processed, and that ``data`` could
+        be a ``mmap.mmap`` object. With the ``on_body_span`` callback, bodies
+        are reported as offsets into ``data``, so they aren't copied either.
+
         The integer ``-1`` means that an error was encountered during parsing,
         and thus parsing should stop.
         """
-        if self._state is ParserState.DONE:
-            self._error(errors.DoneError())
+        # We can't know what the caller did with the unprocessed bytes, so
+        # the whole token has to be searched again.
+        self._scanned = 0
+        return self._process_data(memoryview(data))
+
+    def feed(self, data: Union[bytes, bytearray, memoryview]) -> int:
+        """Buffer ``data``, then process as much of the buffered bytes as possible.
+
+        Unlike ``.process()``, the parser keeps any unprocessed bytes in an
+        internal buffer, so only new data should be passed in. The parser also
+        remembers how much of an incomplete token it has already searched, so
+        bytes that trickle in over many calls are only scanned once.
+
+        Returns the number of buffered bytes processed, or ``-1`` if an error
+        was encountered during parsing. Spans passed to ``on_body_span`` are
+        offsets into the internal buffer, so they're of no use with ``.feed()``.
+        """
+        self._buffer += data
 
-        if self._state is ParserState.HAD_ERROR:
-            # We has error.
-            return -1
+        with memoryview(self._buffer) as view:
+            ret = self._process_data(view)
 
-        # Copy it, then we could get started.
-        buf = bytes(data)
+        if ret > 0:
+            try:
+                # Deleting from the front of a bytearray doesn't move the
+                # remaining bytes, so this is cheap.
+                del self._buffer[:ret]
+            except BufferError:
+                # Someone is still holding a view of the buffer.
+                self._buffer = self._buffer[ret:]
 
-        try:
-            nskipped = 0
+        return ret
 
-            if self._state is ParserState.EMPTY:
-                # Only try to skip empty lines if this parser is in request mode.
-                if self.is_response:
-                    self._state = ParserState.PARSING_VERSION
-                else:
-                    ret = _skip_empty_lines(
-                        buf, self.strictness != ParserStrictness.STRICT)
-                    if ret is None:
-                        # Message is not complete,
-                        # but we still processed all of it.
-                        return len(buf)
-                    self._state = ParserState.RECEIVING_METHOD
+    def _process_message(self, buf: memoryview, pos: int) -> int:
+        """Process the message which starts (or continues) at ``buf[pos]``.
 
-                    nskipped += ret
+        Returns the number of bytes processed, or -1 if the body processor
+        had an error. All other errors will be propagated back to the caller.
+        """
+        nskipped = 0
+
+        if self._state is ParserState.EMPTY:
+            if pos >= len(buf):
+                # The message hasn't even started.
+                return 0
+
+            # Only try to skip empty lines if this parser is in request mode.
+            if self.is_response:
+                self._state = ParserState.PARSING_VERSION
+            else:
+                nskipped = _skip_empty_lines(
+                    buf, pos, self.strictness != ParserStrictness.STRICT)
+                if pos + nskipped == len(buf) or buf[pos + nskipped] == _CR:
+                    # Message is not complete. A CR at the very end could be
+                    # waiting for its LF, so it isn't processed yet.
+                    return nskipped
+                self._state = ParserState.RECEIVING_METHOD
 
-                    buf = buf[nskipped:]
+            self._callbacks.on_message_begin()
 
-            return self._process(buf) + nskipped
+        ret = self._process(buf, pos + nskipped)
+        if ret < 0:
+            return ret
+
+        return ret + nskipped
+
+    def _process_data(self, buf: memoryview) -> int:
+        """Process ``buf``, which is a view of the data passed by the caller."""
+        if self._state is ParserState.DONE:
+            if self.pipeline:
+                self.reset()
+            else:
+                self._error(errors.DoneError())
+
+        if self._state is ParserState.HAD_ERROR:
+            # We has error.
+            return -1
+
+        try:
+            nprocessed = self._process_message(buf, 0)
+            buf_len = len(buf)
+
+            while self.pipeline and self._state is ParserState.DONE and (
+                    0 <= nprocessed < buf_len):
+                # On to the next message.
+                self.reset()
+                ret = self._process_message(buf, nprocessed)
+                if ret < 0:
+                    return ret
+                nprocessed += ret
+
+            return nprocessed
         except (errors.InvalidVersion, errors.NewlineError,
                 errors.UnexpectedChar, errors.InvalidStatus,
                 errors.InvalidToken, errors.InvalidURI,
@@ -443,24 +897,32 @@ class HTTPParser(EventEmitter):
 
 
 def _skip_empty_lines(
-    buf: bytes,
+    buf: memoryview,
+    start: int,
     allow_lf: bool
-) -> Optional[int]:
-    """Skip all empty lines."""
-    pos = 0
-
-    while True:
-        is_cr = buf.startswith(b'\r', pos)
-        if is_cr:
-            if not buf.startswith(b'\r\n', pos):
+) -> int:
+    """Skip all empty lines from ``buf[start]`` on.
+
+    Returns the number of bytes skipped. A CR which is the last byte of ``buf``
+    isn't skipped, since its LF could still be on its way.
+    """
+    pos = start
+    buf_len = len(buf)
+
+    while pos < buf_len:
+        byte = buf[pos]
+        if byte == _CR:
+            if pos + 1 >= buf_len:
+                # Incomplete.
+                break
+            if buf[pos + 1] != _LF:
                 # Bare CR!
                 raise errors.NewlineError('Expected CRLF, received bare CR.')
 
             pos += 2
             continue
 
-        is_lf = buf.startswith(b'\n', pos)
-        if is_lf:
+        if byte == _LF:
             if not allow_lf:
                 # Oops! LF isn't allowed.
                 raise errors.NewlineError('CRLF is required!')
@@ -468,25 +930,19 @@ def _skip_empty_lines(
             pos += 1
             continue
 
-        # It's not LF and it's not CRLF, so it could
-        # either be empty or we actually have data.
+        # It's not LF and it's not CRLF, so we actually have data.
         break
 
-    if len(buf) - pos > 0:
-        # We have data!
-        return pos
-
-    # No data
-    return None
+    return pos - start
 
 
-def _parse_version(buf: bytes) -> Optional[HTTPVersion]:
-    """Parse the HTTP version that exists in ``buf``."""
-    if len(buf) < 8:
+def _parse_version(buf: memoryview, pos: int) -> Optional[HTTPVersion]:
+    """Parse the HTTP version that starts at ``buf[pos]``."""
+    if len(buf) - pos < 8:
         # Too short.
         return None
 
-    next_8 = buf[:8]
+    next_8 = bytes(buf[pos:pos + 8])
 
     if not next_8.startswith(_HTTP_VER_START):
         raise errors.InvalidVersion(
@@ -494,229 +950,28 @@ def _parse_version(buf: bytes) -> Optional[HTTPVersion]:
 
     # It's time for the last byte.
     # We only accept 0 (HTTP/1.0) and 1 (HTTP/1.1).
-    last_byte = next_8[7]
-    if last_byte not in (_DIGITS[0], _DIGITS[1]):
+    version = _HTTP_VERSIONS.get(next_8[7])
+    if version is None:
         raise errors.InvalidVersion(
-            f'Expected 0 or 1 for HTTP minor version, received {bytes([last_byte])!r}'
+            f'Expected 0 or 1 for HTTP minor version, received {next_8[7:]!r}'
         )
 
-    return HTTPVersion(1, int(bytes([last_byte])))
-
-
-def _recv_method(buf: bytes) -> Optional[_ParseResult]:
-    """Receive the HTTP request method in ``buf``.
-
-    Returns a tuple containing the request method and the number of bytes parsed.
-    """
-    nrecved = 0
-    space_index = buf.find(_SPACE)
-    if space_index < 0:
-        # Before assuming it is incomplete, we have to check something.
-        if len(buf) > constants.MAX_REQ_METHOD_LEN:
-            # There are way too many bytes.
-            raise errors.InvalidToken('Request method too large!')
-        # Now we know it's incomplete.
-        return None
-
-    # The token needs to actually exist.
-    if space_index == 0:
-        raise errors.InvalidToken(
-            'Expected token in HTTP method, received space.')
-    if space_index > constants.MAX_REQ_METHOD_LEN:
-        raise errors.InvalidToken('Request method too large!')
-
-    # +1 because of the space
-    nrecved += space_index + 1
-    method = buf[:space_index]
-
-    if not _is_token(method):
-        raise errors.InvalidToken('Expected token in HTTP method')
-
-    return _ParseResult(method, nrecved)
-
-
-def _recv_uri(buf: bytes) -> Optional[_ParseResult]:
-    """Receive the HTTP request URI in ``buf``.
-
-    Returns a tuple containing the request URI and number of bytes
-    consumed. No parsing of the URI is done.
-    """
-    nrecved = 0
-    space_index = buf.find(_SPACE)
-    if space_index < 0:
-        # Before assuming it is incomplete, we have to check something.
-        if len(buf) > constants.MAX_URI_LEN:
-            # There are way too many bytes.
-            raise errors.InvalidURI('Request URI too large!')
-        # Incomplete URI.
-        return None
-
-    # Please actually include an URI.
-    if space_index == 0:
-        raise errors.InvalidURI('Expected URI character, received space.')
-    if space_index > constants.MAX_URI_LEN:
-        raise errors.InvalidURI('Request URI too large!')
-
-    # +1 because of the space.
-    nrecved = space_index + 1
-    uri = buf[:space_index]
-
-    if not _is_uri(uri):
-        raise errors.InvalidURI(
-            'Expected URI characters in HTTP URI.')
-
-    return _ParseResult(uri, nrecved)
-
-
-def _recv_code(buf: bytes) -> Optional[int]:
-    """Receive the HTTP status code in ``buf``."""
-    if len(buf) < 3:
-        # Not enough bytes.
-        return None
-
-    raw_code = buf[:3]
-    if not _are_digits(raw_code):
-        raise errors.InvalidStatus('Expected only digits in status code!')
-
-    return int(raw_code)
+    return version
 
 
-def _recv_reason(buf: bytes, allow_lf: bool) -> Optional[_ParseResult]:
-    """Receive the HTTP reason phrase.
+def _framing_header(name: bytes) -> Optional[int]:
+    """Return which framing header ``name`` is, if any."""
+    kind = _FRAMING_HEADERS.get(name)
+    if kind is None and len(name) in _FRAMING_HEADER_LENS:
+        kind = _FRAMING_HEADERS.get(name.lower())
+    return kind
 
-    This function assumes that the reason phrase exists, so if you wish
-    to make the reason phrase optional, you must check for its existence
-    yourself.
 
-    This function will "eat" (i.e. ignore and drop) any whitespace that appears
-    at the start and end of the reason phrase.
-
-    Returns the reason phrase and an integer representing the number of
-    bytes parsed.
-    """
-    nrecved = 0
-
-    newline_idx, newline_type = find_newline(buf, allow_lf)
-    if not bool(~newline_idx):
-        # Hmmm...
-        if len(buf) > constants.MAX_REASON_LEN:
-            # There should be a newline, since there are many more
-            # characters than the maximum allowed in a reason phrase.
-            raise errors.InvalidStatus('Reason phrase too large!')
-        # Otherwise, it's incomplete.
-        return None
-    if newline_idx > constants.MAX_REASON_LEN:
-        raise errors.InvalidStatus('Reason phrase too large!')
-
-    nrecved += newline_idx
-    nrecved += 2 if newline_type is NewlineType.CRLF else 1
-    reason = buf[:newline_idx].strip()
-
-    if not _is_vchar_or_whsp(reason):
-        # Check for obsolete text.
-        if not _is_obs_text(
-                reason.translate(None, constants.VCHAR_OR_WSP)):
-            raise errors.InvalidStatus(
-                'Invalid characters in response reason phrase!')
-        # We has obsolete text.
-        return _ParseResult(b'', nrecved)
-
-    return _ParseResult(reason, nrecved)
-
-
-def _recv_header_name(buf: bytes) -> Optional[_ParseResult]:
-    """Receive a HTTP header field name from ``buf``.
-
-    This method does NOT treat newlines (``\\n`` or ``\\r\\n``) as the end
-    of HTTP headers. That means, any newlines will be handled as if they were
-    invalid header characters. You must check for newlines yourself.
+def _newline_scanned(buf: memoryview, pos: int) -> int:
     """
-    nrecved = 0
-    colon_index = buf.find(_COLON)
-
-    if colon_index < 0:
-        # If there are more characters in the data than the maximum allowed
-        # characters in a header name, then something's wrong.
-        if len(buf) > constants.MAX_HEADER_NAME_LEN:
-            raise errors.InvalidToken('Header name too long!')
-        # Otherwise, it's incomplete.
-        return None
-
-    if colon_index == 0:
-        # Tokens must be at least 1 char long. Header names are tokens.
-        raise errors.InvalidToken('Tokens must be at least one char long.')
-    if colon_index > constants.MAX_HEADER_NAME_LEN:
-        raise errors.InvalidToken('Header name too long!')
-
-    # +1 because of the colon.
-    nrecved += colon_index + 1
-    header_name = buf[:colon_index]
-
-    if not _is_token(header_name):
-        raise errors.InvalidToken(
-            'Invalid characters in header name!')
-
-    return _ParseResult(header_name, nrecved)
-
-
-def _recv_header_value(buf: bytes, allow_lf: bool) -> Optional[_ParseResult]:
-    """Receive a HTTP header field value from ``buf``.
+    Return how many bytes after ``buf[pos]`` are known not to start a newline.
 
-    This function will "eat" (i.e. ignore and drop) any whitespace that appears
-    before any other characters in the field value.
+    The last byte is never counted, because it could be a CR that is waiting
+    for its LF.
     """
-    nrecved = 0
-    newline_idx, newline_type = find_newline(buf, allow_lf)
-    if not bool(~newline_idx):
-        # Hmmm...
-        if len(buf) > constants.MAX_HEADER_VAL_SIZE:
-            # There should be a newline, since there are many more
-            # characters than the maximum allowed in a header value.
-            raise errors.InvalidHeaderVal('Header field value too large!')
-        # Otherwise, it's incomplete.
-        return None
-    if newline_idx > constants.MAX_HEADER_VAL_SIZE:
-        raise errors.InvalidHeaderVal('Header field value too large!')
-
-    nrecved += newline_idx
-    nrecved += 2 if newline_type is NewlineType.CRLF else 1
-    header_val = buf[:newline_idx].strip()
-
-    if not _is_vchar_or_whsp(header_val):
-        # Check for obsolete text.
-        if not _is_obs_text(
-                header_val.translate(None, constants.VCHAR_OR_WSP)):
-            raise errors.InvalidHeaderVal(
-                'Invalid characters in header value!')
-
-        # We has obsolete text.
-        return _ParseResult(b'', nrecved)
-
-    return _ParseResult(header_val, nrecved)
-
-
-def _is_token(_bytes: bytes) -> bool:
-    """Are the bytes a valid HTTP token?"""
-    # Delete all valid characters. Any characters left are invalid.
-    return len(_bytes.translate(None, constants.TOKENS)) == 0
-
-
-def _is_uri(_bytes: bytes) -> bool:
-    """Could the bytes be a valid URI? (i.e. do the bytes have valid URI chars)."""
-    # Delete all valid characters. Any characters left are invalid.
-    return len(_bytes.translate(None, constants.URI_CHARS)) == 0
-
-
-def _is_vchar_or_whsp(_bytes: bytes) -> bool:
-    """Do the bytes only contain VCHARs and whitespace?"""
-    return len(_bytes.translate(None, constants.VCHAR_OR_WSP)) == 0
-
-
-def _is_obs_text(_bytes: bytes) -> bool:
-    """Do the bytes only contain obsolete text?"""
-    return len(_bytes.translate(None, constants.OBS_TXT)) == 0
-
-
-def _are_digits(_bytes: bytes) -> bool:
-    """Do the bytes only contain numerical characters?"""
-    return len(_bytes.translate(None, constants.DIGITS)) == 0
+    return max(len(buf) - pos - 1, 0)
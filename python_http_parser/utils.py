@@ -4,6 +4,7 @@
 
 __all__ = [
     'split_msg',
+    'get_head_end',
     'get_newline_type',
     'get_headers',
     'parse_status_line',
@@ -25,6 +26,9 @@ ParsedHeaders = collections.namedtuple(
     'ParsedHeaders', ['raw_headers', 'headers']
 )
 
+_STATUS_LINE_RE = re.compile(constants.HTTP_STATUS_LINE_REGEX, flags=re.ASCII)
+_REQUEST_LINE_RE = re.compile(constants.HTTP_REQUEST_LINE_REGEX, flags=re.ASCII)
+
 
 def split_msg(msg, newline_type):
     """Split a HTTP message and return the head and body in a list."""
@@ -38,6 +42,28 @@ def split_msg(msg, newline_type):
     )
 
 
+def get_head_end(msg):
+    """Find where the head of a HTTP message, which must be bytes, ends.
+
+    Return the index right after the double newline that ends the head, or the
+    length of ``msg`` if there is no double newline. Only the first LF is used
+    to tell which newlines are used, so the body is never scanned.
+    """
+    newline_index = msg.find(b'\n')
+    if not bool(~newline_index):
+        raise errors.NewlineError('No newlines found!')
+
+    if newline_index > 0 and msg[newline_index - 1] == 0x0d:
+        double_newline = b'\r\n\r\n'
+    else:
+        double_newline = b'\n\n'
+
+    head_end = msg.find(double_newline)
+    if not bool(~head_end):
+        return len(msg)
+    return head_end + len(double_newline)
+
+
 def get_start_line(msg, newline_type):
     """Get the start line of a HTTP message.
 
@@ -117,7 +143,7 @@ def parse_status_line(string):
     """
     Parse a HTTP status line and return the HTTP version, status code, and status message as a list.
     """
-    if re.match(constants.HTTP_STATUS_LINE_REGEX, string, flags=re.ASCII):
+    if _STATUS_LINE_RE.match(string):
         return StatusLine(
             # HTTP version.
             float(string[5:8]),
@@ -134,7 +160,7 @@ def parse_status_line(string):
 
 def parse_request_line(string):
     """Parse a HTTP request line and return the HTTP method, URI, and version as a list."""
-    if re.match(constants.HTTP_REQUEST_LINE_REGEX, string, flags=re.ASCII):
+    if _REQUEST_LINE_RE.match(string):
         split = string.split(' ')
         if len(split) == 3:
             split[2] = float(split[2][5:])
@@ -187,9 +213,12 @@ def parse_header_line(hdr_line):
 
     hdr_name = hdr_line[:colon_pos]
     hdr_val = hdr_line[colon_pos + 1:]
+    name = constants.LOWERCASE_HEADER_NAMES.get(hdr_name)
+    if name is None:
+        name = hdr_name.lower()
 
     return {
-        'name': hdr_name.lower(),
+        'name': name,
         'value': hdr_val,
         # 'raw' contains the header name and value just as we received them.
         'raw': [hdr_name, hdr_val]
@@ -55,6 +55,7 @@ def split_msg(
 
 
 def get_newline_type(msg: str) -> str: ...
+def get_head_end(msg: Union[bytes, bytearray]) -> int: ...
 def parse_status_line(string: str) -> StatusLine: ...
 def parse_request_line(string: str) -> RequestLine: ...
 def parse_header_line(hdr_line: str) -> ParsedHeaderLine: ...
@@ -10,7 +10,11 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import python_http_parser
+import python_http_parser.aio
 import python_http_parser.body
+import python_http_parser.bulk
 import python_http_parser.constants
 import python_http_parser.errors
+import python_http_parser.headers
+import python_http_parser.pull
 import python_http_parser.stream
@@ -0,0 +1,318 @@
+"""Testing the asyncio integration.
+
+This file houses tests for the ``python_http_parser.aio`` module. Connections
+are made over socket pairs, so no network access is needed.
+"""
+
+import asyncio
+import socket
+
+import pytest
+
+from .context import python_http_parser
+
+aio = python_http_parser.aio
+
+
+async def serve(data, **kwargs):
+    """Send ``data`` to a ``HTTPProtocol``, and collect what it hands out."""
+    results = []
+    server_sock, client_sock = socket.socketpair()
+    loop = asyncio.get_running_loop()
+    finished = loop.create_future()
+
+    async def handler(protocol):
+        try:
+            async for msg in protocol:
+                results.append((msg, await msg.body.read()))
+        except Exception as ex:  # pylint: disable=W0703
+            results.append(ex)
+        finished.set_result(None)
+
+    await loop.connect_accepted_socket(
+        lambda: aio.HTTPProtocol(handler, **kwargs), server_sock)
+    _, writer = await asyncio.open_connection(sock=client_sock)
+    writer.write(data)
+    await writer.drain()
+    writer.close()
+
+    await asyncio.wait_for(finished, 5)
+    return results
+
+
+def test_protocol():
+    """Make sure HTTPProtocol parses pipelined messages and streams their bodies."""
+    body = bytes(range(256)) * 1024
+    data = b''.join([
+        b'POST /upload HTTP/1.1\r\nContent-Length: %d\r\n\r\n' % len(body),
+        body,
+        b'GET / HTTP/1.1\r\nHost: example.org\r\n\r\n',
+        b'POST /chunked HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n',
+        b'5\r\nhello\r\n0\r\n\r\n',
+    ])
+
+    # Use a tiny buffer and limit, so the buffer has to grow and the
+    # transport has to be paused.
+    results = asyncio.run(serve(data, buffer_size=16, high_water=1024))
+
+    assert len(results) == 3
+    assert [(msg.method, msg.uri) for (msg, _) in results] == [
+        (b'POST', b'/upload'), (b'GET', b'/'), (b'POST', b'/chunked')]
+    assert results[0][0].headers == [(b'Content-Length', b'%d' % len(body))]
+    assert results[0][1] == body
+    assert results[1][0].headers == [(b'Host', b'example.org')]
+    assert results[1][1] == b''
+    assert results[2][1] == b'hello'
+    assert results[2][0].body.done()
+
+
+def test_protocol_backpressure():
+    """Make sure HTTPProtocol stops reading while bodies aren't consumed."""
+    body = b'a' * 65536
+    data = b'POST / HTTP/1.1\r\nContent-Length: %d\r\n\r\n' % len(body) + body
+    reading = []
+
+    async def run():
+        server_sock, client_sock = socket.socketpair()
+        loop = asyncio.get_running_loop()
+        finished = loop.create_future()
+
+        async def handler(protocol):
+            async for msg in protocol:
+                # Give the rest of the body time to arrive.
+                await asyncio.sleep(0.1)
+                reading.append(protocol.transport.is_reading())
+                finished.set_result(await msg.body.read())
+                reading.append(protocol.transport.is_reading())
+                break
+
+        await loop.connect_accepted_socket(
+            lambda: aio.HTTPProtocol(handler, high_water=1024), server_sock)
+        _, writer = await asyncio.open_connection(sock=client_sock)
+        writer.write(data)
+        result = await asyncio.wait_for(finished, 5)
+        writer.close()
+        return result
+
+    assert asyncio.run(run()) == body
+    assert reading == [False, True]
+
+
+def test_protocol_large_chunk():
+    """Make sure HTTPProtocol's buffer doesn't grow to fit a large chunk."""
+    body = b'a' * (8 * 1024 * 1024)
+    data = b''.join([
+        b'POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n',
+        b'%x\r\n' % len(body),
+        body,
+        b'\r\n0\r\n\r\n',
+    ])
+    protocols = []
+
+    async def run():
+        server_sock, client_sock = socket.socketpair()
+        loop = asyncio.get_running_loop()
+        finished = loop.create_future()
+
+        async def handler(protocol):
+            protocols.append(protocol)
+            async for msg in protocol:
+                finished.set_result(await msg.body.read())
+                break
+
+        await loop.connect_accepted_socket(
+            lambda: aio.HTTPProtocol(handler, buffer_size=4096), server_sock)
+        _, writer = await asyncio.open_connection(sock=client_sock)
+        writer.write(data)
+        result = await asyncio.wait_for(finished, 5)
+        writer.close()
+        return result
+
+    assert asyncio.run(run()) == body
+    # pylint: disable=W0212
+    assert len(protocols[0]._buffer) == 4096
+
+
+def test_protocol_errors():
+    """Make sure HTTPProtocol hands out parsing errors and broken bodies."""
+    results = asyncio.run(serve(b'GET / HTTP/1.1\r\n\r\nG@T / HTTP/1.1\r\n\r\n'))
+
+    assert results[0][0].method == b'GET'
+    assert isinstance(results[1], python_http_parser.errors.InvalidToken)
+
+    results = asyncio.run(serve(b'POST / HTTP/1.1\r\nContent-Length: 10\r\n\r\nabc'))
+
+    assert isinstance(results[0], ConnectionError)
+
+
+def test_message_reader():
+    """Make sure MessageReader parses the messages in a StreamReader."""
+    body = bytes(range(256)) * 64
+    data = b''.join([
+        b'HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n' % len(body),
+        body,
+        b'HTTP/1.1 404 Not Found\r\nTransfer-Encoding: chunked\r\n\r\n',
+        b'3\r\nabc\r\n3\r\ndef\r\n0\r\n\r\n',
+        b'HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\nabc',
+    ])
+
+    async def run():
+        results = []
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+
+        try:
+            async for msg in aio.MessageReader(reader, is_response=True, block_size=7):
+                results.append((msg.status_code, msg.reason))
+                results.append(b''.join([chunk async for chunk in msg.body]))
+        except ConnectionError as ex:
+            results.append(ex)
+        return results
+
+    results = asyncio.run(run())
+
+    assert results[:4] == [(200, b'OK'), body, (404, b'Not Found'), b'abcdef']
+    assert results[4] == (200, b'OK')
+    assert isinstance(results[5], ConnectionError)
+
+
+def test_message_reader_no_body():
+    """Make sure MessageReader can be told that a response has no body."""
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\n')
+        reader.feed_data(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nhi')
+        reader.feed_eof()
+
+        messages = aio.MessageReader(reader, is_response=True)
+        messages.expect_no_body()
+        return [await msg.body.read() async for msg in messages]
+
+    assert asyncio.run(run()) == [b'', b'hi']
+
+
+STREAM_DATA = b''.join([
+    b'POST /upload HTTP/1.1\r\nContent-Length: 5\r\n\r\nhello',
+    b'GET / HTTP/1.1\r\nHost: example.org\r\n\r\n',
+    b'POST /chunked HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n',
+    b'3\r\nabc\r\n3\r\ndef\r\n0\r\n\r\n',
+])
+STREAM_RESULTS = [(b'POST', b'/upload', b'hello'), (b'GET', b'/', b''),
+                  (b'POST', b'/chunked', b'abcdef')]
+
+
+async def collect(messages):
+    """Collect the messages handed out by a MessageStream."""
+    return [(msg.method, msg.uri, await msg.body.read()) async for msg in messages]
+
+
+class AsyncioSocket:  # pylint: disable=R0903
+    """A socket with an asyncio ``recv_into()`` coroutine method."""
+
+    def __init__(self, sock):
+        sock.setblocking(False)
+        self.sock = sock
+
+    async def recv_into(self, buf):
+        """Receive data into ``buf``, like trio sockets do."""
+        return await asyncio.get_running_loop().sock_recv_into(self.sock, buf)
+
+
+def test_message_stream_asyncio():
+    """Make sure MessageStream receives into its buffer under asyncio."""
+    server_sock, client_sock = socket.socketpair()
+    with server_sock, client_sock:
+        client_sock.sendall(STREAM_DATA)
+        client_sock.shutdown(socket.SHUT_WR)
+
+        stream = aio.MessageStream(AsyncioSocket(server_sock), buffer_size=16)
+        assert asyncio.run(collect(stream)) == STREAM_RESULTS
+
+
+def test_message_stream_trio():
+    """Make sure MessageStream works with trio sockets and streams."""
+    trio = pytest.importorskip('trio')
+
+    async def run(wrap):
+        server_sock, client_sock = trio.socket.socketpair()
+        with server_sock, client_sock:
+            for i in range(0, len(STREAM_DATA), 10):
+                await client_sock.send(STREAM_DATA[i:i + 10])
+            client_sock.shutdown(trio.socket.SHUT_WR)
+
+            return await collect(aio.MessageStream(wrap(server_sock), buffer_size=16))
+
+    # recv_into()...
+    assert trio.run(run, lambda sock: sock) == STREAM_RESULTS
+    # ...and receive_some().
+    assert trio.run(run, trio.SocketStream) == STREAM_RESULTS
+
+
+class MemoryStream:  # pylint: disable=R0903
+    """An in-memory stream with a ``receive_some()`` coroutine method, like trio streams."""
+
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    async def receive_some(self, max_bytes):
+        """Receive up to ``max_bytes`` of the data."""
+        data = bytes(self.data[self.pos:self.pos + max_bytes])
+        self.pos += len(data)
+        return data
+
+
+class MemorySocket(MemoryStream):  # pylint: disable=R0903
+    """An in-memory stream with a ``recv_into()`` coroutine method, like trio sockets."""
+
+    async def recv_into(self, buf):
+        """Receive as much of the data as fits into ``buf``."""
+        data = await self.receive_some(len(buf))
+        buf[:len(data)] = data
+        return len(data)
+
+
+def test_message_stream_large_chunk():
+    """Make sure MessageStream doesn't keep a large chunk around until it's complete."""
+    body = b'a' * (8 * 1024 * 1024)
+    data = b''.join([
+        b'POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n',
+        b'%x\r\n' % len(body),
+        body,
+        b'\r\n0\r\n\r\n',
+    ])
+
+    async def run(stream):
+        # pylint: disable=W0212
+        unprocessed = []
+        messages = aio.MessageStream(stream, buffer_size=4096)
+        async for msg in messages:
+            received = []
+            async for chunk in msg.body:
+                received.append(chunk)
+                unprocessed.append(len(messages._tail))
+            if messages._buffer is not None:
+                unprocessed.append(len(messages._buffer))
+            return b''.join(received), max(unprocessed)
+        return None
+
+    for stream_type in (MemorySocket, MemoryStream):
+        received, unprocessed = asyncio.run(run(stream_type(data)))
+        assert received == body
+        assert unprocessed <= 4096
+
+
+def test_message_stream_errors():
+    """Make sure MessageStream rejects streams it can't receive from."""
+    with pytest.raises(TypeError):
+        aio.MessageStream(object())
+
+    server_sock, client_sock = socket.socketpair()
+    with server_sock, client_sock:
+        client_sock.sendall(b'POST / HTTP/1.1\r\nContent-Length: 10\r\n\r\nabc')
+        client_sock.shutdown(socket.SHUT_WR)
+
+        stream = aio.MessageStream(AsyncioSocket(server_sock))
+        with pytest.raises(ConnectionError):
+            asyncio.run(collect(stream))
@@ -4,6 +4,10 @@ when ``Content-Length`` is encountered, and ``ChunkedProcessor``, for use
 when ``Transfer-Encoding: chunked`` is encountered.
 """
 
+import os
+
+import pytest
+
 from . import chunk, processor_process_chunks
 from .context import python_http_parser
 
@@ -321,3 +325,240 @@ or 4194304PiB (Pebibytes)
     assert len(result['chunks']) == 0
     assert result['body'] is None
     assert not result['finished']
+
+def test_processor_reset():
+    """Make sure body processors could be reset and reused."""
+    errors = []
+    chunks = []
+    finished = []
+
+    fixed = FixedLenProcessor(5)
+    chunked = ChunkedProcessor()
+    for processor in (fixed, chunked):
+        processor.on_data(chunks.append)
+        processor.on_error(errors.append)
+        processor.on_finished(lambda: finished.append(True))
+
+    for _ in range(2):
+        fixed.process(b'Hello', True)
+        fixed.reset(7)
+        fixed.process(b' World!', True)
+        fixed.reset(5)
+
+        chunked.process(b'3;ext=1\r\nbye\r\n0\r\n\r\n', True)
+        assert chunked.extensions == ['ext=1']
+        chunked.reset()
+        assert not chunked.extensions
+
+    assert len(errors) == 0
+    assert len(finished) == 6
+    assert chunks == [b'Hello', b' World!', b'bye'] * 2
+
+def test_processor_data_into():
+    """Make sure body processors could copy body data into a caller-provided buffer."""
+    body = b'Hello World! This body is longer than the buffer.'
+    errors = []
+    results = []
+
+    for processor, data in (
+        (FixedLenProcessor(len(body)), body),
+        (ChunkedProcessor(), b'5\r\nHello\r\n%x\r\n%s\r\n0\r\n\r\n' % (len(body) - 5, body[5:]))
+    ):
+        received = bytearray()
+        buffer = bytearray(8)
+        processor.on_error(errors.append)
+        processor.on_data(lambda _: errors.append('data callback called'))
+        processor.on_data_into(buffer, lambda n, b=buffer, r=received: r.extend(b[:n]))
+        processor_process_chunks(processor, chunk(data, 3), True)
+        results.append(bytes(received))
+
+    assert len(errors) == 0
+    assert results == [body, body]
+
+def test_body_sink():
+    """Make sure BodySinks write bodies to file descriptors and spill to temporary files."""
+    BodySink = python_http_parser.body.BodySink
+    body = b'0123456789' * 100
+
+    # Kept in memory.
+    with BodySink() as sink:
+        processor = FixedLenProcessor(len(body))
+        sink.attach(processor)
+        processor_process_chunks(processor, chunk(body, 7), True)
+        assert not sink.spilled
+        assert sink.getbuffer() == body
+
+    # Spilled to a temporary file.
+    with BodySink(spill_threshold=100, batch_size=64) as sink:
+        processor = ChunkedProcessor()
+        sink.attach(processor)
+        processor.process(b'%x\r\n%s\r\n0\r\n\r\n' % (len(body), body), True)
+        assert sink.spilled
+        assert sink.size == len(body)
+        sink.file.seek(0)
+        assert sink.file.read() == body
+
+    # Written to a file descriptor.
+    read_fd, write_fd = os.pipe()
+    try:
+        sink = BodySink(write_fd, batch_size=64)
+        for part in chunk(body, 7):
+            sink.write(part)
+        sink.close()
+        assert os.read(read_fd, len(body) + 1) == body
+
+        # Attached sinks flush once the body is finished.
+        finished = []
+        processor = FixedLenProcessor(len(body))
+        processor.on_finished(lambda: finished.append(True))
+        sink.attach(processor)
+        processor_process_chunks(processor, chunk(body, 7), True)
+        assert finished == [True]
+        assert os.read(read_fd, len(body) + 1) == body
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+def test_chunked_body_limits():
+    """Make sure the ChunkedProcessor enforces its limits without waiting for newlines."""
+    errors = []
+    chunks = []
+    processor = ChunkedProcessor()
+    processor.on_error(errors.append)
+    processor.on_data(chunks.append)
+
+    # A large chunk, with no CRs or semicolons in its data.
+    data = b'x' * 65536
+    assert processor.process(b'10000\r\n' + data + b'\r\n', True) > 0
+    assert b''.join(chunks) == data
+
+    # Chunk extensions larger than 4KiB, which haven't ended yet.
+    assert processor.process(b'1;' + b'e' * 5000, True) == -1
+    assert len(errors) == 1
+    assert isinstance(errors[0], python_http_parser.errors.InvalidChunkExtensions)
+
+def test_processor_spans():
+    """Make sure body processors could report spans of body data instead of copying it."""
+    body = b'Hello World!'
+    data = b'5\r\nHello\r\n7;ext=1\r\n World!\r\n0\r\n\r\n'
+    errors = []
+    spans = []
+
+    for processor, chunk_data in (
+        (FixedLenProcessor(len(body)), body + b'extra'),
+        (ChunkedProcessor(), data),
+    ):
+        processor.on_error(errors.append)
+        processor.on_data(lambda _: errors.append('data callback called'))
+        processor.on_span(lambda offset, length: spans.append((offset, length)))
+        processor.process(chunk_data, True)
+
+    assert len(errors) == 0
+    assert spans == [(0, 12), (3, 5), (19, 7)]
+    assert data[3:8] + data[19:26] == body
+
+
+def test_fixed_body_no_empty_data():
+    """Make sure FixedLenProcessor doesn't hand out empty data."""
+    chunks = []
+    spans = []
+    processor = FixedLenProcessor(5)
+    processor.on_data(chunks.append)
+
+    assert processor.process(b'') == 0
+    assert processor.process(b'hello') == 5
+    assert chunks == [b'hello']
+
+    processor.reset(5)
+    processor.on_span(lambda offset, length: spans.append((offset, length)))
+    assert processor.process(b'') == 0
+    assert processor.process(b'hello') == 5
+    assert spans == [(0, 5)]
+
+
+def test_processor_data_copied():
+    """Make sure the data callback gets copies, even of views into a reused buffer."""
+    buf = bytearray(b'5\r\nHello\r\n0\r\n\r\n')
+    chunks = []
+
+    processor = ChunkedProcessor()
+    processor.on_data(chunks.append)
+    processor.process(memoryview(buf), True)
+    buf[:] = bytes(len(buf))
+
+    assert chunks == [b'Hello']
+    assert isinstance(chunks[0], bytes)
+
+
+def test_chunked_body_partial_chunks():
+    """Make sure a chunk's data is handed out as it arrives, not once the chunk is complete."""
+    chunks = []
+    spans = []
+    processor = ChunkedProcessor()
+    processor.on_data(chunks.append)
+
+    assert processor.process(b'a\r\nhello', True) == 8
+    assert chunks == [b'hello']
+    assert processor.process(b'world\r', True) == 5
+    assert processor.process(b'\r\n0\r\n\r\n', True) == 7
+    assert chunks == [b'hello', b'world']
+    assert processor.finished
+
+    processor.reset()
+    processor.on_span(lambda offset, length: spans.append((offset, length)))
+    assert processor.process(b'5\r\nab', True) == 5
+    assert processor.process(b'cde\r\n0\r\n\r\n', True) == 10
+    assert spans == [(3, 2), (0, 3)]
+    assert processor.finished
+
+
+def test_chunked_body_many_chunks():
+    """Make sure many small chunks are processed alike, whatever their newlines and extensions."""
+    chunk_list = [b'%x' % n for n in range(1, 301)]
+    data = b''.join(
+        b'%x%s\r\n%s%s' % (
+            len(data),
+            b';n=%d' % i if i % 3 == 0 else b'',
+            data,
+            b'\n' if i % 50 == 0 else b'\r\n',
+        )
+        for (i, data) in enumerate(chunk_list)
+    ) + b'0\r\n\r\n'
+
+    for size in (None, 100, 7):
+        errors = []
+        chunks = []
+        processor = ChunkedProcessor()
+        processor.on_error(errors.append)
+        processor.on_data(chunks.append)
+        if size is None:
+            assert processor.process(data, True) == len(data)
+        else:
+            processor_process_chunks(processor, chunk(data, size), True)
+
+        assert not errors
+        assert processor.finished
+        if size is None:
+            assert chunks == chunk_list
+        else:
+            # Chunks split over many calls are handed out piece by piece.
+            assert b''.join(chunks) == b''.join(chunk_list)
+        assert processor.extensions == [f'n={i}' for i in range(0, 300, 3)]
+
+    processor = ChunkedProcessor()
+    processor.on_error(errors.append)
+    assert processor.process(b'1000001\r\n', True) == -1
+    assert isinstance(errors[-1], python_http_parser.errors.InvalidChunkSize)
+
+def test_iter_chunks():
+    """Make sure iter_chunks() yields views of the chunks in a body."""
+    body = b'5\r\nHello\r\n7;ext=1\r\n World!\r\n0\r\n\r\n'
+
+    chunks = list(python_http_parser.body.iter_chunks(body))
+
+    assert all(isinstance(data, memoryview) for data in chunks)
+    assert [bytes(data) for data in chunks] == [b'Hello', b' World!']
+
+    for invalid in (body[:-3], b'5\nHello\n0\n\n', b'x\r\n'):
+        with pytest.raises(python_http_parser.errors.InvalidChunk):
+            list(python_http_parser.body.iter_chunks(invalid))
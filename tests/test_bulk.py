@@ -0,0 +1,107 @@
+"""Testing the bulk parser.
+
+This file houses tests for the ``python_http_parser.bulk`` module.
+"""
+
+import struct
+
+import pytest
+
+from .context import python_http_parser
+
+bulk = python_http_parser.bulk
+
+REQUESTS = [
+    b'GET / HTTP/1.1\r\nHost: example.org\r\n\r\n',
+    b'POST /chunked HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n5;x=1\r\nhello\r\n0\r\n\r\n',
+    b'POST /upload HTTP/1.1\r\ncontent-length: 3\r\n\r\nabc',
+    b'G@T / HTTP/1.1\r\n\r\n',
+]
+
+
+def test_parse_file(tmp_path):
+    """Make sure raw captures are split at message boundaries, and parsed in order."""
+    path = tmp_path / 'capture'
+    path.write_bytes(b''.join(REQUESTS) * 10 + b'\r\nGET /incomplete HTTP/1.1\r\nHost')
+
+    records = list(bulk.parse_file(path, workers=2, shard_size=100))
+
+    assert len(records) == 41
+    assert [record.uri for record in records[:3]] == [b'/', b'/chunked', b'/upload']
+    assert [record.body_length for record in records[:3]] == [0, 5, 3]
+    assert records[0].headers == [(b'Host', b'example.org')]
+    assert records[0].error is None
+    assert isinstance(records[3].error, python_http_parser.errors.InvalidToken)
+
+    offset = 0
+    for record in records[:-1]:
+        assert record.offset == offset
+        offset += record.length
+    assert records[-1].uri == b'/incomplete'
+    assert isinstance(records[-1].error, python_http_parser.errors.ParsingError)
+
+
+def test_parse_file_responses(tmp_path):
+    """Make sure responses which never have a body are split right."""
+    path = tmp_path / 'capture'
+    path.write_bytes(
+        b'HTTP/1.1 304 Not Modified\r\nContent-Length: 3\r\n\r\n'
+        b'HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\nabc')
+
+    records = list(bulk.parse_file(path, is_response=True, workers=1))
+
+    assert [(record.status_code, record.body_length) for record in records] == [
+        (304, 0), (200, 3)]
+
+    # Without framing headers, the body runs to the end of the file.
+    path.write_bytes(
+        b'HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\nabc'
+        b'HTTP/1.1 200 OK\r\n\r\nHTTP/1.1 200 OK\r\n\r\n')
+
+    records = list(bulk.parse_file(path, is_response=True, workers=1))
+
+    assert [(record.body_length, record.error) for record in records] == [
+        (3, None), (19, None)]
+
+
+def test_parse_file_records(tmp_path):
+    """Make sure length-prefixed records are parsed."""
+    path = tmp_path / 'capture'
+    path.write_bytes(b''.join(struct.pack('>I', len(msg)) + msg for msg in REQUESTS))
+
+    records = list(bulk.parse_file(path, record_prefix='>I', workers=2))
+
+    assert [record.method for record in records] == [b'GET', b'POST', b'POST', None]
+    offset = 0
+    for record, msg in zip(records, REQUESTS):
+        offset += 4
+        assert (record.offset, record.length) == (offset, len(msg))
+        offset += len(msg)
+
+    path.write_bytes(b'')
+    assert not list(bulk.parse_file(path))
+
+    with pytest.raises(ValueError):
+        list(bulk.parse_file(path, shard_size=0))
+
+
+def test_parse_many():
+    """Make sure parse_many() returns a record for each message, in order."""
+    messages = [
+        b'GET /%d HTTP/1.1\r\nHost: example.org\r\n\r\n' % i for i in range(100)
+    ] + [bytearray(msg) for msg in REQUESTS] + [b'GET / HTTP/1.1\r\n']
+
+    for workers in (1, 3):
+        records = bulk.parse_many(messages, workers=workers)
+
+        assert [record.uri for record in records[:100]] == [
+            b'/%d' % i for i in range(100)]
+        assert [record.body_length for record in records[100:103]] == [0, 5, 3]
+        assert all(record.error is None for record in records[:103])
+        assert isinstance(records[103].error, python_http_parser.errors.InvalidToken)
+        assert isinstance(records[104].error, python_http_parser.errors.ParsingError)
+        assert [record.length for record in records] == list(map(len, messages))
+
+    assert not bulk.parse_many([], workers=2)
+    with pytest.raises(ValueError):
+        bulk.parse_many(messages, workers=-1)
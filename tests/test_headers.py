@@ -0,0 +1,45 @@
+"""Testing the ``Headers`` mapping.
+
+This file houses tests for the ``python_http_parser.headers`` module, and for
+``parse()`` with ``lazy_headers`` set.
+"""
+
+from .context import python_http_parser
+
+Headers = python_http_parser.headers.Headers
+index_headers = python_http_parser.headers.index_headers
+
+
+def test_lazy_headers():
+    """Test that lazy headers have the same contents as the headers dict."""
+    messages = [
+        'GET / HTTP/1.1\r\nHost: a\r\nX-Test: 1\r\nhost: b\r\n\r\nbody',
+        b'GET / HTTP/1.1\nHost: caf\xe9\nAccept: */*\n\nbody',
+        'GET / HTTP/1.1\r\n\r\n',
+    ]
+
+    for msg in messages:
+        eager = python_http_parser.parse(msg)
+        lazy = python_http_parser.parse(msg, lazy_headers=True)
+
+        assert isinstance(lazy['headers'], Headers)
+        assert dict(lazy['headers']) == eager['headers']
+        assert lazy['headers'].raw() == eager['raw_headers']
+        assert lazy['raw_headers'] is None
+        assert lazy['body'] == eager['body']
+
+
+def test_headers_lookup():
+    """Test case-insensitive lookups in ``Headers``."""
+    buf = b'Host: example.org\r\nX-Test: 1\r\nx-test: 2\r\n'
+    headers = Headers(buf, index_headers(buf, 0, len(buf) - 2, b'\r\n'))
+
+    assert len(headers) == 2
+    assert list(headers) == ['host', 'x-test']
+    assert headers['HOST'] == ' example.org'
+    assert headers['X-Test'] == [' 1', ' 2']
+    assert headers.get_all('x-TEST') == [' 1', ' 2']
+    assert 'Host' in headers
+    assert 'Content-Length' not in headers
+    assert headers.get('content-length') is None
+    assert headers.get_all('content-length') == []
@@ -164,3 +164,48 @@ I want to believe!!!!!!!!!!!
     assert result['raw_headers'] is not None and isinstance(
         result['raw_headers'], list)
     assert result['body'] is None or isinstance(result['body'], str)
+
+
+def test_parse_bytes_body():
+    """Test that the body of a bytes message is left alone."""
+    body = b'\x00\xff' * 512
+    msg = b'POST / HTTP/1.1\r\nX-Name: caf\xe9\r\n\r\n' + body
+
+    result = python_http_parser.parse(msg)
+    assert result['headers']['x-name'].strip() == 'caf\u00e9'
+    assert isinstance(result['body'], memoryview)
+    assert result['body'] == body
+    assert result['body'].obj is msg
+
+    result = python_http_parser.parse(bytearray(b'GET / HTTP/1.1\n\n'))
+    assert result['req_method'] == 'GET'
+    assert result['body'] == b''
+
+    # The body of a bytearray is copied, so the bytearray can still be changed.
+    msg = bytearray(b'POST / HTTP/1.1\r\n\r\nabc')
+    for result in (python_http_parser.parse(msg),
+                   python_http_parser.parse_message(msg).to_dict()):
+        assert type(result['body']) is bytes  # pylint: disable=C0123
+        assert result['body'] == b'abc'
+    msg += b'def'
+    assert msg.endswith(b'abcdef')
+
+
+def test_parse_message():
+    """Test that ``parse_message()`` agrees with ``parse()``."""
+    messages = [
+        'GET / HTTP/1.1\r\nHost: a\r\nX-Test: 1\r\nhost: b\r\n\r\nbody',
+        b'HTTP/1.1 200 OK\nServer: caf\xe9\n\n\x00\xff',
+    ]
+
+    for msg in messages:
+        is_response = not msg.startswith('GET' if isinstance(msg, str) else b'GET')
+        message = python_http_parser.parse_message(msg, is_response=is_response)
+
+        assert isinstance(message, python_http_parser.ParsedMessage)
+        assert not hasattr(message, '__dict__')
+        assert message.to_dict() == python_http_parser.parse(msg, is_response=is_response)
+
+    assert message.status_code == 200
+    assert message.headers['server'] == ' caf\u00e9'
+    assert message.body.obj is messages[-1]
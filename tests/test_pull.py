@@ -0,0 +1,148 @@
+"""Testing the pull parser.
+
+This file houses tests for the ``python_http_parser.pull`` module.
+"""
+
+import pytest
+
+from .context import python_http_parser
+
+pull = python_http_parser.pull
+
+
+def events_of(parser):
+    """Take events out of ``parser`` until it needs data or the connection is closed."""
+    events = []
+    while True:
+        event = parser.next_event()
+        events.append(event)
+        if event is pull.NEED_DATA or isinstance(event, pull.ConnectionClosed):
+            return events
+
+
+def test_pull_requests():
+    """Make sure requests are parsed into events, even when the data trickles in."""
+    data = b''.join([
+        b'GET / HTTP/1.1\r\nHost: example.org\r\n\r\n',
+        b'POST /chunked HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n',
+        b'5\r\nhello\r\n0\r\n\r\n',
+        b'POST /upload HTTP/1.0\r\nContent-Length: 3\r\n\r\nabc',
+    ])
+    expected = [
+        pull.Request(b'GET', b'/', python_http_parser.stream.HTTP_1_1,
+                     [(b'Host', b'example.org')]),
+        pull.EndOfMessage(),
+        pull.Request(b'POST', b'/chunked', python_http_parser.stream.HTTP_1_1,
+                     [(b'Transfer-Encoding', b'chunked')]),
+        pull.Data(b'hello'),
+        pull.EndOfMessage(),
+        pull.Request(b'POST', b'/upload', python_http_parser.stream.HTTP_1_0,
+                     [(b'Content-Length', b'3')]),
+        pull.Data(b'abc'),
+        pull.EndOfMessage(),
+    ]
+
+    for size in (len(data), 7, 1):
+        parser = pull.PullParser()
+        assert parser.next_event() is pull.NEED_DATA
+
+        events = []
+        for i in range(0, len(data), size):
+            parser.receive_data(data[i:i + size])
+            events.extend(events_of(parser)[:-1])
+        parser.receive_data(b'')
+        events.extend(events_of(parser))
+
+        # Body data might be split up into many Data events.
+        merged = []
+        for event in events:
+            if isinstance(event, pull.Data) and isinstance(merged[-1], pull.Data):
+                merged[-1] = pull.Data(merged[-1].data + event.data)
+            else:
+                merged.append(event)
+
+        assert [type(event) for event in merged] == [
+            type(event) for event in expected] + [pull.ConnectionClosed]
+        assert [event for event in merged if isinstance(event, tuple)] == [
+            event for event in expected if isinstance(event, tuple)]
+
+
+def test_pull_responses():
+    """Make sure responses are parsed into events."""
+    parser = pull.PullParser(is_response=True)
+    parser.receive_data(b'HTTP/1.1 204 No Content\r\nContent-Length: 3\r\n\r\n')
+    parser.receive_data(b'HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\nabc')
+
+    events = events_of(parser)
+
+    assert events[0] == pull.Response(
+        python_http_parser.stream.HTTP_1_1, 204, b'No Content', [(b'Content-Length', b'3')])
+    assert isinstance(events[1], pull.EndOfMessage)
+    assert events[2].status_code == 200
+    assert events[3] == pull.Data(b'abc')
+    assert isinstance(events[4], pull.EndOfMessage)
+    assert events[5] is pull.NEED_DATA
+
+    # Without framing headers, the body ends with the connection.
+    parser = pull.PullParser(is_response=True)
+    parser.receive_data(b'HTTP/1.0 200 OK\r\n\r\nabc')
+    parser.receive_data(b'def')
+    parser.receive_data(b'')
+
+    events = events_of(parser)
+
+    assert events[0].status_code == 200
+    assert events[1:3] == [pull.Data(b'abc'), pull.Data(b'def')]
+    assert isinstance(events[3], pull.EndOfMessage)
+    assert isinstance(events[4], pull.ConnectionClosed)
+
+    # A response to HEAD has no body, whatever its headers say.
+    parser = pull.PullParser(is_response=True)
+    parser.expect_no_body()
+    parser.receive_data(b'HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\n')
+    parser.receive_data(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nhi')
+
+    events = events_of(parser)
+
+    assert [type(event) for event in events[:-1]] == [
+        pull.Response, pull.EndOfMessage, pull.Response, pull.Data, pull.EndOfMessage]
+    assert events[3] == pull.Data(b'hi')
+    assert events[5] is pull.NEED_DATA
+
+
+def test_pull_no_empty_data():
+    """Make sure no empty Data events are handed out when the head and the body arrive apart."""
+    for is_response, head in ((False, b'POST / HTTP/1.1\r\nContent-Length: 5\r\n\r\n'),
+                              (True, b'HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\n')):
+        parser = pull.PullParser(is_response=is_response)
+        parser.receive_data(head)
+        events = events_of(parser)
+        parser.receive_data(b'hello')
+        events.extend(events_of(parser))
+
+        assert [event for event in events if isinstance(event, pull.Data)] == [
+            pull.Data(b'hello')]
+        assert isinstance(events[-2], pull.EndOfMessage)
+
+
+def test_pull_errors():
+    """Make sure errors are raised from next_event(), after the events before them."""
+    parser = pull.PullParser()
+    parser.receive_data(b'GET / HTTP/1.1\r\n\r\nG@T / HTTP/1.1\r\n\r\n')
+
+    assert isinstance(parser.next_event(), pull.Request)
+    assert isinstance(parser.next_event(), pull.EndOfMessage)
+    for _ in range(2):
+        with pytest.raises(python_http_parser.errors.InvalidToken):
+            parser.next_event()
+
+    parser = pull.PullParser()
+    parser.receive_data(b'POST / HTTP/1.1\r\nContent-Length: 10\r\n\r\nabc')
+    parser.receive_data(b'')
+
+    assert isinstance(parser.next_event(), pull.Request)
+    assert parser.next_event() == pull.Data(b'abc')
+    with pytest.raises(python_http_parser.errors.ParsingError):
+        parser.next_event()
+    with pytest.raises(RuntimeError):
+        parser.receive_data(b'more')
@@ -1,5 +1,7 @@
 """Testing the stream/event based parser."""
 
+import mmap
+
 from . import attach_common_event_handlers, chunk, parser_process_chunks
 from .context import python_http_parser
 
@@ -239,3 +241,374 @@ def test_reset():
 
     assert parser.finished()
     assert len(errors) == 0
+
+def test_memoryview_offsets():
+    """
+    Make sure the stream/event based parser could walk several messages that
+    are in the same memoryview.
+    """
+    errors = []
+    methods = []
+    uris = []
+    msg = b''.join([
+        b'GET /first HTTP/1.1\r\n',
+        b'Host: example.com\r\n\r\n',
+        b'POST /second HTTP/1.1\r\n',
+        b'Host: example.com\r\n\r\n',
+    ])
+    parser = python_http_parser.stream.HTTPParser()
+    parser.on('error', errors.append)
+    parser.on('req_method', methods.append)
+    parser.on('req_uri', uris.append)
+
+    view = memoryview(bytearray(msg))
+    pos = 0
+    while pos < len(view):
+        parser.reset()
+        ret = parser.process(view[pos:])
+        assert ret > 0
+        pos += ret
+
+    assert len(errors) == 0
+    assert pos == len(msg)
+    assert methods == [b'GET', b'POST']
+    assert uris == [b'/first', b'/second']
+    assert all(map(lambda uri: isinstance(uri, bytes), uris))
+
+def test_feed():
+    """
+    Make sure the stream/event based parser could buffer unprocessed bytes
+    itself when using ``parser.feed()``.
+    """
+    errors = []
+    results = {
+        'req_method': None,
+        'req_uri': None,
+        'http_version': None,
+        'headers': {},
+        'raw_headers': []
+    }
+    msg = b''.join([
+        b'GET /index.html HTTP/1.1\r\n',
+        b'Host: example.com\r\n',
+        b'User-Agent: Some-random-dude\r\n',
+        b'X-Token: Trash::more_trash::bananas\r\n\r\n',
+    ])
+    parser = python_http_parser.stream.HTTPParser()
+
+    attach_common_event_handlers(parser, results, errors, False)
+    # Feed it one byte at a time, the worst case.
+    for chk in chunk(msg, 1):
+        assert parser.feed(chk) >= 0
+
+    assert len(errors) == 0
+    assert parser.finished()
+    assert parser.buffered() == 0
+    assert results['req_method'] == b'GET'
+    assert results['req_uri'] == b'/index.html'
+    assert results['http_version'] == (1, 1)
+    assert results['raw_headers'] == [
+        b'Host', b'example.com',
+        b'User-Agent', b'Some-random-dude',
+        b'X-Token', b'Trash::more_trash::bananas',
+    ]
+
+    # Bytes after the message should be kept for the next one.
+    parser.reset()
+    assert parser.feed(b'POST / HTTP/1.1\r\n\r\nGET') == 19
+    assert parser.finished()
+    assert parser.buffered() == 3
+    assert results['req_method'] == b'POST'
+
+def test_callbacks():
+    """
+    Make sure the stream/event based parser calls the slots of a ParserCallbacks
+    object instead of emitting events.
+    """
+    errors = []
+    fields = []
+    results = {
+        'req_method': None,
+        'req_uri': None,
+        'http_version': None,
+        'complete': False,
+    }
+    msg = b''.join([
+        b'GET /index.html HTTP/1.1\r\n',
+        b'Host: example.com\r\n',
+        b'User-Agent: Some-random-dude\r\n\r\n',
+    ])
+
+    def on_message_complete():
+        results['complete'] = True
+
+    callbacks = python_http_parser.stream.ParserCallbacks(
+        on_error=errors.append,
+        on_req_method=lambda method: results.update(req_method=method),
+        on_req_uri=lambda uri: results.update(req_uri=uri),
+        on_version=lambda ver: results.update(http_version=ver),
+        on_header_name=fields.append,
+        on_header_value=fields.append,
+        on_message_complete=on_message_complete
+    )
+    parser = python_http_parser.stream.HTTPParser(callbacks=callbacks)
+    # Listeners are ignored when callbacks are used.
+    parser.on('req_method', errors.append)
+    parser.process(msg)
+
+    assert len(errors) == 0
+    assert parser.finished()
+    assert results['complete']
+    assert results['req_method'] == b'GET'
+    assert results['req_uri'] == b'/index.html'
+    assert results['http_version'] == (1, 1)
+    assert fields == [b'Host', b'example.com', b'User-Agent', b'Some-random-dude']
+
+    # Without an on_error slot, errors are raised.
+    parser = python_http_parser.stream.HTTPParser(
+        callbacks=python_http_parser.stream.ParserCallbacks())
+    try:
+        parser.process(b'G@T / HTTP/1.1\r\n\r\n')
+    except python_http_parser.errors.InvalidToken as ex:
+        errors.append(ex)
+
+    assert len(errors) == 1
+
+def test_batch_headers():
+    """
+    Make sure the stream/event based parser could deliver all headers at once.
+    """
+    errors = []
+    fields = []
+    batches = []
+    msg = b''.join([
+        b'HTTP/1.1 200 OK\r\n',
+        b'Cache-Control: no-cache\r\n',
+        b"Content-Security-Policy: default-src 'none'\r\n",
+        b'Date: Sat, 05 Jun 2021 22:56:51 GMT\r\n\r\n'
+    ])
+    parser = python_http_parser.stream.HTTPParser(is_response=True, batch_headers=True)
+    parser.on('error', errors.append)
+    parser.on('header_name', fields.append)
+    parser.on('header_value', fields.append)
+    parser.on('headers_complete', batches.append)
+    parser_process_chunks(parser, chunk(msg, 4))
+
+    assert len(errors) == 0
+    assert parser.finished()
+    assert len(fields) == 0
+    assert batches == [[
+        (b'Cache-Control', b'no-cache'),
+        (b'Content-Security-Policy', b"default-src 'none'"),
+        (b'Date', b'Sat, 05 Jun 2021 22:56:51 GMT'),
+    ]]
+
+    # Parse again, to make sure the headers don't leak into the next message.
+    parser.reset()
+    parser.process(b'HTTP/1.1 204 No Content\r\nServer: test\r\n\r\n')
+
+    assert len(errors) == 0
+    assert batches[1] == [(b'Server', b'test')]
+
+
+def test_header_field_names():
+    """Make sure well-known header names are shared objects with a field ID."""
+    header_fields = python_http_parser.constants.HEADER_FIELDS
+    HeaderField = python_http_parser.constants.HeaderField
+    msg = b'GET / HTTP/1.1\r\nHost: a\r\ncontent-length: 0\r\nX-Custom: b\r\n\r\n'
+
+    # Once with the whole head at once, and once byte by byte.
+    for chunk_size in (len(msg), 1):
+        batches = []
+        parser = python_http_parser.stream.HTTPParser(batch_headers=True)
+        parser.on('headers_complete', batches.append)
+        parser_process_chunks(parser, chunk(msg, chunk_size))
+
+        names = [name for (name, _) in batches[0]]
+        assert names == [b'Host', b'content-length', b'X-Custom']
+        assert [header_fields.get(name) for name in names] == [
+            HeaderField.HOST, HeaderField.CONTENT_LENGTH, None]
+        known = list(header_fields)
+        assert names[0] is known[known.index(b'Host')]
+        assert names[1] is known[known.index(b'content-length')]
+
+
+def test_shared_methods_versions():
+    """Make sure standard methods and versions are shared objects."""
+    methods = python_http_parser.constants.METHODS
+    stream = python_http_parser.stream
+    msgs = [
+        (b'POST / HTTP/1.0\r\n\r\n', b'POST', stream.HTTP_1_0),
+        (b'GET / HTTP/1.1\r\n\r\n', b'GET', stream.HTTP_1_1),
+        (b'PROPFIND / HTTP/1.1\r\n\r\n', b'PROPFIND', stream.HTTP_1_1),
+    ]
+
+    for (msg, method, version) in msgs:
+        for (chunk_size, use_feed) in ((len(msg), False), (1, False), (1, True)):
+            results = []
+            parser = python_http_parser.stream.HTTPParser()
+            parser.on('req_method', results.append)
+            parser.on('version', results.append)
+            if use_feed:
+                for part in chunk(msg, chunk_size):
+                    parser.feed(part)
+            else:
+                parser_process_chunks(parser, chunk(msg, chunk_size))
+
+            assert results == [method, version]
+            assert results[1] is version
+            if method in methods:
+                assert results[0] is list(methods)[methods[method] - 1]
+
+
+def test_pipeline():
+    """
+    Make sure the stream/event based parser could parse pipelined messages
+    without being reset.
+    """
+    errors = []
+    events = []
+    msg = b''.join([
+        b'GET /first HTTP/1.1\r\n',
+        b'Host: example.com\r\n\r\n',
+        b'GET /second HTTP/1.1\r\n',
+        b'Host: example.com\r\n\r\n',
+        b'POST /third HTTP/1.1\r\n',
+        b'Content-Length: 5\r\n\r\n',
+        b'hello',
+        b'GET /fourth HTTP/1.1\r\n',
+    ])
+    parser = python_http_parser.stream.HTTPParser(pipeline=True)
+
+    def on_header_value(value):
+        if value == b'5':
+            parser.has_body(True)
+            parser.body_processor(python_http_parser.body.FixedLenProcessor(5))
+
+    parser.on('error', errors.append)
+    parser.on('message_begin', lambda: events.append('begin'))
+    parser.on('message_complete', lambda: events.append('complete'))
+    parser.on('req_uri', events.append)
+    parser.on('data', events.append)
+    parser.on('header_value', on_header_value)
+
+    ret = parser.process(msg)
+
+    assert len(errors) == 0
+    # The last request is incomplete, but its start line is all there.
+    assert ret == len(msg)
+    assert not parser.finished()
+    assert events == [
+        'begin', b'/first', 'complete',
+        'begin', b'/second', 'complete',
+        'begin', b'/third', b'hello', 'complete',
+        'begin', b'/fourth',
+    ]
+
+    # And finish the last one.
+    assert parser.process(b'\r\n') == 2
+    assert parser.finished()
+    assert events[-1] == 'complete'
+
+def test_pipeline_split_crlf():
+    """
+    Make sure an empty line between pipelined messages could be split right
+    between its CR and its LF.
+    """
+    errors = []
+    uris = []
+    parser = python_http_parser.stream.HTTPParser(pipeline=True)
+    parser.on('error', errors.append)
+    parser.on('req_uri', uris.append)
+
+    assert parser.feed(b'GET /first HTTP/1.1\r\n\r\n\r') == 23
+    assert parser.buffered() == 1
+    parser.feed(b'\nGET /second HTTP/1.1\r\n\r\n')
+
+    assert len(errors) == 0
+    assert uris == [b'/first', b'/second']
+    assert parser.finished()
+
+def test_obs_text():
+    """Make sure field values and reason phrases with obsolete text are emptied."""
+    errors = []
+    values = []
+    reasons = []
+    parser = python_http_parser.stream.HTTPParser(is_response=True)
+    parser.on('error', errors.append)
+    parser.on('header_value', values.append)
+    parser.on('reason', reasons.append)
+    parser.process(b'HTTP/1.1 200 Caf\xe9\r\nX-A: ok\r\nX-B: caf\xe9 \xff\r\n\r\n')
+
+    assert len(errors) == 0
+    assert values == [b'ok', b'']
+    assert reasons == [b'']
+
+def test_request_head_fast_path():
+    """
+    Make sure a request head that arrives in one piece produces the same events
+    as one that arrives byte by byte.
+    """
+    msg = b''.join([
+        b'POST /upload?x=1 HTTP/1.1\r\n',
+        b'Host: example.com\r\n',
+        b'X-Empty:\r\n',
+        b'X-Spaces:   padded value \t\r\n',
+        b'X-Obs: caf\xe9\r\n',
+        b'Content-Length: 5\r\n',
+        b'\r\n',
+        b'hello',
+    ])
+    events = ('req_method', 'req_uri', 'version', 'startline_complete', 'header_name',
+              'header_value', 'headers_complete', 'data', 'message_complete')
+
+    def run(chunk_size, batch_headers):
+        results = []
+        parser = python_http_parser.stream.HTTPParser(
+            batch_headers=batch_headers, detect_body=True)
+        for event in events:
+            parser.on(event, lambda *args, event=event: results.append((event, args)))
+        parser.on('error', lambda err: results.append(('error', err)))
+        if chunk_size is None:
+            assert parser.process(msg) == len(msg)
+        else:
+            parser_process_chunks(parser, chunk(msg, chunk_size))
+        assert parser.finished()
+        return results
+
+    def without_data(results):
+        return [result for result in results if result[0] != 'data']
+
+    for batch_headers in (False, True):
+        whole = run(None, batch_headers)
+        assert ('data', (b'hello',)) in whole
+        assert without_data(whole) == without_data(run(1, batch_headers))
+
+
+def test_body_spans(tmp_path):
+    """Make sure bodies are reported as spans of a memory-mapped message."""
+    body = bytes(range(256)) * 4096
+    path = tmp_path / 'messages'
+    path.write_bytes(b''.join([
+        b'HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n' % len(body),
+        body,
+        b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n',
+        b'%x\r\n%s\r\n0\r\n\r\n' % (len(body), body),
+    ]))
+    spans = []
+    data = []
+
+    parser = python_http_parser.stream.HTTPParser(
+        is_response=True, pipeline=True, detect_body=True,
+        callbacks=python_http_parser.stream.ParserCallbacks(
+            on_data=data.append,
+            on_body_span=lambda offset, length: spans.append((offset, length)),
+        ))
+
+    with open(path, 'rb') as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        assert parser.process(buf) == len(buf)
+
+        assert not data
+        assert len(spans) == 2
+        assert [buf[offset:offset + length] for (offset, length) in spans] == [body, body]
@@ -278,3 +278,23 @@ def test_bare_cr_header():
         lambda ex: isinstance(ex, python_http_parser.errors.NewlineError),
         errors
     ))
+
+def test_fail_inval_header_val():
+    """The HTTPParser should reject header values with control characters."""
+    errors = []
+    msgs = [
+        b'GET / HTTP/1.1\r\nHost: a\x00b\r\n\r\n',
+        # Obsolete text doesn't make control characters okay.
+        b'GET / HTTP/1.1\r\nHost: \xe9\x7f\r\n\r\n'
+    ]
+
+    for msg in msgs:
+        parser = python_http_parser.stream.HTTPParser()
+        parser.on('error', errors.append)
+        parser.process(msg)
+
+    assert len(errors) == 2
+    assert all(map(
+        lambda ex: isinstance(ex, python_http_parser.errors.InvalidHeaderVal),
+        errors
+    ))
@@ -1,5 +1,6 @@
 """Testing parsers with HTTP messages that have bodies."""
 
+import os
 from typing import List
 
 from . import attach_common_event_handlers, chunk, parser_process_chunks
@@ -249,3 +250,231 @@ def test_stream_transfer_chunked_chunked():
     assert len(result['headers']) == 3
     assert result['headers'][b'transfer-encoding'] == b'chunked'
     assert result['body'] == 'Hello World!\n'
+
+def test_stream_detect_body():
+    """Test the stream parser detecting the body framing by itself."""
+    errors = []
+    msgs = [
+        b''.join([
+            b'POST /upload HTTP/1.1\r\n',
+            b'content-length: 13\r\n',
+            b'\r\n',
+            b'Hello World!\n',
+        ]),
+        b''.join([
+            b'POST /upload HTTP/1.1\r\n',
+            b'Transfer-Encoding: gzip, chunked\r\n',
+            b'Content-Length: 1000\r\n',
+            b'\r\n',
+            b'5\r\n',
+            b'Hello\r\n',
+            b'8\r\n',
+            b' World!\n\r\n',
+            b'0\r\n',
+            b'\r\n'
+        ]),
+    ]
+
+    for msg in msgs:
+        body: List[bytes] = []
+        parser = python_http_parser.stream.HTTPParser(detect_body=True)
+        parser.on('error', errors.append)
+        parser.on('data', body.append)
+        parser_process_chunks(parser, chunk(msg, 4))
+
+        assert len(errors) == 0
+        assert parser.finished()
+        assert parser.has_body()
+        assert b''.join(body) == b'Hello World!\n'
+
+    # These don't have a body.
+    for msg in (b'GET / HTTP/1.1\r\nContent-Length: 0\r\n\r\n',
+                b'GET / HTTP/1.1\r\nHost: example.com\r\n\r\n'):
+        parser = python_http_parser.stream.HTTPParser(detect_body=True)
+        parser.on('error', errors.append)
+        parser.process(msg)
+
+        assert len(errors) == 0
+        assert parser.finished()
+        assert not parser.has_body()
+
+    parser = python_http_parser.stream.HTTPParser(is_response=True, detect_body=True)
+    parser.on('error', errors.append)
+    parser.process(b'HTTP/1.1 304 Not Modified\r\nContent-Length: 100\r\n\r\n')
+
+    assert len(errors) == 0
+    assert parser.finished()
+    assert not parser.has_body()
+
+def test_stream_detect_body_invalid():
+    """The stream parser should reject invalid framing headers."""
+    errors = []
+    msgs = [
+        b'POST / HTTP/1.1\r\nContent-Length: 1O\r\n\r\n',
+        b'POST / HTTP/1.1\r\nContent-Length: 10\r\nContent-Length: 11\r\n\r\n',
+        b'POST / HTTP/1.1\r\nTransfer-Encoding: chunked, gzip\r\n\r\n',
+    ]
+
+    for msg in msgs:
+        parser = python_http_parser.stream.HTTPParser(detect_body=True)
+        parser.on('error', errors.append)
+        parser.process(msg)
+
+    assert len(errors) == 3
+    assert all(map(
+        lambda ex: isinstance(ex, python_http_parser.errors.InvalidHeaderVal),
+        errors
+    ))
+
+def test_stream_detect_body_framing():
+    """
+    Make sure Transfer-Encoding overrides Content-Length, could be split over
+    many header lines, and that responses without framing end with the connection.
+    """
+    errors = []
+
+    # Transfer codings on separate lines.
+    body: List[bytes] = []
+    parser = python_http_parser.stream.HTTPParser(detect_body=True)
+    parser.on('error', errors.append)
+    parser.on('data', body.append)
+    parser.process(b''.join([
+        b'POST /upload HTTP/1.1\r\n',
+        b'Transfer-Encoding: gzip\r\n',
+        b'Transfer-Encoding: chunked\r\n',
+        b'\r\n',
+        b'5\r\nHello\r\n0\r\n\r\n',
+    ]))
+
+    assert len(errors) == 0
+    assert parser.finished()
+    assert body == [b'Hello']
+
+    msgs = [
+        # Transfer-Encoding wins over Content-Length, and gzip isn't chunked.
+        b'HTTP/1.1 200 OK\r\nTransfer-Encoding: gzip\r\nContent-Length: 3\r\n\r\n',
+        # No framing headers at all.
+        b'HTTP/1.1 200 OK\r\n\r\n',
+    ]
+    for msg in msgs:
+        for chunk_size in (None, 3):
+            body = []
+            completed = []
+            parser = python_http_parser.stream.HTTPParser(
+                is_response=True, pipeline=True, detect_body=True)
+            parser.on('error', errors.append)
+            parser.on('data', body.append)
+            parser.on('message_complete', lambda completed=completed: completed.append(True))
+            payload = msg + b'HTTP/1.1 200 OK\r\n\r\nmore'
+            if chunk_size is None:
+                assert parser.process(payload) == len(payload)
+            else:
+                parser_process_chunks(parser, chunk(payload, chunk_size))
+
+            assert len(errors) == 0
+            assert not parser.finished()
+            assert b''.join(body) == b'HTTP/1.1 200 OK\r\n\r\nmore'
+
+            parser.finish()
+            assert parser.finished()
+            assert completed == [True]
+
+def test_stream_expect_no_body():
+    """
+    Make sure a response can be marked as bodiless, e.g. a response to HEAD,
+    and that interim responses don't use up the mark.
+    """
+    errors = []
+    body: List[bytes] = []
+    codes: List[int] = []
+    parser = python_http_parser.stream.HTTPParser(
+        is_response=True, pipeline=True, detect_body=True)
+    parser.on('error', errors.append)
+    parser.on('data', body.append)
+    parser.on('status_code', codes.append)
+
+    parser.expect_no_body()
+    parser.process(b''.join([
+        b'HTTP/1.1 100 Continue\r\n\r\n',
+        b'HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\n',
+        b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nhi',
+    ]))
+
+    assert len(errors) == 0
+    assert codes == [100, 200, 200]
+    assert body == [b'hi']
+
+def test_stream_recycled_processors():
+    """Make sure the stream parser recycles its body processors."""
+    errors = []
+    body: List[bytes] = []
+    msg = b''.join([
+        b'POST /upload HTTP/1.1\r\n',
+        b'Transfer-Encoding: chunked\r\n',
+        b'\r\n',
+        b'5\r\n',
+        b'Hello\r\n',
+        b'0\r\n',
+        b'\r\n'
+    ])
+    parser = python_http_parser.stream.HTTPParser(pipeline=True, detect_body=True)
+    parser.on('error', errors.append)
+    parser.on('data', body.append)
+
+    processors = []
+    parser.on('headers_complete', lambda: processors.append(parser.body_processor()))
+    parser.process(msg * 3)
+
+    assert len(errors) == 0
+    assert body == [b'Hello'] * 3
+    assert len(processors) == 3
+    assert processors[0] is processors[1] is processors[2]
+    assert parser.chunked_processor() is processors[0]
+
+
+def test_stream_body_sink(tmp_path):
+    """
+    Make sure BodySinks attached to the parser's body processors get the bodies,
+    replace each other, and can be detached again.
+    """
+    BodySink = python_http_parser.body.BodySink
+    errors = []
+    body: List[bytes] = []
+    sizes: List[int] = []
+    uris: List[bytes] = []
+    msg = b''.join([
+        b'POST /a HTTP/1.1\r\nContent-Length: 5\r\n\r\nfirst',
+        b'POST /b HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n6\r\nsecond\r\n0\r\n\r\n',
+        b'POST /c HTTP/1.1\r\nContent-Length: 5\r\n\r\nthird',
+    ])
+
+    with open(tmp_path / 'body', 'w+b') as file, \
+            BodySink(file.fileno(), batch_size=1024) as file_sink, \
+            BodySink() as replaced_sink, BodySink() as memory_sink:
+        parser = python_http_parser.stream.HTTPParser(pipeline=True, detect_body=True)
+        parser.on('error', errors.append)
+        parser.on('data', body.append)
+        parser.on('req_uri', uris.append)
+        # The file sink is flushed before each message is complete.
+        parser.on('message_complete', lambda: sizes.append(os.fstat(file.fileno()).st_size))
+
+        def on_headers_complete():
+            processor = parser.body_processor()
+            if uris[-1] == b'/a':
+                file_sink.attach(processor)
+            elif uris[-1] == b'/b':
+                replaced_sink.attach(processor)
+                memory_sink.attach(processor)
+            else:
+                file_sink.detach(processor)
+
+        parser.on('headers_complete', on_headers_complete)
+        assert parser.process(msg) == len(msg)
+
+        assert len(errors) == 0
+        assert sizes == [5, 5, 5]
+        file.seek(0)
+        assert file.read() == b'first'
+        assert replaced_sink.size == 0
+        assert memory_sink.getbuffer() == b'second'
+        assert body == [b'third']